@@ -16,66 +16,120 @@ Examples:
     python main.py --validate               # Validate setup
 """
 
-import argparse
 import sys
 import os
 from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Optional
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.utils import load_config, setup_logging, ensure_directories, validate_config
-from src.renderer import Renderer
 
+if TYPE_CHECKING:
+    from src.renderer import RendererMeta
 
-def parse_arguments():
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
-        description="Automated Slideshow Generator",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+
+EPILOG = """
 Examples:
   %(prog)s                           Create slideshow with default settings
   %(prog)s --config custom.yaml     Use custom configuration file
   %(prog)s --output my_video.mp4    Specify output filename
   %(prog)s --info                   Show project information
   %(prog)s --validate               Validate project setup
-        """
-    )
+"""
+
+# (flags, add_argument keyword arguments) for every command line option
+ARGUMENTS = (
+    (('--config', '-c'), {
+        'default': 'config/settings.yaml',
+        'help': 'Path to configuration file (default: config/settings.yaml)'
+    }),
+    (('--output', '-o'), {
+        'help': 'Output video filename (optional)'
+    }),
+    (('--info', '-i'), {
+        'action': 'store_true',
+        'help': 'Show project information and exit'
+    }),
+    (('--validate', '-v'), {
+        'action': 'store_true',
+        'help': 'Validate project setup and exit'
+    }),
+    (('--debug', '-d'), {
+        'action': 'store_true',
+        'help': 'Enable debug logging'
+    }),
+)
+
+# Static copy of the argparse help output, printed for a bare --help without
+# importing argparse. Keep in sync with ARGUMENTS.
+HELP_TEXT = """\
+usage: %(prog)s [-h] [--config CONFIG] [--output OUTPUT] [--info] [--validate]
+               [--debug]
+
+Automated Slideshow Generator
+
+options:
+  -h, --help            show this help message and exit
+  --config CONFIG, -c CONFIG
+                        Path to configuration file (default:
+                        config/settings.yaml)
+  --output OUTPUT, -o OUTPUT
+                        Output video filename (optional)
+  --info, -i            Show project information and exit
+  --validate, -v        Validate project setup and exit
+  --debug, -d           Enable debug logging
+""" + EPILOG
+
+# Boolean flags that can be handled without building the full parser
+FAST_PATH_FLAGS = {
+    '--info': 'info', '-i': 'info',
+    '--validate': 'validate', '-v': 'validate',
+    '--debug': 'debug', '-d': 'debug',
+}
+
+
+def parse_fast_path(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Resolve trivial command lines without constructing the argparse parser.
     
-    parser.add_argument(
-        '--config', '-c',
-        default='config/settings.yaml',
-        help='Path to configuration file (default: config/settings.yaml)'
-    )
+    Handles an empty command line, a bare --help and any combination of the
+    boolean flags. Returns None when the full parser is needed.
+    """
+    if argv in (['-h'], ['--help']):
+        print(HELP_TEXT % {'prog': os.path.basename(sys.argv[0])}, end='')
+        sys.exit(0)
     
-    parser.add_argument(
-        '--output', '-o',
-        help='Output video filename (optional)'
-    )
+    args = SimpleNamespace(config='config/settings.yaml', output=None,
+                           info=False, validate=False, debug=False)
+    for arg in argv:
+        dest = FAST_PATH_FLAGS.get(arg)
+        if dest is None:
+            return None
+        setattr(args, dest, True)
     
-    parser.add_argument(
-        '--info', '-i',
-        action='store_true',
-        help='Show project information and exit'
-    )
+    return args
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    import argparse
     
-    parser.add_argument(
-        '--validate', '-v',
-        action='store_true',
-        help='Validate project setup and exit'
+    parser = argparse.ArgumentParser(
+        description="Automated Slideshow Generator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EPILOG
     )
     
-    parser.add_argument(
-        '--debug', '-d',
-        action='store_true',
-        help='Enable debug logging'
-    )
+    for flags, kwargs in ARGUMENTS:
+        parser.add_argument(*flags, **kwargs)
     
     return parser.parse_args()
 
 
-def show_project_info(renderer: Renderer):
+def show_project_info(renderer: 'RendererMeta'):
     """Display project information."""
     info = renderer.get_project_info()
     
@@ -103,6 +157,8 @@ def show_project_info(renderer: Renderer):
         print("  Mode: External audio file")
         if info['audio']['path']:
             print(f"  File: {info['audio']['path']}")
+            if info['audio'].get('duration') is not None:
+                print(f"  Duration: {info['audio']['duration']:.2f}s")
         else:
             print("  No audio file found")
     
@@ -122,7 +178,7 @@ def show_project_info(renderer: Renderer):
     print("\n" + "="*60)
 
 
-def validate_project_setup(renderer: Renderer):
+def validate_project_setup(renderer: 'RendererMeta'):
     """Validate project setup."""
     print("\n" + "="*60)
     print("PROJECT VALIDATION")
@@ -145,7 +201,7 @@ def validate_project_setup(renderer: Renderer):
 
 def main():
     """Main entry point."""
-    args = parse_arguments()
+    args = parse_fast_path(sys.argv[1:]) or parse_arguments()
     
     try:
         # Load configuration
@@ -162,19 +218,22 @@ def main():
         ensure_directories(config)
         logger = setup_logging(config)
         
-        # Create renderer
-        renderer = Renderer(config)
+        # Info and validation only need the MoviePy-free project introspection
+        from src.renderer import RendererMeta, Renderer
         
         # Handle info request
         if args.info:
-            show_project_info(renderer)
+            show_project_info(RendererMeta(config))
             return 0
         
         # Handle validation request
         if args.validate:
-            is_valid = validate_project_setup(renderer)
+            is_valid = validate_project_setup(RendererMeta(config))
             return 0 if is_valid else 1
         
+        # Create renderer
+        renderer = Renderer(config)
+        
         # Validate setup before creating slideshow
         is_valid, errors = renderer.validate_project_setup()
         if not is_valid:
@@ -12,13 +12,40 @@ Examples:
 
 import sys
 import os
+import json
+import hashlib
 from pathlib import Path
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.script_optimizer import ScriptOptimizer
-from src.utils import load_config
+from src.utils import get_cache_dir, load_config
+
+CACHE_DIR = get_cache_dir('script_analysis')
+
+# Bump when the analysis or distribution output changes, so older cached
+# results are not reused
+ANALYSIS_CACHE_VERSION = 1
+
+
+def _load_cached_analysis(cache_path: str):
+    """Load a previously saved analysis, or None if unavailable."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_analysis(cache_path: str, analysis: dict, texts: list) -> None:
+    """Save analysis results for reuse on the next run (best effort)."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'analysis': analysis, 'texts': texts}, f, ensure_ascii=False)
+    except OSError:
+        pass
 
 
 def analyze_script(script_path: str, num_images: int):
@@ -37,7 +64,7 @@ def analyze_script(script_path: str, num_images: int):
         with open(script_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        lines = content.split('\n')
+        lines = content.splitlines()
         print(f"Script file: {script_path}")
         print(f"Available images: {num_images}")
         print()
@@ -59,9 +86,29 @@ def analyze_script(script_path: str, num_images: int):
                 'paths': {}
             }
         
-        # Analyze distribution
-        optimizer = ScriptOptimizer(config)
-        analysis = optimizer.analyze_script_distribution(lines, num_images)
+        # Reuse the previous results if neither the script nor the text
+        # settings have changed; fields are NUL-separated so they can't run together
+        cache_key = hashlib.sha256(b'\0'.join((
+            str(ANALYSIS_CACHE_VERSION).encode('utf-8'),
+            content.encode('utf-8'),
+            str(num_images).encode('utf-8'),
+            json.dumps(config.get('text', {}), sort_keys=True, default=str).encode('utf-8'),
+        )))
+        cache_path = os.path.join(CACHE_DIR, f"script_{cache_key.hexdigest()}.json")
+        
+        cached = _load_cached_analysis(cache_path)
+        if cached:
+            analysis = cached['analysis']
+            distributed_texts = cached['texts']
+        else:
+            # Analyze distribution
+            optimizer = ScriptOptimizer(config)
+            analysis = optimizer.analyze_script_distribution(lines, num_images)
+            
+            optimized_settings = optimizer.optimize_script_distribution(lines, num_images)
+            distributed_texts = optimized_settings.get('texts', []) if optimized_settings else []
+            
+            _save_cached_analysis(cache_path, analysis, distributed_texts)
         
         print("ANALYSIS RESULTS:")
         print(f"  Original lines: {analysis['original_lines']}")
@@ -76,11 +123,7 @@ def analyze_script(script_path: str, num_images: int):
         print("DISTRIBUTION PREVIEW:")
         print("-" * 40)
         
-        optimized_settings = optimizer.optimize_script_distribution(lines, num_images)
-        
-        if optimized_settings and optimized_settings.get('texts'):
-            distributed_texts = optimized_settings['texts']
-            
+        if distributed_texts:
             for i, text in enumerate(distributed_texts, 1):
                 print(f"\nSlide {i} ({len(text)} chars):")
                 preview = text[:200] + "..." if len(text) > 200 else text
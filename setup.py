@@ -33,6 +33,7 @@ setup(
     install_requires=requirements,
     extras_require={
         "tts": ["gtts>=2.2.0", "pydub>=0.25.1"],
+        "fast": ["numba>=0.53", "opencv-python-headless>=4.0", "orjson>=3.0", "soundfile>=0.10"],
         "dev": ["pytest>=6.0", "pytest-cov", "black", "flake8"],
     },
     entry_points={
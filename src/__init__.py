@@ -3,21 +3,34 @@ Automated Slideshow Generator Package
 
 This package provides a complete solution for generating slideshow videos
 with animated text overlays, audio synchronization, and subtitle generation.
+
+Public classes are imported lazily on first access so that lightweight
+entry points (``--help``, ``--info``, ``--validate``) don't pay for
+importing MoviePy, PIL and the TTS libraries.
 """
 
-from .renderer import Renderer
-from .text_processor import TextProcessor
-from .audio_generator import AudioGenerator
-from .video_generator import VideoGenerator
-from .subtitle_generator import SubtitleGenerator
-from .utils import load_config, setup_logging, ensure_directories
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
+# Maps each public name to the submodule that defines it
+_LAZY_EXPORTS = {
+    'Renderer': '.renderer',
+    'RendererMeta': '.renderer',
+    'TextProcessor': '.text_processor',
+    'AudioGenerator': '.audio_generator',
+    'VideoGenerator': '.video_generator',
+    'SubtitleGenerator': '.subtitle_generator',
+    'load_config': '.utils',
+    'setup_logging': '.utils',
+    'ensure_directories': '.utils',
+}
+
 __all__ = [
     'Renderer',
+    'RendererMeta',
     'TextProcessor',
     'AudioGenerator',
     'VideoGenerator',
@@ -25,4 +38,19 @@ __all__ = [
     'load_config',
     'setup_logging',
     'ensure_directories'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import public names on first access (PEP 562)."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so __getattr__ isn't hit again
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,17 +1,70 @@
 import os
+import hashlib
+import io
+import re
+import functools
 import logging
-from typing import Optional, Dict, Any
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from typing import Optional, Dict, Any, List
 from moviepy.editor import AudioFileClip
-try:
-    from gtts import gTTS
-    from pydub import AudioSegment
-    TTS_AVAILABLE = True
-except ImportError:
-    TTS_AVAILABLE = False
-    logging.warning("TTS libraries not available. Install gtts and pydub for text-to-speech functionality.")
+from moviepy.audio.AudioClip import AudioClip, AudioArrayClip
+from moviepy.audio.fx.all import audio_loop
 
 logger = logging.getLogger(__name__)
 
+AUDIO_EXTENSIONS = frozenset(('.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg'))
+
+# Looped audio up to this long is decoded once into one float32 buffer
+# (about 210 MB at peak for 44.1 kHz stereo)
+MAX_TILED_LOOP_SECONDS = 600
+
+# Sentence boundaries used to split long TTS input into parallel requests
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# Distinct texts whose generated TTS audio is kept in the TTS cache directory
+TTS_CACHE_ENTRIES = 8
+
+# Subdirectory of the output directory that holds generated TTS audio
+TTS_CACHE_DIRNAME = '.tts_cache'
+
+# Files the TTS cache writes (finished or partial); pruning touches nothing else
+TTS_CACHE_FILE_PATTERN = re.compile(r'tts_([0-9a-f]{40})\.(?:mp3|wav)(?:\.part)?')
+
+# tmpfs-backed location for generated TTS audio (Linux); each generator
+# gets its own private directory here, removed after rendering
+RAMDISK_DIR = '/dev/shm'
+
+# The TTS library is only imported the first time TTS is actually needed.
+# TTS_AVAILABLE stays None until then.
+gTTS = None
+TTS_AVAILABLE = None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_tts():
+    """Import gTTS on first use and return the class, or None if missing."""
+    try:
+        from gtts import gTTS as tts_class
+    except ImportError:
+        logging.warning("TTS libraries not available. Install gtts for text-to-speech functionality.")
+        return None
+    return tts_class
+
+
+def _tts_available() -> bool:
+    """Check TTS availability, importing the library lazily."""
+    global gTTS, TTS_AVAILABLE
+    if TTS_AVAILABLE is None:
+        tts_class = _load_tts()
+        TTS_AVAILABLE = tts_class is not None
+        if gTTS is None:
+            gTTS = tts_class
+    return TTS_AVAILABLE
+
 
 class AudioGenerator:
     """Handles audio processing and text-to-speech generation."""
@@ -20,6 +73,9 @@ class AudioGenerator:
         self.config = config
         self.audio_config = config.get('audio', {})
         self.paths = config.get('paths', {})
+        self._audio_path_cache: Optional[str] = None
+        # Private RAM disk directory for generated TTS audio, created on first use
+        self._ramdisk_dir: Optional[str] = None
     
     def process_audio(self, text_content: str = None) -> Optional[AudioFileClip]:
         """
@@ -60,25 +116,66 @@ class AudioGenerator:
     
     def _generate_tts_audio(self, text_content: str) -> Optional[AudioFileClip]:
         """Generate audio from text using TTS."""
-        if not TTS_AVAILABLE:
-            logger.error("TTS libraries not available. Please install gtts and pydub or provide an audio file.")
+        if not _tts_available():
+            logger.error("TTS libraries not available. Please install gtts or provide an audio file.")
             return None
         
         tts_config = self.audio_config.get('tts', {})
         language = tts_config.get('language', 'en')
         slow = tts_config.get('slow', False)
         
-        # Create output directory
-        output_dir = self.paths.get('output_dir', 'data/output')
-        os.makedirs(output_dir, exist_ok=True)
+        # Create output directory, on a RAM disk if requested and available
+        output_dir = None
+        if tts_config.get('use_ramdisk', False) and os.path.isdir(RAMDISK_DIR):
+            output_dir = self._get_ramdisk_dir()
+        if output_dir is None:
+            # Own subdirectory, so cache pruning never sees the user's files
+            output_dir = os.path.join(self.paths.get('output_dir', 'data/output'), TTS_CACHE_DIRNAME)
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+            except OSError as e:
+                logger.error(f"Could not create TTS output directory {output_dir}: {e}")
+                return None
         
-        temp_audio_path = os.path.join(output_dir, 'generated_audio.mp3')
+        # Same text and voice settings produce the same MP3, so key the file on them
+        cache_key = hashlib.sha1(f"{text_content}|{language}|{slow}".encode('utf-8')).hexdigest()
+        temp_audio_path = os.path.join(output_dir, f'tts_{cache_key}.mp3')
+        wav_path = os.path.join(output_dir, f'tts_{cache_key}.wav')
         
         try:
-            # Generate TTS
-            logger.info(f"Generating TTS audio in language: {language}")
-            tts = gTTS(text=text_content, lang=language, slow=slow)
-            tts.save(temp_audio_path)
+            if os.path.exists(wav_path):
+                logger.info(f"Reusing cached TTS audio: {wav_path}")
+                temp_audio_path = wav_path
+                os.utime(wav_path)  # Mark as recently used for pruning
+            elif os.path.exists(temp_audio_path):
+                logger.info(f"Reusing cached TTS audio: {temp_audio_path}")
+                os.utime(temp_audio_path)
+            else:
+                # Generate TTS
+                logger.info(f"Generating TTS audio in language: {language}")
+                chunks = self._split_tts_chunks(text_content, tts_config.get('chunk_chars', 500))
+                # Written under a temporary name and moved into place when
+                # complete, so an interrupted download is never a cache hit
+                partial_path = temp_audio_path + '.part'
+                try:
+                    if len(chunks) > 1:
+                        self._save_tts_parallel(chunks, language, slow, partial_path,
+                                                tts_config.get('max_workers', 8))
+                    else:
+                        tts = gTTS(text=text_content, lang=language, slow=slow)
+                        tts.save(partial_path)
+                    os.replace(partial_path, temp_audio_path)
+                except Exception:
+                    if os.path.exists(partial_path):
+                        os.remove(partial_path)
+                    raise
+                
+                self._prune_tts_cache(output_dir, cache_key,
+                                      tts_config.get('cache_entries', TTS_CACHE_ENTRIES))
+            
+            # Decode the MP3 once so rendering reads seekable PCM instead
+            if temp_audio_path != wav_path and self._convert_to_wav(temp_audio_path, wav_path):
+                temp_audio_path = wav_path
             
             # Load and return as MoviePy audio clip
             audio = AudioFileClip(temp_audio_path)
@@ -89,44 +186,164 @@ class AudioGenerator:
             logger.error(f"Error generating TTS audio: {e}")
             return None
     
+    def _get_ramdisk_dir(self) -> Optional[str]:
+        """Create (once) a private directory for this generator's TTS files on the RAM disk."""
+        if self._ramdisk_dir is None:
+            try:
+                self._ramdisk_dir = tempfile.mkdtemp(prefix='slideshow_tts_', dir=RAMDISK_DIR)
+            except OSError as e:
+                logger.warning(f"Could not use RAM disk for TTS audio ({e}), using output directory")
+                return None
+        return self._ramdisk_dir
+    
+    def cleanup_temp_files(self) -> None:
+        """Remove TTS audio kept on the RAM disk; call once rendering is done."""
+        if self._ramdisk_dir is not None:
+            shutil.rmtree(self._ramdisk_dir, ignore_errors=True)
+            self._ramdisk_dir = None
+    
+    def _split_tts_chunks(self, text_content: str, max_chars: int) -> List[str]:
+        """Group sentences into chunks of roughly max_chars for separate TTS requests."""
+        chunks = []
+        current = []
+        current_length = 0
+        
+        for sentence in SENTENCE_SPLIT_PATTERN.split(text_content.strip()):
+            if current and current_length + len(sentence) > max_chars:
+                chunks.append(' '.join(current))
+                current = []
+                current_length = 0
+            current.append(sentence)
+            current_length += len(sentence) + 1
+        
+        if current:
+            chunks.append(' '.join(current))
+        
+        return chunks
+    
+    def _save_tts_parallel(self, chunks: List[str], language: str, slow: bool,
+                           output_path: str, max_workers: int) -> None:
+        """Synthesize chunks concurrently and write them to one MP3 in order."""
+        def synthesize(chunk: str) -> bytes:
+            buffer = io.BytesIO()
+            gTTS(text=chunk, lang=language, slow=slow).write_to_fp(buffer)
+            return buffer.getvalue()
+        
+        logger.info(f"Generating TTS audio in {len(chunks)} parallel chunks")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            parts = list(executor.map(synthesize, chunks))
+        
+        # MP3 frames can be appended directly; gTTS does the same for its own
+        # internal request splitting
+        with open(output_path, 'wb') as f:
+            for part in parts:
+                f.write(part)
+    
+    def _convert_to_wav(self, source_path: str, wav_path: str) -> bool:
+        """Transcode an audio file to 16-bit PCM WAV with ffmpeg."""
+        from moviepy.config import get_setting
+        
+        # Converted under a temporary name and moved into place when complete
+        partial_path = wav_path + '.part'
+        cmd = [get_setting("FFMPEG_BINARY"), '-y', '-v', 'error', '-i', source_path,
+               '-c:a', 'pcm_s16le', '-f', 'wav', partial_path]
+        try:
+            result = subprocess.run(cmd, capture_output=True)
+        except OSError as e:
+            logger.warning(f"Could not run ffmpeg for WAV conversion: {e}")
+            return False
+        
+        if result.returncode != 0:
+            logger.warning("WAV conversion failed, using MP3 audio directly")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return False
+        
+        os.replace(partial_path, wav_path)
+        return True
+    
+    def _prune_tts_cache(self, output_dir: str, keep_key: str, max_entries: int) -> None:
+        """Remove the least recently used TTS files beyond max_entries texts."""
+        if max_entries is None or max_entries <= 0:
+            return
+        
+        # Files and newest modification time per cache key (.mp3, .wav and .part)
+        paths: Dict[str, List[str]] = {}
+        last_used: Dict[str, float] = {}
+        with os.scandir(output_dir) as scan:
+            for entry in scan:
+                match = TTS_CACHE_FILE_PATTERN.fullmatch(entry.name)
+                if match is None or not entry.is_file():
+                    continue
+                key = match.group(1)
+                paths.setdefault(key, []).append(entry.path)
+                last_used[key] = max(last_used.get(key, 0.0), entry.stat().st_mtime)
+        
+        # The current text counts as one of the kept entries
+        others = sorted((key for key in paths if key != keep_key),
+                        key=last_used.__getitem__, reverse=True)
+        for key in others[max_entries - 1:]:
+            for path in paths[key]:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Could not remove cached TTS file {path}: {e}")
+    
     def _find_audio_file(self) -> Optional[str]:
-        """Find audio file in data directory."""
+        """Find audio file in data directory (cached after the first hit)."""
+        if self._audio_path_cache is not None:
+            return self._audio_path_cache
+        
         data_dir = os.path.dirname(self.paths.get('input_text', 'data/input.txt'))
-        audio_extensions = ['.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg']
         
-        for file in os.listdir(data_dir):
-            if any(file.lower().endswith(ext) for ext in audio_extensions):
-                audio_path = os.path.join(data_dir, file)
-                logger.info(f"Found audio file: {audio_path}")
-                return audio_path
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS and entry.is_file():
+                    logger.info(f"Found audio file: {entry.path}")
+                    self._audio_path_cache = entry.path
+                    return entry.path
         
         logger.warning(f"No audio file found in {data_dir}")
         return None
     
-    def get_audio_duration(self, audio: AudioFileClip) -> float:
-        """Get duration of audio clip."""
+    def get_audio_duration(self, audio) -> float:
+        """
+        Get duration of audio clip.
+        
+        Args:
+            audio: An AudioFileClip, or a path to an audio file. Paths are probed
+                with ffprobe so no decoder has to be started.
+        """
         if audio is None:
             return 0.0
+        
+        if isinstance(audio, str):
+            from .utils import probe_duration
+            duration = probe_duration(audio)
+            if duration is not None:
+                return duration
+            
+            # ffprobe unavailable, fall back to opening the file
+            clip = AudioFileClip(audio)
+            try:
+                return clip.duration
+            finally:
+                clip.close()
+        
         return audio.duration
     
-    def create_silence(self, duration: float) -> Optional[AudioFileClip]:
+    def create_silence(self, duration: float, fps: int = 44100) -> Optional[AudioClip]:
         """Create silent audio clip of specified duration."""
-        if not TTS_AVAILABLE:
-            logger.warning("Cannot create silence without pydub. Using default duration.")
-            return None
-        
         try:
-            # Create silent audio using pydub
-            silent_audio = AudioSegment.silent(duration=int(duration * 1000))  # Convert to milliseconds
+            # Frames are generated on demand, so silence of any length costs
+            # no memory up front and never touches disk
+            def make_silence(t):
+                if isinstance(t, np.ndarray):
+                    return np.zeros((len(t), 2), dtype=np.float32)
+                return np.zeros(2, dtype=np.float32)
             
-            # Save to temporary file
-            output_dir = self.paths.get('output_dir', 'data/output')
-            os.makedirs(output_dir, exist_ok=True)
-            temp_path = os.path.join(output_dir, 'temp_silence.wav')
-            silent_audio.export(temp_path, format="wav")
-            
-            # Load as MoviePy audio clip
-            audio_clip = AudioFileClip(temp_path)
+            audio_clip = AudioClip(make_silence, duration=duration, fps=fps)
+            audio_clip.nchannels = 2
             logger.info(f"Created silent audio clip: {duration:.2f}s")
             
             return audio_clip
@@ -147,20 +364,52 @@ class AudioGenerator:
             return audio
         
         if current_duration > target_duration:
-            # Trim audio
+            # Trim audio. subclip() is a shallow copy that shares the source's
+            # ffmpeg reader, so no second decoder process is started.
             logger.info(f"Trimming audio from {current_duration:.2f}s to {target_duration:.2f}s")
             return audio.subclip(0, target_duration)
         else:
             # Extend audio by looping or adding silence
             logger.info(f"Extending audio from {current_duration:.2f}s to {target_duration:.2f}s")
             
-            # Calculate how many times to loop
-            loop_count = int(target_duration / current_duration) + 1
-            
-            # Create looped audio
-            looped_clips = [audio] * loop_count
-            from moviepy.editor import concatenate_audioclips
-            extended_audio = concatenate_audioclips(looped_clips)
+            if target_duration <= MAX_TILED_LOOP_SECONDS:
+                looped = self._decode_looped(audio, target_duration)
+                if looped is not None:
+                    return looped
             
-            # Trim to exact duration
-            return extended_audio.subclip(0, target_duration)
\ No newline at end of file
+            # Too long to hold in memory, loop the clip lazily instead
+            return audio_loop(audio, duration=target_duration)
+    
+    def _decode_looped(self, audio, target_duration: float) -> Optional[AudioArrayClip]:
+        """
+        Decode a clip once and repeat it up to target_duration in one float32 buffer.
+        
+        The clip is decoded in short chunks straight into the output buffer,
+        which is then filled by copying the decoded loop forward, so the
+        buffer is the only full-length array. Returns None for an empty clip.
+        """
+        fps = getattr(audio, 'fps', None) or 44100
+        total_samples = int(target_duration * fps)
+        
+        looped = None
+        filled = 0
+        for chunk in audio.iter_chunks(fps=fps, chunk_duration=2.0):
+            chunk = np.asarray(chunk)
+            if looped is None:
+                looped = np.empty((total_samples,) + chunk.shape[1:], dtype=np.float32)
+            count = min(len(chunk), total_samples - filled)
+            looped[filled:filled + count] = chunk[:count]
+            filled += count
+            if filled >= total_samples:
+                break
+        
+        if looped is None or filled == 0:
+            return None
+        
+        period = filled
+        while filled < total_samples:
+            count = min(period, total_samples - filled)
+            looped[filled:filled + count] = looped[:count]
+            filled += count
+        
+        return AudioArrayClip(looped, fps=fps)
\ No newline at end of file
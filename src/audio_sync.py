@@ -2,11 +2,19 @@
 Audio-slide synchronization module for creating perfectly timed slideshows.
 """
 import os
+import re
+import hashlib
 import logging
+import itertools
+import subprocess
+import tempfile
+import zipfile
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Iterator
 from moviepy.editor import AudioFileClip
 
+from .utils import get_cache_dir
+
 try:
     import librosa
     LIBROSA_AVAILABLE = True
@@ -14,8 +22,20 @@ except ImportError:
     LIBROSA_AVAILABLE = False
     logging.warning("librosa not available. Install with 'pip install librosa' for advanced audio analysis.")
 
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError: the Python package is there but libsndfile is missing
+    SOUNDFILE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+SILENCE_LINE_PATTERN = re.compile(r'silence_(start|end): (-?\d+(?:\.\d+)?)')
+
+# Decoded analysis signals kept in the user cache directory (most recently used)
+ANALYSIS_CACHE_ENTRIES = 16
+
 
 class AudioSyncManager:
     """Manages audio-slide synchronization with multiple detection methods."""
@@ -24,14 +44,19 @@ class AudioSyncManager:
         self.config = config
         self.audio_config = config.get('audio', {})
         self.sync_config = self.audio_config.get('sync', {})
+        # Decoded analysis signals keyed by clip identity: id -> (duration, mono, sr)
+        self._audio_cache: Dict[int, Tuple[float, np.ndarray, int]] = {}
     
-    def calculate_slide_timings(self, audio: AudioFileClip, num_images: int) -> List[float]:
+    def calculate_slide_timings(self, audio: AudioFileClip, num_images: int,
+                                audio_path: Optional[str] = None) -> List[float]:
         """
         Calculate optimal slide transition timings based on audio analysis.
         
         Args:
             audio: The audio clip to analyze
             num_images: Number of images/slides
+            audio_path: File backing the clip, if any (defaults to the clip's
+                filename; clips cut from the start of a file are fine)
             
         Returns:
             List of timestamps (in seconds) for slide transitions
@@ -41,13 +66,15 @@ class AudioSyncManager:
             return self._even_distribution(audio.duration, num_images)
         
         sync_mode = self.sync_config.get('mode', 'auto')
+        if audio_path is None:
+            audio_path = getattr(audio, 'filename', None)
         
         logger.info(f"Calculating slide timings using '{sync_mode}' mode")
         
         if sync_mode == 'manual':
             return self._manual_timestamps(audio.duration, num_images)
         elif sync_mode == 'auto':
-            return self._auto_detection(audio, num_images)
+            return self._auto_detection(audio, num_images, audio_path)
         elif sync_mode == 'beat_detection':
             return self._beat_detection(audio, num_images)
         else:
@@ -67,7 +94,8 @@ class AudioSyncManager:
     
     def _manual_timestamps(self, duration: float, num_images: int) -> List[float]:
         """Use manually specified timestamps."""
-        manual_times = self.sync_config.get('timestamps', [])
+        # Copy so padding below never grows the list in the config
+        manual_times = list(self.sync_config.get('timestamps', []))
         
         if not manual_times:
             logger.warning("Manual mode selected but no timestamps provided, using even distribution")
@@ -78,13 +106,10 @@ class AudioSyncManager:
             logger.warning(f"Not enough timestamps ({len(manual_times)}) for {num_images} images")
             # Pad with even distribution for remaining slides
             last_time = manual_times[-1] if manual_times else 0
-            remaining_duration = duration - last_time
             remaining_slides = num_images - len(manual_times)
             
             if remaining_slides > 0:
-                slide_duration = remaining_duration / remaining_slides
-                for i in range(remaining_slides):
-                    manual_times.append(last_time + (i + 1) * slide_duration)
+                manual_times.extend(np.linspace(last_time, duration, remaining_slides + 1)[1:].tolist())
         
         # Truncate if too many timestamps
         timings = manual_times[:num_images]
@@ -97,40 +122,59 @@ class AudioSyncManager:
         logger.info(f"Manual timestamps: {timings}")
         return timings
     
-    def _auto_detection(self, audio: AudioFileClip, num_images: int) -> List[float]:
+    def _auto_detection(self, audio: AudioFileClip, num_images: int,
+                        audio_path: Optional[str] = None) -> List[float]:
         """Automatically detect slide transitions based on audio features."""
         try:
-            # Get audio data
-            audio_data = audio.to_soundarray()
-            
-            # Handle the case where audio_data might be empty or malformed
-            if audio_data is None or len(audio_data) == 0:
-                logger.warning("No audio data available for analysis")
-                return self._even_distribution(audio.duration, num_images)
-            
-            # Convert stereo to mono safely
-            if len(audio_data.shape) > 1 and audio_data.shape[1] > 1:
-                audio_data = np.mean(audio_data, axis=1)
-            elif len(audio_data.shape) > 1:
-                audio_data = audio_data.flatten()
-            
-            # Ensure we have a valid 1D array
-            if len(audio_data.shape) != 1:
-                logger.warning("Unexpected audio data shape, falling back to even distribution")
-                return self._even_distribution(audio.duration, num_images)
-            
-            sample_rate = audio.fps
             duration = audio.duration
+            auto_config = self.sync_config.get('auto', {})
+            detector = auto_config.get('detector', 'onset')
+            use_onset = detector == 'onset' and LIBROSA_AVAILABLE
             
-            # Detect silence/pause points
-            silence_points = self._detect_silence_points(audio_data, sample_rate)
+            # For file-backed audio, let ffmpeg scan levels without decoding
+            # the samples into Python
+            silence_points = None
+            timings = None
+            if audio_path and not use_onset:
+                silence_points = self._detect_silence_ffmpeg(
+                    audio_path,
+                    auto_config.get('silence_threshold', -40),
+                    auto_config.get('min_silence_duration', 0.1),
+                    duration
+                )
             
-            if len(silence_points) >= num_images - 1:
-                # We have enough silence points
-                timings = self._select_best_silence_points(silence_points, num_images, duration)
-            else:
-                # Not enough natural breaks, use hybrid approach
-                timings = self._hybrid_timing(silence_points, num_images, duration)
+            if silence_points is None:
+                audio_data, sample_rate = self._prepare_analysis_signal(audio)
+                
+                # Handle the case where audio_data might be empty or malformed
+                if audio_data is None or len(audio_data) == 0:
+                    logger.warning("No audio data available for analysis")
+                    return self._even_distribution(audio.duration, num_images)
+                
+                # Detect silence/pause points (spectral-flux lows when librosa
+                # is available, RMS level otherwise)
+                if use_onset:
+                    silence_points = self._detect_low_activity_points(audio_data, sample_rate, num_images)
+                else:
+                    # Stop scanning as soon as every boundary has been accepted;
+                    # the result is what _select_best_silence_points would pick
+                    scan, seen = itertools.tee(self._iter_silence_points(audio_data, sample_rate))
+                    accepted = list(itertools.islice(self._iter_accepted_points(scan),
+                                                     max(0, num_images - 1)))
+                    if len(accepted) == max(0, num_images - 1):
+                        timings = [0.0] + accepted
+                    else:
+                        # The scan ran to the end, so seen holds every point
+                        silence_points = list(seen)
+                        logger.info(f"Detected {len(silence_points)} silence points")
+            
+            if timings is None:
+                if len(silence_points) >= num_images - 1:
+                    # We have enough silence points
+                    timings = self._select_best_silence_points(silence_points, num_images, duration)
+                else:
+                    # Not enough natural breaks, use hybrid approach
+                    timings = self._hybrid_timing(silence_points, num_images, duration)
             
             logger.info(f"Auto-detected timings: {[f'{t:.2f}s' for t in timings]}")
             return timings
@@ -139,8 +183,196 @@ class AudioSyncManager:
             logger.error(f"Error in auto detection: {e}")
             return self._even_distribution(audio.duration, num_images)
     
+    def _prepare_analysis_signal(self, audio: AudioFileClip) -> Tuple[np.ndarray, int]:
+        """
+        Decode audio once as a low-rate mono float32 signal for analysis.
+        
+        Silence and beat boundaries don't need the full sample rate, so
+        the clip is read at ``sync.analysis_sample_rate`` (default 8 kHz)
+        and downmixed chunk by chunk. The result is cached per clip until
+        clear_cache() is called.
+        """
+        cached = self._audio_cache.get(id(audio))
+        if cached is not None and cached[0] == audio.duration:
+            return cached[1], cached[2]
+        
+        sample_rate = int(self.sync_config.get('analysis_sample_rate', 8000))
+        
+        cache_path = self._analysis_cache_path(audio, sample_rate)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with np.load(cache_path, allow_pickle=False) as data:
+                    mono = data['mono']
+                self._audio_cache[id(audio)] = (audio.duration, mono, sample_rate)
+                os.utime(cache_path)  # Mark as recently used for pruning
+                logger.info(f"Loaded cached analysis signal: {cache_path}")
+                return mono, sample_rate
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+                # Drop it so the next run writes a good copy instead of failing again
+                logger.warning(f"Removing unreadable analysis cache {cache_path}: {e}")
+                try:
+                    os.remove(cache_path)
+                except OSError:
+                    pass
+        
+        # libsndfile reads the file directly as float32, skipping moviepy's
+        # ffmpeg pipe; anything it can't read goes through moviepy
+        mono = self._read_analysis_signal_soundfile(audio, sample_rate)
+        
+        if mono is None:
+            # Downmix straight into a preallocated float32 buffer: one pass
+            # per chunk, no float64 mono temporaries and no final concatenate
+            mono = np.empty(int(sample_rate * audio.duration), dtype=np.float32)
+            filled = 0
+            
+            # Short chunks: file readers only buffer a few seconds of source audio
+            for chunk in audio.iter_chunks(fps=sample_rate, chunk_duration=2.0):
+                chunk = np.asarray(chunk)
+                self._downmix_into(chunk, mono[filled:filled + len(chunk)])
+                filled += len(chunk)
+            
+            mono = mono[:filled]
+        
+        self._audio_cache[id(audio)] = (audio.duration, mono, sample_rate)
+        
+        if cache_path:
+            self._save_analysis_cache(cache_path, mono)
+        
+        return mono, sample_rate
+    
+    def _save_analysis_cache(self, cache_path: str, mono: np.ndarray) -> None:
+        """
+        Write an analysis signal to the disk cache (best effort) and prune old entries.
+        
+        The file is written under a temporary name and moved into place, so
+        an interrupted run never leaves a truncated entry behind.
+        """
+        cache_dir = os.path.dirname(cache_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f, mono=mono)
+                os.replace(temp_path, cache_path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write analysis cache {cache_path}: {e}")
+            return
+        
+        max_entries = self.sync_config.get('cache_entries', ANALYSIS_CACHE_ENTRIES)
+        if max_entries is None or max_entries <= 0:
+            return
+        try:
+            with os.scandir(cache_dir) as scan:
+                entries = [(entry.stat().st_mtime, entry.path) for entry in scan
+                           if entry.name.endswith('.npz') and entry.is_file()]
+        except OSError:
+            return
+        for _, path in sorted(entries, reverse=True)[max_entries:]:
+            if path != cache_path:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Could not remove analysis cache {path}: {e}")
+    
+    def _read_analysis_signal_soundfile(self, audio: AudioFileClip,
+                                        sample_rate: int) -> Optional[np.ndarray]:
+        """
+        Read a file-backed clip with soundfile at sample_rate, mono float32.
+        
+        The file is streamed in blocks and each output sample takes the
+        nearest source frame, as moviepy's reader does. Returns None if
+        soundfile is unavailable or can't read the file.
+        """
+        audio_path = getattr(audio, 'filename', None)
+        if not SOUNDFILE_AVAILABLE or not audio_path:
+            return None
+        
+        extension = os.path.splitext(audio_path)[1].lstrip('.').upper()
+        if extension not in soundfile.available_formats():
+            return None
+        
+        try:
+            with soundfile.SoundFile(audio_path) as f:
+                # Source frame for each output sample, within the clip's duration
+                num_samples = int(sample_rate * audio.duration)
+                source_frames = np.round(np.arange(num_samples) * (f.samplerate / sample_rate)).astype(np.int64)
+                
+                mono = np.empty(num_samples, dtype=np.float32)
+                filled = 0
+                block_start = 0
+                for block in f.blocks(blocksize=f.samplerate * 2, dtype='float32', always_2d=True):
+                    block_end = block_start + len(block)
+                    stop = int(np.searchsorted(source_frames, block_end))
+                    self._downmix_into(block[source_frames[filled:stop] - block_start], mono[filled:stop])
+                    filled = stop
+                    block_start = block_end
+                    if filled >= num_samples:
+                        break
+        except (RuntimeError, OSError, ValueError) as e:
+            logger.debug(f"soundfile could not read {audio_path}: {e}")
+            return None
+        
+        return mono[:filled]
+    
+    @staticmethod
+    def _downmix_into(frames: np.ndarray, out: np.ndarray) -> None:
+        """Average channels of frames into the float32 buffer out."""
+        if frames.ndim == 2 and frames.shape[1] == 2:
+            np.add(frames[:, 0], frames[:, 1], out=out)
+            out *= 0.5
+        elif frames.ndim == 2:
+            np.mean(frames, axis=1, out=out)
+        else:
+            out[:] = frames
+    
+    def _analysis_cache_path(self, audio: AudioFileClip, sample_rate: int) -> Optional[str]:
+        """
+        Return the on-disk cache file for a file-backed clip's analysis signal.
+        
+        The key hashes the first MiB of the file together with its size,
+        mtime, the clip duration and the analysis rate, so edits or trims
+        get a fresh entry. Entries live in the per-user cache directory.
+        Returns None when caching is off or there is no file.
+        """
+        audio_path = getattr(audio, 'filename', None)
+        if not self.sync_config.get('cache_analysis', True) or not audio_path:
+            return None
+        
+        try:
+            stat = os.stat(audio_path)
+            digest = hashlib.blake2b(digest_size=16)
+            with open(audio_path, 'rb') as f:
+                digest.update(f.read(1 << 20))
+        except OSError:
+            return None
+        
+        digest.update(f"{stat.st_size}|{stat.st_mtime_ns}|{audio.duration}|{sample_rate}".encode())
+        return get_cache_dir('audio_sync', f"{digest.hexdigest()}.npz")
+    
+    def clear_cache(self):
+        """Drop cached analysis signals so their buffers can be freed."""
+        self._audio_cache.clear()
+    
     def _detect_silence_points(self, audio_data: np.ndarray, sample_rate: int) -> List[float]:
         """Detect points of silence/low audio activity."""
+        merged_points = list(self._iter_silence_points(audio_data, sample_rate))
+        logger.info(f"Detected {len(merged_points)} silence points")
+        return merged_points
+    
+    def _iter_silence_points(self, audio_data: np.ndarray, sample_rate: int,
+                             chunk_seconds: float = 30.0) -> Iterator[float]:
+        """
+        Yield midpoints of silent regions in time order.
+        
+        Audio is scanned in chunks of chunk_seconds, so a consumer that stops
+        early never pays for the rest of the file, and the window levels in
+        flight never exceed one chunk's worth, however long the audio. A
+        region is yielded once the next one starts (or the audio ends).
+        """
         auto_config = self.sync_config.get('auto', {})
         silence_threshold = auto_config.get('silence_threshold', -40)  # dB
         
@@ -148,74 +380,164 @@ class AudioSyncManager:
         window_size = int(0.1 * sample_rate)  # 100ms windows
         hop_size = int(0.05 * sample_rate)    # 50ms hop
         
-        silence_points = []
-        
-        for i in range(0, len(audio_data) - window_size, hop_size):
-            window = audio_data[i:i + window_size]
+        num_frames = len(range(0, len(audio_data) - window_size, hop_size))
+        if num_frames <= 0:
+            return
+        
+        samples = audio_data.astype(np.float32, copy=False)
+        frames_per_chunk = max(1, int(chunk_seconds * sample_rate / hop_size))
+        region = None  # [start, end] of the silent region still open
+        
+        for first in range(0, num_frames, frames_per_chunk):
+            count = min(frames_per_chunk, num_frames - first)
+            chunk = samples[first * hop_size:(first + count - 1) * hop_size + window_size]
+            silent_idx = self._silent_frame_indices(chunk, window_size, hop_size,
+                                                    count, silence_threshold) + first
+            if not len(silent_idx):
+                continue
             
-            # Calculate RMS and convert to dB
-            rms = np.sqrt(np.mean(window ** 2))
-            if rms > 0:
-                db = 20 * np.log10(rms)
-                
-                # Check if below silence threshold
-                if db < silence_threshold:
-                    timestamp = i / sample_rate
-                    silence_points.append(timestamp)
-        
-        # Merge nearby silence points
-        merged_points = []
-        if silence_points:
-            current_start = silence_points[0]
-            current_end = silence_points[0]
-            
-            for point in silence_points[1:]:
-                if point - current_end < 0.5:  # Within 500ms
-                    current_end = point
-                else:
-                    # Add midpoint of silence region
-                    merged_points.append((current_start + current_end) / 2)
-                    current_start = point
-                    current_end = point
+            # Group silent frames less than 500ms apart, then join the first
+            # group to the region left open by the previous chunk
+            times = silent_idx * hop_size / sample_rate
+            breaks = np.flatnonzero(np.diff(times) >= 0.5)
+            starts = times[np.concatenate(([0], breaks + 1))]
+            ends = times[np.concatenate((breaks, [len(times) - 1]))]
             
-            # Add final point
-            merged_points.append((current_start + current_end) / 2)
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                if region is not None and start - region[1] < 0.5:
+                    region[1] = end
+                    continue
+                if region is not None:
+                    yield (region[0] + region[1]) / 2
+                region = [start, end]
+        
+        if region is not None:
+            yield (region[0] + region[1]) / 2
+    
+    def _silent_frame_indices(self, samples: np.ndarray, window_size: int, hop_size: int,
+                              num_frames: int, silence_threshold: float) -> np.ndarray:
+        """Return indices of hop-spaced windows whose level is below silence_threshold dB."""
+        # 20*log10(sqrt(mean_sq)) < T  <=>  mean_sq < 10**(T/10): compare in
+        # mean-square units, with no sqrt or log per window. Digital silence
+        # (mean_sq == 0) counts as silent.
+        threshold_sq = 10.0 ** (silence_threshold / 10.0)
+        
+        if window_size % hop_size == 0:
+            # Windows overlap by whole hops: square-sum each hop-sized block
+            # once, then take sliding sums of neighbouring blocks. Every
+            # sample is touched once, not window_size / hop_size times.
+            blocks_per_window = window_size // hop_size
+            blocks = samples[:(num_frames + blocks_per_window - 1) * hop_size].reshape(-1, hop_size)
+            block_sums = np.einsum('ij,ij->i', blocks, blocks)
+            cumulative = np.concatenate(([0.0], np.cumsum(block_sums, dtype=np.float64)))
+            mean_sq = (cumulative[blocks_per_window:blocks_per_window + num_frames]
+                       - cumulative[:num_frames]) / window_size
+        else:
+            # Strided view of all windows at once (no copy), then one
+            # mean-square reduction per window
+            frames = np.lib.stride_tricks.sliding_window_view(samples, window_size)[::hop_size][:num_frames]
+            mean_sq = np.einsum('ij,ij->i', frames, frames) / window_size
         
-        logger.info(f"Detected {len(merged_points)} silence points")
-        return merged_points
+        return np.flatnonzero(mean_sq < threshold_sq)
     
-    def _select_best_silence_points(self, silence_points: List[float], 
-                                   num_images: int, duration: float) -> List[float]:
-        """Select the best silence points for slide transitions."""
-        auto_config = self.sync_config.get('auto', {})
-        min_duration = auto_config.get('min_slide_duration', 3)
-        max_duration = auto_config.get('max_slide_duration', 15)
+    def _detect_silence_ffmpeg(self, audio_path: str, threshold_db: float,
+                               min_silence_s: float, duration: float) -> Optional[List[float]]:
+        """
+        Detect silence with ffmpeg's silencedetect filter.
         
-        # Always start with 0
-        timings = [0.0]
+        Returns midpoints of silent regions (regions less than 500ms apart are
+        merged, as in _detect_silence_points), or None if ffmpeg fails.
+        """
+        from moviepy.config import get_setting
         
-        # Filter silence points that create reasonable slide durations
-        candidates = []
-        for point in silence_points:
-            if point > min_duration:  # Must be after minimum duration
-                candidates.append(point)
+        cmd = [get_setting("FFMPEG_BINARY"), '-hide_banner', '-nostats',
+               '-t', f"{duration:.3f}", '-i', audio_path,
+               '-af', f"silencedetect=n={threshold_db}dB:d={min_silence_s}",
+               '-f', 'null', '-']
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError as e:
+            logger.warning(f"Could not run ffmpeg silencedetect: {e}")
+            return None
+        
+        if result.returncode != 0:
+            logger.warning(f"ffmpeg silencedetect failed: {result.stderr.strip()[-200:]}")
+            return None
+        
+        regions = []
+        for kind, value in SILENCE_LINE_PATTERN.findall(result.stderr):
+            if kind == 'start':
+                regions.append([max(0.0, float(value)), duration])
+            elif regions:
+                regions[-1][1] = min(float(value), duration)
+        
+        merged = []
+        for start, end in regions:
+            if merged and start - merged[-1][1] < 0.5:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
         
-        # Select points that create balanced slide durations
-        selected_points = []
-        last_time = 0.0
+        points = [(start + end) / 2 for start, end in merged]
+        logger.info(f"Detected {len(points)} silence points")
+        return points
+    
+    def _detect_low_activity_points(self, audio_data: np.ndarray, sample_rate: int,
+                                    num_images: int) -> List[float]:
+        """Detect low-activity points from onset strength (requires librosa)."""
+        auto_config = self.sync_config.get('auto', {})
         
-        for candidate in candidates:
-            slide_duration = candidate - last_time
-            
-            if min_duration <= slide_duration <= max_duration:
-                selected_points.append(candidate)
-                last_time = candidate
-                
-                if len(selected_points) >= num_images - 1:
-                    break
+        hop_length = 256
+        onset_env = librosa.onset.onset_strength(y=audio_data, sr=sample_rate, hop_length=hop_length)
+        if len(onset_env) == 0:
+            return []
+        
+        # Average over half a second so sustained pauses stand out from the
+        # short gaps between syllables or notes
+        frames_per_second = sample_rate / hop_length
+        neighbourhood = max(1, int(0.5 * frames_per_second))
+        activity = np.convolve(onset_env, np.full(neighbourhood, 1.0 / neighbourhood), mode='same')
+        
+        # Local minima of the activity curve
+        low_frames = librosa.util.peak_pick(
+            -activity,
+            pre_max=neighbourhood, post_max=neighbourhood,
+            pre_avg=neighbourhood, post_avg=neighbourhood,
+            delta=0.0, wait=neighbourhood
+        )
+        
+        # Relative threshold, so quiet recordings behave like loud ones
+        activity_ratio = auto_config.get('activity_ratio', 0.5)
+        low_frames = low_frames[activity[low_frames] < activity_ratio * activity.mean()]
+        
+        # Keep the quietest candidates, back in time order
+        low_frames = low_frames[np.argsort(activity[low_frames], kind='stable')[:num_images * 10]]
+        low_frames.sort()
+        
+        points = librosa.frames_to_time(low_frames, sr=sample_rate, hop_length=hop_length).tolist()
+        logger.info(f"Detected {len(points)} low-activity points")
+        return points
+    
+    def _iter_accepted_points(self, silence_points: Iterable[float]) -> Iterator[float]:
+        """Yield, in order, the silence points that end a slide of acceptable length."""
+        auto_config = self.sync_config.get('auto', {})
+        min_duration = auto_config.get('min_slide_duration', 3)
+        max_duration = auto_config.get('max_slide_duration', 15)
         
-        # Add selected points to timings
-        timings.extend(selected_points[:num_images - 1])
+        last_time = 0.0
+        for point in silence_points:
+            if point > min_duration and min_duration <= point - last_time <= max_duration:
+                yield point
+                last_time = point
+    
+    def _select_best_silence_points(self, silence_points: Iterable[float], 
+                                   num_images: int, duration: float) -> List[float]:
+        """Select the best silence points for slide transitions."""
+        # Always start with 0, then the first points that create balanced
+        # slide durations
+        timings = [0.0]
+        timings.extend(itertools.islice(self._iter_accepted_points(silence_points),
+                                        max(0, num_images - 1)))
         
         # If we don't have enough points, fill with even distribution
         while len(timings) < num_images:
@@ -242,22 +564,18 @@ class AudioSyncManager:
             timings.extend(selected_points)
             timings.sort()
         
-        # Fill remaining with even distribution
-        while len(timings) < num_images:
+        # Fill remaining with even steps: the rest of the audio split evenly
+        # if nothing was found, else continue the average gap so far,
+        # stopping at the end of the audio
+        remaining_slides = num_images - len(timings)
+        if remaining_slides > 0:
             if len(timings) == 1:
-                # Add point based on available silence or even distribution
-                remaining_duration = duration - timings[-1]
-                remaining_slides = num_images - len(timings)
-                next_time = timings[-1] + (remaining_duration / remaining_slides)
+                gap = (duration - timings[-1]) / remaining_slides
             else:
-                # Continue pattern
-                avg_gap = (timings[-1] - timings[0]) / (len(timings) - 1)
-                next_time = timings[-1] + avg_gap
+                gap = (timings[-1] - timings[0]) / (len(timings) - 1)
             
-            if next_time < duration:
-                timings.append(next_time)
-            else:
-                break
+            extra = timings[-1] + gap * np.arange(1, remaining_slides + 1)
+            timings.extend(extra[extra < duration].tolist())
         
         return timings[:num_images]
     
@@ -267,43 +585,44 @@ class AudioSyncManager:
             logger.warning("Beat detection requires librosa. Install with: pip install librosa")
             return self._even_distribution(audio.duration, num_images)
         
+        # With so few slides, beat placement is noise; skip the analysis
+        if num_images < 4:
+            logger.info(f"Only {num_images} slides, using even distribution instead of beat detection")
+            return self._even_distribution(audio.duration, num_images)
+        
         try:
-            # Load audio for librosa
-            audio_data = audio.to_soundarray()
-            if len(audio_data.shape) > 1:
-                audio_data = np.mean(audio_data, axis=1)
+            audio_data, sample_rate = self._prepare_analysis_signal(audio)
             
-            sample_rate = audio.fps
+            beat_config = self.sync_config.get('beat_detection', {})
+            slides_per_beat = beat_config.get('slides_per_beat', 4)
             
-            # Detect beats
+            # Peak-normalize so the tracker doesn't depend on recording level
+            peak = np.max(np.abs(audio_data)) if len(audio_data) else 0.0
+            audio_data = audio_data / (peak + 1e-9)
+            
+            # Detect beats (smaller hop keeps ~32ms resolution at 8 kHz)
+            hop_length = 256
             tempo, beat_frames = librosa.beat.beat_track(
                 y=audio_data, 
                 sr=sample_rate,
-                hop_length=512
+                hop_length=hop_length,
+                start_bpm=beat_config.get('start_bpm', 120)
             )
+            tempo = float(np.atleast_1d(tempo)[0])
             
             # Convert beat frames to time
-            beat_times = librosa.frames_to_time(beat_frames, sr=sample_rate)
-            
-            beat_config = self.sync_config.get('beat_detection', {})
-            slides_per_beat = beat_config.get('slides_per_beat', 4)
+            beat_times = librosa.frames_to_time(beat_frames, sr=sample_rate, hop_length=hop_length)
             
             # Select every Nth beat for slide transitions
             slide_beats = beat_times[::slides_per_beat]
             
-            # Ensure we start with 0 and have the right number of slides
-            timings = [0.0]
-            timings.extend(slide_beats[1:num_images])
+            if tempo <= 0 or len(slide_beats) < num_images:
+                logger.warning(f"Beat detection found {len(beat_times)} beats at {tempo:.1f} BPM, "
+                               f"not enough for {num_images} slides; using even distribution")
+                return self._even_distribution(audio.duration, num_images)
             
-            # Pad or trim to exact number needed
-            while len(timings) < num_images:
-                if len(timings) > 1:
-                    avg_gap = (timings[-1] - timings[-2])
-                    timings.append(timings[-1] + avg_gap)
-                else:
-                    timings.append(audio.duration / 2)
-            
-            timings = timings[:num_images]
+            # Start with 0, then every Nth beat after the first
+            timings = [0.0] + slide_beats[1:num_images].tolist()
             
             logger.info(f"Beat-based timings at {tempo:.1f} BPM: {[f'{t:.2f}s' for t in timings]}")
             return timings
@@ -314,46 +633,43 @@ class AudioSyncManager:
     
     def get_slide_durations(self, timings: List[float], total_duration: float) -> List[float]:
         """Calculate individual slide durations from timing points."""
-        durations = []
+        if not timings:
+            return []
         
-        for i in range(len(timings)):
-            if i < len(timings) - 1:
-                duration = timings[i + 1] - timings[i]
-            else:
-                # Last slide duration
-                duration = total_duration - timings[i]
-            
-            durations.append(max(0.5, duration))  # Minimum 0.5s per slide
+        t = np.asarray(timings, dtype=np.float64)
+        durations = np.empty_like(t)
+        durations[:-1] = np.diff(t)
+        durations[-1] = total_duration - t[-1]  # Last slide duration
         
-        return durations
+        np.maximum(durations, 0.5, out=durations)  # Minimum 0.5s per slide
+        return durations.tolist()
     
     def validate_timings(self, timings: List[float], duration: float) -> List[float]:
         """Validate and fix timing issues."""
         if not timings:
             return [0.0]
         
-        # Ensure first timing is 0
-        if timings[0] != 0.0:
-            timings = [0.0] + timings
-        
-        # Sort timings
-        timings.sort()
+        t = np.asarray(timings, dtype=np.float64)
         
-        # Remove duplicates
-        unique_timings = []
-        for timing in timings:
-            if not unique_timings or timing != unique_timings[-1]:
-                unique_timings.append(timing)
+        # Ensure first timing is 0
+        if t[0] != 0.0:
+            t = np.concatenate(([0.0], t))
         
-        # Ensure all timings are within audio duration
-        valid_timings = [t for t in unique_timings if t < duration]
+        # Sort, remove duplicates and keep timings within audio duration
+        t = np.unique(t)
+        t = t[t < duration]
+        if t.size == 0:
+            return [0.0]
         
         # Ensure minimum gaps between slides
         min_gap = 0.5
-        filtered_timings = [valid_timings[0]]  # Always keep first
+        if np.all(np.diff(t) >= min_gap):
+            return t.tolist()
         
-        for timing in valid_timings[1:]:
+        # Close timings: keep each one only if far enough from the last kept
+        filtered_timings = [float(t[0])]  # Always keep first
+        for timing in t[1:].tolist():
             if timing - filtered_timings[-1] >= min_gap:
                 filtered_timings.append(timing)
         
-        return filtered_timings
\ No newline at end of file
+        return filtered_timings
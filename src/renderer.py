@@ -1,27 +1,155 @@
+import gc
 import os
 import logging
-from typing import Dict, Any, Optional, Tuple
-from moviepy.editor import AudioFileClip, CompositeVideoClip
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
 
 from .text_processor import TextProcessor
-from .audio_generator import AudioGenerator
-from .video_generator import VideoGenerator
 from .subtitle_generator import SubtitleGenerator
-from .utils import get_supported_image_files, sanitize_filename
+from .utils import get_supported_image_files, scan_media, sanitize_filename, find_hw_h264_encoder
+
+if TYPE_CHECKING:
+    from moviepy.editor import CompositeVideoClip
+    from .video_generator import SlideshowPlan
 
 logger = logging.getLogger(__name__)
 
 
-class Renderer:
-    """Orchestrates the entire video creation workflow."""
+class RendererMeta:
+    """
+    Project introspection (image discovery, info and setup validation).
+    
+    Kept free of MoviePy so that --info and --validate start quickly.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.paths = config.get('paths', {})
+        self.video_config = config.get('video', {})
+        self.text_config = config.get('text', {})
+        self.audio_config = config.get('audio', {})
+        self.image_config = config.get('image', {})
+        self.subtitle_config = config.get('subtitles', {})
+        self.supported_formats = tuple(self.image_config.get(
+            'supported_formats', [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]))
+    
+    def _load_images(self) -> list:
+        """Load and validate image files."""
+        images_dir = self.paths.get('images_dir', 'data/images')
+        
+        if not os.path.exists(images_dir):
+            logger.error(f"Images directory not found: {images_dir}")
+            return []
+        
+        images = get_supported_image_files(images_dir, self.supported_formats)
+        self._report_missing_images(images, images_dir)
+        return images
+    
+    def _report_missing_images(self, images: list, images_dir: str) -> None:
+        """Log an error when an existing images directory has no usable images."""
+        if not images:
+            logger.error(f"No supported image files found in {images_dir}")
+            logger.info(f"Supported formats: {', '.join(self.supported_formats)}")
+    
+    def _load_images_and_audio(self) -> Tuple[list, Optional[str]]:
+        """
+        Load image files and, unless TTS is enabled, find the audio file.
+        
+        When the images live in the same directory as the audio, that
+        directory is scanned once for both.
+        """
+        if self.audio_config.get('generate_from_text', False):
+            return self._load_images(), None
+        
+        images_dir = self.paths.get('images_dir', 'data/images')
+        data_dir = os.path.dirname(self.paths.get('input_text', 'data/input.txt'))
+        
+        if os.path.normpath(images_dir) == os.path.normpath(data_dir) and os.path.isdir(images_dir):
+            images, audio_files = scan_media(images_dir, self.supported_formats)
+            self._report_missing_images(images, images_dir)
+            return images, (audio_files[0] if audio_files else None)
+        
+        from .utils import find_audio_file
+        return self._load_images(), find_audio_file(data_dir)
+    
+    def get_project_info(self) -> Dict[str, Any]:
+        """Get information about the current project setup."""
+        images_dir = self.paths.get('images_dir', 'data/images')
+        images, audio_path = self._load_images_and_audio()
+        
+        audio_duration = None
+        if audio_path:
+            # Probe only; no need to open a decoder for the info view
+            from .utils import probe_duration
+            audio_duration = probe_duration(audio_path)
+        
+        # Check for text content
+        input_text_path = self.paths.get('input_text', 'data/input.txt')
+        text_file_exists = os.path.exists(input_text_path)
+        
+        return {
+            'images': {
+                'count': len(images),
+                'directory': images_dir,
+                'files': [os.path.basename(img) for img in images[:5]]  # First 5 files
+            },
+            'audio': {
+                'path': audio_path,
+                'duration': audio_duration,
+                'tts_enabled': self.audio_config.get('generate_from_text', False)
+            },
+            'text': {
+                'file_exists': text_file_exists,
+                'file_path': input_text_path,
+                'enabled': self.text_config.get('enabled', True),
+                'mode': self.text_config.get('mode', 'auto')
+            },
+            'video': {
+                'resolution': self.video_config.get('resolution', '720p'),
+                'scaling': self.video_config.get('scaling_method', 'fit')
+            }
+        }
+    
+    def validate_project_setup(self) -> Tuple[bool, list]:
+        """Validate that all required components are available."""
+        errors = []
+        images, audio_path = self._load_images_and_audio()
+        
+        # Check images
+        if not images:
+            errors.append("No images found in images directory")
+        
+        # Check audio (if not using TTS)
+        if not self.audio_config.get('generate_from_text', False) and not audio_path:
+            errors.append("No audio file found and TTS is not enabled")
+        
+        # Check text content (if text overlays are enabled)
+        if self.text_config.get('enabled', True):
+            text_mode = self.text_config.get('mode', 'auto')
+            input_text_path = self.paths.get('input_text', 'data/input.txt')
+            default_text = self.text_config.get('default_text', '').strip()
+            
+            if text_mode == 'from_file' and not os.path.exists(input_text_path):
+                errors.append(f"Text file not found: {input_text_path}")
+            elif text_mode == 'single' and not default_text:
+                errors.append("Single text mode selected but no default_text provided")
+        
+        return len(errors) == 0, errors
+
+
+class Renderer(RendererMeta):
+    """Orchestrates the entire video creation workflow."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        
+        # Only the full renderer needs MoviePy
+        from .audio_generator import AudioGenerator
+        from .video_generator import VideoGenerator
+        
         self.text_processor = TextProcessor(config)
         self.audio_generator = AudioGenerator(config)
         self.video_generator = VideoGenerator(config)
         self.subtitle_generator = SubtitleGenerator(config)
-        self.paths = config.get('paths', {})
     
     def create_slideshow(self, output_filename: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
@@ -60,22 +188,34 @@ class Renderer:
             
             logger.info(f"Audio loaded successfully (duration: {audio.duration:.2f}s)")
             
-            # Step 4: Create video
-            video = self.video_generator.create_slideshow_video(images, audio, text_settings)
-            if not video:
-                logger.error("Failed to create slideshow video")
-                return False, None
-            
-            # Step 5: Save video
             output_path = self._generate_output_path(output_filename)
-            success = self._save_video(video, output_path)
+            
+            # Steps 4-5: slides whose text doesn't animate are still frames,
+            # which can be piped straight to ffmpeg; everything else is
+            # composed in MoviePy. Timing and slides are prepared once for both.
+            plan = self.video_generator.plan_slideshow(images, audio, text_settings)
+            if self._save_slideshow_direct(images, audio, output_path, text_settings, plan):
+                success = True
+            else:
+                video = self.video_generator.create_slideshow_video(images, audio, text_settings, plan)
+                if not video:
+                    logger.error("Failed to create slideshow video")
+                    return False, None
+                
+                # Timings are resolved; free the decoded analysis signal before the
+                # encoder runs so it doesn't add to peak memory
+                if self.video_generator.audio_sync is not None:
+                    self.video_generator.audio_sync.clear_cache()
+                gc.collect()
+                
+                success = self._save_video(video, output_path)
             
             if not success:
                 logger.error("Failed to save video")
                 return False, None
             
             # Step 6: Generate subtitles (optional)
-            if text_settings and self.config.get('subtitles', {}).get('generate', False):
+            if text_settings and self.subtitle_config.get('generate', False):
                 self._generate_subtitles(text_settings, audio.duration, len(images))
             
             # Step 7: Save text settings for future use
@@ -89,24 +229,8 @@ class Renderer:
         except Exception as e:
             logger.error(f"Error during slideshow creation: {e}")
             return False, None
-    
-    def _load_images(self) -> list:
-        """Load and validate image files."""
-        images_dir = self.paths.get('images_dir', 'data/images')
-        
-        if not os.path.exists(images_dir):
-            logger.error(f"Images directory not found: {images_dir}")
-            return []
-        
-        supported_formats = self.config.get('image', {}).get('supported_formats', 
-                                           [".jpg", ".jpeg", ".png", ".bmp", ".tiff"])
-        images = get_supported_image_files(images_dir, supported_formats)
-        
-        if not images:
-            logger.error(f"No supported image files found in {images_dir}")
-            logger.info(f"Supported formats: {', '.join(supported_formats)}")
-        
-        return images
+        finally:
+            self.audio_generator.cleanup_temp_files()
     
     def _extract_text_for_tts(self, text_settings: Dict[str, Any]) -> str:
         """Extract text content for TTS generation."""
@@ -133,30 +257,52 @@ class Renderer:
                 filename += '.mp4'
         else:
             # Generate default filename
-            resolution = self.config.get('video', {}).get('resolution', '720p')
-            scaling = self.config.get('video', {}).get('scaling_method', 'fit')
+            resolution = self.video_config.get('resolution', '720p')
+            scaling = self.video_config.get('scaling_method', 'fit')
             filename = f"slideshow_{resolution}_{scaling}.mp4"
         
         return os.path.join(output_dir, filename)
     
-    def _save_video(self, video: CompositeVideoClip, output_path: str) -> bool:
-        """Save video to file."""
+    def _detect_hw_codec(self) -> Optional[str]:
+        """Return a working hardware H.264 encoder per video.hw_accel, or None."""
+        hw_accel = self.video_config.get('hw_accel', 'auto')
+        if not hw_accel or hw_accel == 'off':
+            return None
+        
+        from moviepy.config import get_setting
+        encoder = find_hw_h264_encoder(get_setting("FFMPEG_BINARY"), hw_accel)
+        if encoder:
+            return encoder
+        
+        if hw_accel != 'auto':
+            logger.warning(f"Hardware encoder '{hw_accel}' not available, using software encoding")
+        return None
+    
+    def _save_video(self, video: 'CompositeVideoClip', output_path: str) -> bool:
+        """
+        Save video to file.
+        
+        Called after audio-sync analysis has been released: encoding only
+        needs the clips themselves, not the decoded analysis PCM.
+        """
         try:
-            video_config = self.config.get('video', {})
-            
             logger.info(f"Saving video to: {output_path}")
             logger.info("This may take several minutes depending on video length and quality...")
             
-            video.write_videofile(
-                output_path,
-                fps=video_config.get('fps', 24),
-                codec=video_config.get('codec', 'libx264'),
-                audio_codec=video_config.get('audio_codec', 'aac'),
-                temp_audiofile="temp-audio.m4a",
-                remove_temp=True,
-                verbose=False,
-                logger=None
-            )
+            # Plain H.264 requests go to a hardware encoder when one works here
+            codec = self.video_config.get('codec', 'libx264')
+            hw_codec = self._detect_hw_codec() if codec == 'libx264' else None
+            
+            if hw_codec:
+                logger.info(f"Using hardware encoder: {hw_codec}")
+                try:
+                    self._write_video(video, output_path, hw_codec,
+                                      ['-b:v', str(self.video_config.get('hw_bitrate', '6M'))])
+                except Exception as e:
+                    logger.warning(f"Hardware encoding failed ({e}), retrying with {codec}")
+                    self._write_video(video, output_path, codec)
+            else:
+                self._write_video(video, output_path, codec)
             
             logger.info(f"Video saved successfully: {output_path}")
             return True
@@ -165,17 +311,70 @@ class Renderer:
             logger.error(f"Error saving video: {e}")
             return False
     
+    def _save_slideshow_direct(self, images: list, audio, output_path: str,
+                               text_settings: Optional[Dict[str, Any]] = None,
+                               plan: Optional['SlideshowPlan'] = None) -> bool:
+        """
+        Encode a still-frame slideshow by piping its frames straight to ffmpeg.
+        
+        Returns False when disabled (video.direct_encode) or when the direct
+        writer can't be used or fails, so the caller falls back to MoviePy.
+        A hardware encoder failure is retried once with the software codec.
+        """
+        if not self.video_config.get('direct_encode', True):
+            return False
+        
+        try:
+            codec = self.video_config.get('codec', 'libx264')
+            hw_codec = self._detect_hw_codec() if codec == 'libx264' else None
+            
+            # None until an encoder has run to completion or declined
+            written = None
+            if hw_codec:
+                try:
+                    written = self.video_generator.write_slideshow_ffmpeg(
+                        images, audio, output_path, hw_codec,
+                        ['-b:v', str(self.video_config.get('hw_bitrate', '6M'))], text_settings, plan)
+                except Exception as e:
+                    logger.warning(f"Hardware encoding failed ({e}), retrying with {codec}")
+            if written is None:
+                written = self.video_generator.write_slideshow_ffmpeg(
+                    images, audio, output_path, codec, text_settings=text_settings, plan=plan)
+            
+            if written:
+                logger.info(f"Video saved successfully: {output_path}")
+            return written
+            
+        except Exception as e:
+            logger.warning(f"Direct ffmpeg encoding failed ({e}), falling back to MoviePy")
+            return False
+    
+    def _write_video(self, video: 'CompositeVideoClip', output_path: str, codec: str,
+                     ffmpeg_params: Optional[list] = None) -> None:
+        """Encode video with the given codec (raises on failure)."""
+        tune = self.video_config.get('tune')
+        if tune and codec == 'libx264':
+            ffmpeg_params = list(ffmpeg_params or []) + ['-tune', str(tune)]
+        video.write_videofile(
+            output_path,
+            fps=self.video_config.get('fps', 24),
+            codec=codec,
+            audio_codec=self.video_config.get('audio_codec', 'aac'),
+            temp_audiofile="temp-audio.m4a",
+            remove_temp=True,
+            ffmpeg_params=ffmpeg_params,
+            preset=self.video_config.get('preset', 'medium'),
+            threads=self.video_config.get('threads'),
+            verbose=False,
+            logger=None
+        )
+    
     def _generate_subtitles(self, text_settings: Dict[str, Any], 
                            audio_duration: float, num_images: int) -> None:
         """Generate subtitle files."""
         try:
-            # Generate SRT subtitles
-            srt_path = self.subtitle_generator.generate_subtitles(
-                text_settings, audio_duration, num_images
-            )
-            
-            # Generate VTT subtitles
-            vtt_path = self.subtitle_generator.generate_vtt_subtitles(
+            # Generate SRT and VTT subtitles from one set of entries
+            srt_path, vtt_path = self.subtitle_generator.generate_srt_and_vtt(
                 text_settings, audio_duration, num_images
             )
             
@@ -184,71 +383,3 @@ class Renderer:
             
         except Exception as e:
             logger.error(f"Error generating subtitles: {e}")
-    
-    def get_project_info(self) -> Dict[str, Any]:
-        """Get information about the current project setup."""
-        images_dir = self.paths.get('images_dir', 'data/images')
-        images = self._load_images()
-        
-        # Try to find audio
-        audio_path = None
-        if not self.config.get('audio', {}).get('generate_from_text', False):
-            data_dir = os.path.dirname(self.paths.get('input_text', 'data/input.txt'))
-            from .utils import find_audio_file
-            audio_path = find_audio_file(data_dir)
-        
-        # Check for text content
-        input_text_path = self.paths.get('input_text', 'data/input.txt')
-        text_file_exists = os.path.exists(input_text_path)
-        
-        return {
-            'images': {
-                'count': len(images),
-                'directory': images_dir,
-                'files': [os.path.basename(img) for img in images[:5]]  # First 5 files
-            },
-            'audio': {
-                'path': audio_path,
-                'tts_enabled': self.config.get('audio', {}).get('generate_from_text', False)
-            },
-            'text': {
-                'file_exists': text_file_exists,
-                'file_path': input_text_path,
-                'enabled': self.config.get('text', {}).get('enabled', True),
-                'mode': self.config.get('text', {}).get('mode', 'auto')
-            },
-            'video': {
-                'resolution': self.config.get('video', {}).get('resolution', '720p'),
-                'scaling': self.config.get('video', {}).get('scaling_method', 'fit')
-            }
-        }
-    
-    def validate_project_setup(self) -> Tuple[bool, list]:
-        """Validate that all required components are available."""
-        errors = []
-        images = self._load_images()
-        
-        # Check images
-        if not images:
-            errors.append("No images found in images directory")
-        
-        # Check audio (if not using TTS)
-        if not self.config.get('audio', {}).get('generate_from_text', False):
-            data_dir = os.path.dirname(self.paths.get('input_text', 'data/input.txt'))
-            from .utils import find_audio_file
-            audio_path = find_audio_file(data_dir)
-            if not audio_path:
-                errors.append("No audio file found and TTS is not enabled")
-        
-        # Check text content (if text overlays are enabled)
-        if self.config.get('text', {}).get('enabled', True):
-            text_mode = self.config.get('text', {}).get('mode', 'auto')
-            input_text_path = self.paths.get('input_text', 'data/input.txt')
-            default_text = self.config.get('text', {}).get('default_text', '').strip()
-            
-            if text_mode == 'from_file' and not os.path.exists(input_text_path):
-                errors.append(f"Text file not found: {input_text_path}")
-            elif text_mode == 'single' and not default_text:
-                errors.append("Single text mode selected but no default_text provided")
-        
-        return len(errors) == 0, errors
\ No newline at end of file
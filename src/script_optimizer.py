@@ -2,13 +2,47 @@
 Script optimization module for distributing script content across available images.
 """
 import os
+import bisect
+import functools
+import heapq
+import itertools
 import logging
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import math
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; used per line when cleaning and splitting scripts
+NUMERIC_LINE_PATTERN = re.compile(r'^[\d\s\.\-_=]+$')
+SENTENCE_END_PATTERN = re.compile(r'([.!?]+\s*)')
+
+# Non-digit characters a numeric/rule-only line may start with (it is stripped)
+NUMERIC_LINE_LEADERS = frozenset('.-_=')
+
+# Characters that end a sentence (checked against a line's last character)
+SENTENCE_TERMINATORS = frozenset('.!?')
+
+# Number of scripts whose cleaned lines are kept per optimizer
+CLEAN_CACHE_SIZE = 4
+
+# Line openings that signal a new paragraph in intelligent grouping
+NEW_TOPIC_PREFIXES = ('Now', 'Next', 'Then', 'Finally', 'In conclusion')
+
+# Topic keywords for semantic grouping, in priority order
+TOPIC_KEYWORDS = {
+    'introduction': ['introduction', 'welcome', 'hello', 'start', 'begin'],
+    'technical': ['technical', 'system', 'process', 'method', 'algorithm'],
+    'benefits': ['benefit', 'advantage', 'improve', 'better', 'enhance'],
+    'conclusion': ['conclusion', 'summary', 'finally', 'end', 'thank']
+}
+
+# One alternation per topic, so each topic is a single scan of the line
+TOPIC_PATTERNS = {
+    topic: re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+    for topic, keywords in TOPIC_KEYWORDS.items()
+}
+
 
 class ScriptOptimizer:
     """Optimizes script distribution across available images."""
@@ -17,6 +51,18 @@ class ScriptOptimizer:
         self.config = config
         self.text_config = config.get('text', {})
         self.paths = config.get('paths', {})
+        # (lines, num_images) key, cleaned lines and analysis of the last
+        # analyze_script_distribution call, reused by optimize_script_distribution
+        self._last_analysis: Optional[Tuple[Tuple[Tuple[str, ...], int], List[str], Dict[str, Any]]] = None
+        # Cleaned lines and their total length for recently seen scripts, oldest first
+        self._clean_cache: Dict[Tuple[str, ...], Tuple[List[str], int]] = {}
+        # Distribution method name -> implementation; unknown names fall back to even
+        self._dispatch: Dict[str, Callable[[List[str], int], List[str]]] = {
+            'intelligent_grouping': self._intelligent_grouping,
+            'semantic_grouping': self._semantic_grouping,
+            'balanced_length': self._balanced_length_distribution,
+            'even_distribution': self._even_distribution,
+        }
     
     def optimize_script_distribution(self, script_lines: List[str], num_images: int) -> Dict[str, Any]:
         """
@@ -33,27 +79,55 @@ class ScriptOptimizer:
             logger.warning("No script lines provided")
             return None
         
-        # Clean and filter script lines
-        cleaned_lines = self._clean_script_lines(script_lines)
+        # Reuse the cleaning and method choice from a preceding analysis of the same script
+        cached = self._last_analysis
+        if cached is not None and cached[0] == (tuple(script_lines), num_images):
+            cleaned_lines = cached[1]
+            distribution_method = cached[2]['recommended_method']
+        else:
+            cleaned_lines, total_chars = self._clean_and_stats(script_lines)
+            distribution_method = None
+        
+        if distribution_method is None and cleaned_lines:
+            distribution_method = self._choose_distribution_method(cleaned_lines, num_images, total_chars)
         
+        return self._distribute_cleaned_lines(cleaned_lines, num_images, distribution_method)
+    
+    def analyze_and_optimize(self, script_lines: List[str],
+                             num_images: int) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Analyze and distribute a script in one pass over its lines.
+        
+        Same results as analyze_script_distribution() followed by
+        optimize_script_distribution(), but the script is cleaned once and
+        the recommended method is reused for the distribution.
+        
+        Returns:
+            Tuple of (analysis, optimized text settings or None)
+        """
+        cleaned_lines, total_chars = self._clean_and_stats(script_lines)
+        analysis = self._build_analysis(script_lines, cleaned_lines, total_chars, num_images)
+        
+        if not script_lines:
+            logger.warning("No script lines provided")
+            return analysis, None
+        
+        settings = self._distribute_cleaned_lines(cleaned_lines, num_images,
+                                                  analysis['recommended_method'])
+        return analysis, settings
+    
+    def _distribute_cleaned_lines(self, cleaned_lines: List[str], num_images: int,
+                                  distribution_method: str) -> Optional[Dict[str, Any]]:
+        """Distribute already-cleaned lines with the given method and build text settings."""
         if not cleaned_lines:
             logger.warning("No valid script lines after cleaning")
             return None
         
         logger.info(f"Distributing {len(cleaned_lines)} script lines across {num_images} images")
-        
-        # Choose distribution strategy based on content
-        distribution_method = self._choose_distribution_method(cleaned_lines, num_images)
         logger.info(f"Using distribution method: {distribution_method}")
         
-        if distribution_method == 'intelligent_grouping':
-            distributed_texts = self._intelligent_grouping(cleaned_lines, num_images)
-        elif distribution_method == 'semantic_grouping':
-            distributed_texts = self._semantic_grouping(cleaned_lines, num_images)
-        elif distribution_method == 'balanced_length':
-            distributed_texts = self._balanced_length_distribution(cleaned_lines, num_images)
-        else:  # even_distribution
-            distributed_texts = self._even_distribution(cleaned_lines, num_images)
+        distribute = self._dispatch.get(distribution_method, self._even_distribution)
+        distributed_texts = distribute(cleaned_lines, num_images)
         
         # Create text settings
         text_settings = self._create_optimized_text_settings(distributed_texts)
@@ -66,37 +140,54 @@ class ScriptOptimizer:
         return text_settings
     
     def _clean_script_lines(self, lines: List[str]) -> List[str]:
-        """Clean and prepare script lines."""
+        """Clean and prepare script lines (cached for the last few scripts)."""
+        return self._clean_and_stats(lines)[0]
+    
+    def _clean_and_stats(self, lines: List[str]) -> Tuple[List[str], int]:
+        """Clean script lines and total their characters in the same pass."""
+        key = tuple(lines)
+        cached = self._clean_cache.get(key)
+        if cached is not None:
+            return list(cached[0]), cached[1]
+        
         cleaned = []
+        total_chars = 0
         
         for line in lines:
-            # Strip whitespace
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
+            # One C-level pass strips the ends and collapses every run of
+            # whitespace (line breaks included) to a single space
+            line = ' '.join(line.split())
             
-            # Skip lines that are just punctuation or numbers
-            if re.match(r'^[\d\s\.\-_=]+$', line):
-                continue
-            
-            # Skip very short lines (likely formatting artifacts)
+            # Skip empty and very short lines (likely formatting artifacts)
             if len(line) < 3:
                 continue
             
-            # Clean up formatting
-            line = re.sub(r'\s+', ' ', line)  # Multiple spaces to single
-            line = re.sub(r'[\r\n]+', ' ', line)  # Remove line breaks within content
+            # Skip lines that are just punctuation or numbers; ordinary text
+            # is ruled out by its first character without entering the regex
+            first = line[0]
+            if (first in NUMERIC_LINE_LEADERS or first.isdecimal()) and NUMERIC_LINE_PATTERN.match(line):
+                continue
             
             cleaned.append(line)
+            total_chars += len(line)
         
-        return cleaned
+        if len(self._clean_cache) >= CLEAN_CACHE_SIZE:
+            del self._clean_cache[next(iter(self._clean_cache))]
+        self._clean_cache[key] = (cleaned, total_chars)
+        return list(cleaned), total_chars
     
-    def _choose_distribution_method(self, lines: List[str], num_images: int) -> str:
+    def _choose_distribution_method(self, lines: List[str], num_images: int,
+                                    total_chars: Optional[int] = None) -> str:
         """Choose the best distribution method based on content analysis."""
-        total_lines = len(lines)
-        avg_line_length = sum(len(line) for line in lines) / len(lines) if lines else 0
+        if total_chars is None:
+            total_chars = sum(len(line) for line in lines)
+        return self._pick_method(len(lines), total_chars, num_images)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _pick_method(total_lines: int, total_chars: int, num_images: int) -> str:
+        """Pick a distribution method from line count, total length and image count."""
+        avg_line_length = total_chars / total_lines if total_lines else 0
         
         # Calculate ratios
         lines_per_image = total_lines / num_images if num_images > 0 else 0
@@ -121,29 +212,30 @@ class ScriptOptimizer:
         
         # Look for natural grouping indicators
         current_group = []
+        current_length = 0
+        lines_consumed = 0
         
         for i, line in enumerate(lines):
             current_group.append(line)
+            current_length += len(line)
+            lines_consumed += 1
             
             # Check if this line ends a logical group
             should_break = False
             
             # Check for natural breaks
-            if line.endswith('.') or line.endswith('!') or line.endswith('?'):
+            if line[-1:] in SENTENCE_TERMINATORS:
                 # Check if next line starts a new topic
                 if i + 1 < len(lines):
                     next_line = lines[i + 1]
                     # New paragraph indicators
-                    if (next_line.startswith('Now') or next_line.startswith('Next') or
-                        next_line.startswith('Then') or next_line.startswith('Finally') or
-                        next_line.startswith('In conclusion')):
+                    if next_line.startswith(NEW_TOPIC_PREFIXES):
                         should_break = True
                 else:
                     should_break = True  # Last line
             
             # Check group size limits
-            total_chars = sum(len(l) for l in current_group)
-            if total_chars > 500:  # Max characters per slide
+            if current_length > 500:  # Max characters per slide
                 should_break = True
             
             # Force break if we have too many groups already
@@ -154,22 +246,23 @@ class ScriptOptimizer:
                 grouped_text = ' '.join(current_group)
                 grouped_texts.append(grouped_text)
                 current_group = []
+                current_length = 0
                 
                 if len(grouped_texts) >= num_images:
                     break
         
         # Add remaining lines to last group or create new one
         if current_group:
-            if grouped_texts and len(grouped_texts) < num_images:
-                # Create new group
+            if not grouped_texts or len(grouped_texts) < num_images:
+                # Create new group (also when no break was ever triggered)
                 grouped_text = ' '.join(current_group)
                 grouped_texts.append(grouped_text)
-            elif grouped_texts:
+            else:
                 # Add to last group
                 grouped_texts[-1] += ' ' + ' '.join(current_group)
         
         # Add remaining lines if we didn't process them all
-        remaining_lines = lines[sum(len(group.split()) for group in grouped_texts):]
+        remaining_lines = lines[lines_consumed:]
         if remaining_lines and len(grouped_texts) < num_images:
             grouped_texts.append(' '.join(remaining_lines))
         
@@ -180,40 +273,23 @@ class ScriptOptimizer:
         # Simple keyword-based grouping
         grouped_texts = []
         
-        # Define topic keywords for grouping
-        topic_keywords = {
-            'introduction': ['introduction', 'welcome', 'hello', 'start', 'begin'],
-            'technical': ['technical', 'system', 'process', 'method', 'algorithm'],
-            'benefits': ['benefit', 'advantage', 'improve', 'better', 'enhance'],
-            'conclusion': ['conclusion', 'summary', 'finally', 'end', 'thank']
-        }
-        
-        # Group lines by topics
-        topic_groups = {topic: [] for topic in topic_keywords}
-        ungrouped = []
-        
+        # Tag each line with the index of its first matching topic; lines
+        # with no topic get the last tag so they sort after every topic
+        patterns = list(TOPIC_PATTERNS.values())
+        ungrouped_tag = len(patterns)
+        tags = []
         for line in lines:
             line_lower = line.lower()
-            assigned = False
-            
-            for topic, keywords in topic_keywords.items():
-                if any(keyword in line_lower for keyword in keywords):
-                    topic_groups[topic].append(line)
-                    assigned = True
-                    break
-            
-            if not assigned:
-                ungrouped.append(line)
+            tags.append(next((tag for tag, pattern in enumerate(patterns)
+                              if pattern.search(line_lower)), ungrouped_tag))
         
         # Create balanced groups
         lines_per_group = len(lines) // num_images
         remainder = len(lines) % num_images
         
-        all_lines = []
-        # Add topic groups first
-        for topic, group_lines in topic_groups.items():
-            all_lines.extend(group_lines)
-        all_lines.extend(ungrouped)
+        # Topic groups first, in topic order, then ungrouped lines; the sort is
+        # stable so lines keep their script order within a group
+        all_lines = [lines[i] for i in sorted(range(len(lines)), key=tags.__getitem__)]
         
         # Distribute evenly
         for i in range(num_images):
@@ -230,34 +306,27 @@ class ScriptOptimizer:
     
     def _balanced_length_distribution(self, lines: List[str], num_images: int) -> List[str]:
         """Distribute lines to create balanced text length per slide."""
-        # Calculate character lengths
-        line_lengths = [len(line) for line in lines]
-        total_length = sum(line_lengths)
-        target_length_per_slide = total_length // num_images
-        
+        # Prefix sums of line lengths: cumulative[k] is the length of lines[:k]
+        cumulative = [0]
+        cumulative.extend(itertools.accumulate(len(line) for line in lines))
+        target_length_per_slide = cumulative[-1] // num_images
+        
+        # Greedy fill: a slide takes lines until the next one would push it
+        # past the target (it always takes at least one). Each cut is found
+        # by binary search instead of walking the lines.
         grouped_texts = []
-        current_group = []
-        current_length = 0
-        
-        for line in lines:
-            line_length = len(line)
-            
-            # Check if adding this line would exceed target
-            if (current_length + line_length > target_length_per_slide and 
-                current_group and 
-                len(grouped_texts) < num_images - 1):
-                
-                # Finalize current group
-                grouped_texts.append(' '.join(current_group))
-                current_group = [line]
-                current_length = line_length
-            else:
-                current_group.append(line)
-                current_length += line_length
+        start = 0
+        while start < len(lines) and len(grouped_texts) < num_images - 1:
+            limit = cumulative[start] + target_length_per_slide
+            end = max(start + 1, bisect.bisect_right(cumulative, limit) - 1)
+            if end >= len(lines):
+                break
+            grouped_texts.append(' '.join(lines[start:end]))
+            start = end
         
         # Add final group
-        if current_group:
-            grouped_texts.append(' '.join(current_group))
+        if start < len(lines):
+            grouped_texts.append(' '.join(lines[start:]))
         
         return self._ensure_exact_count(grouped_texts, num_images)
     
@@ -266,77 +335,115 @@ class ScriptOptimizer:
         lines_per_image = len(lines) // num_images
         remainder = len(lines) % num_images
         
-        grouped_texts = []
-        start_idx = 0
+        # The first `remainder` images take one extra line; slides past the
+        # end of the script join nothing and come out empty
+        remaining = iter(lines)
+        return [
+            ' '.join(itertools.islice(remaining, lines_per_image + (1 if i < remainder else 0)))
+            for i in range(num_images)
+        ]
+    
+    def _ensure_exact_count(self, grouped_texts: List[str], num_images: int) -> List[str]:
+        """Ensure we have exactly the right number of text groups."""
+        if len(grouped_texts) == num_images:
+            return grouped_texts
         
-        for i in range(num_images):
-            # Calculate how many lines for this image
-            lines_for_this_image = lines_per_image
-            if i < remainder:
-                lines_for_this_image += 1
-            
-            end_idx = start_idx + lines_for_this_image
-            group_lines = lines[start_idx:end_idx]
+        if len(grouped_texts) < num_images:
+            grouped_texts = self._split_longest_groups(grouped_texts, num_images)
+        
+        # If we have too many, merge the shortest ones
+        if len(grouped_texts) > num_images:
+            grouped_texts = self._merge_shortest_pairs(grouped_texts, num_images)
+        
+        return grouped_texts
+    
+    def _split_longest_groups(self, grouped_texts: List[str], num_images: int) -> List[str]:
+        """
+        Repeatedly split the longest group in half until num_images exist.
+        
+        Groups live in a max-heap keyed on (length, position), so finding the
+        longest is O(log N) instead of a scan. Ties go to the first group, as
+        before; the second half of a split goes to the end.
+        """
+        texts = list(grouped_texts) or ['']
+        heap = [(-len(text), i) for i, text in enumerate(texts)]
+        heapq.heapify(heap)
+        
+        while len(texts) < num_images:
+            _, longest_idx = heapq.heappop(heap)
+            longest_text = texts[longest_idx]
             
-            if group_lines:
-                grouped_texts.append(' '.join(group_lines))
+            # Split roughly in half, at the middle '. ' sentence break. The cut
+            # is located with count/find and sliced out, instead of splitting
+            # into sentences and joining each half back together.
+            separators = longest_text.count('. ')
+            if separators:
+                cut = -2
+                for _ in range((separators + 1) // 2):
+                    cut = longest_text.find('. ', cut + 2)
+                first_half = longest_text[:cut]
+                second_half = longest_text[cut + 2:]
             else:
-                grouped_texts.append('')  # Empty slide if no content
+                # If no sentences, split by words
+                words = longest_text.split()
+                if len(words) > 2:
+                    mid_point = len(words) // 2
+                    first_half = ' '.join(words[:mid_point])
+                    second_half = ' '.join(words[mid_point:])
+                else:
+                    first_half, second_half = longest_text, ''  # Add empty slide
             
-            start_idx = end_idx
+            texts[longest_idx] = first_half
+            texts.append(second_half)
+            heapq.heappush(heap, (-len(first_half), longest_idx))
+            heapq.heappush(heap, (-len(second_half), len(texts) - 1))
         
-        return grouped_texts
+        return texts
     
-    def _ensure_exact_count(self, grouped_texts: List[str], num_images: int) -> List[str]:
-        """Ensure we have exactly the right number of text groups."""
-        while len(grouped_texts) < num_images:
-            if grouped_texts:
-                # Split the longest text
-                longest_idx = max(range(len(grouped_texts)), key=lambda i: len(grouped_texts[i]))
-                longest_text = grouped_texts[longest_idx]
-                
-                # Split roughly in half
-                sentences = longest_text.split('. ')
-                if len(sentences) > 1:
-                    mid_point = len(sentences) // 2
-                    first_half = '. '.join(sentences[:mid_point])
-                    second_half = '. '.join(sentences[mid_point:])
-                    
-                    grouped_texts[longest_idx] = first_half
-                    grouped_texts.append(second_half)
-                else:
-                    # If no sentences, split by words
-                    words = longest_text.split()
-                    if len(words) > 2:
-                        mid_point = len(words) // 2
-                        first_half = ' '.join(words[:mid_point])
-                        second_half = ' '.join(words[mid_point:])
-                        
-                        grouped_texts[longest_idx] = first_half
-                        grouped_texts.append(second_half)
-                    else:
-                        grouped_texts.append('')  # Add empty slide
-            else:
-                grouped_texts.append('')  # Add empty slide
+    def _merge_shortest_pairs(self, grouped_texts: List[str], num_images: int) -> List[str]:
+        """
+        Repeatedly merge the two shortest adjacent groups until num_images remain.
         
-        # If we have too many, merge the shortest ones
-        while len(grouped_texts) > num_images:
-            # Find two shortest adjacent groups to merge
-            shortest_pair_idx = 0
-            shortest_combined_length = float('inf')
-            
-            for i in range(len(grouped_texts) - 1):
-                combined_length = len(grouped_texts[i]) + len(grouped_texts[i + 1])
-                if combined_length < shortest_combined_length:
-                    shortest_combined_length = combined_length
-                    shortest_pair_idx = i
+        Pairs live in a min-heap keyed on (combined length, position), with
+        stale entries skipped on pop, so each merge is O(log N) instead of a
+        rescan of every pair. Ties go to the leftmost pair, as before.
+        """
+        texts = list(grouped_texts)
+        count = len(texts)
+        next_idx = list(range(1, count)) + [-1]
+        prev_idx = [-1] + list(range(count - 1))
+        version = [0] * count
+        
+        heap = [(len(texts[i]) + len(texts[i + 1]), i, 0, i + 1, 0) for i in range(count - 1)]
+        heapq.heapify(heap)
+        
+        def push_pair(left: int, right: int) -> None:
+            heapq.heappush(heap, (len(texts[left]) + len(texts[right]),
+                                  left, version[left], right, version[right]))
+        
+        while count > num_images:
+            _, left, left_version, right, right_version = heapq.heappop(heap)
+            if (version[left] != left_version or version[right] != right_version
+                    or next_idx[left] != right):
+                continue  # Stale: one side was merged since this entry was pushed
             
             # Merge the pair
-            merged_text = grouped_texts[shortest_pair_idx] + ' ' + grouped_texts[shortest_pair_idx + 1]
-            grouped_texts[shortest_pair_idx] = merged_text.strip()
-            grouped_texts.pop(shortest_pair_idx + 1)
-        
-        return grouped_texts
+            texts[left] = (texts[left] + ' ' + texts[right]).strip()
+            texts[right] = None
+            version[left] += 1
+            version[right] += 1
+            count -= 1
+            
+            # Relink and queue the two new neighbouring pairs
+            following = next_idx[right]
+            next_idx[left] = following
+            if following != -1:
+                prev_idx[following] = left
+                push_pair(left, following)
+            if prev_idx[left] != -1:
+                push_pair(prev_idx[left], left)
+        
+        return [text for text in texts if text is not None]
     
     def _create_optimized_text_settings(self, distributed_texts: List[str]) -> Dict[str, Any]:
         """Create text settings for optimized distribution."""
@@ -380,19 +487,15 @@ class ScriptOptimizer:
         
         # First split by sentences
         sentences = []
-        current_sentence = ""
         
-        # Split by common sentence endings
-        import re
-        sentence_parts = re.split(r'([.!?]+\s*)', text)
+        # Split by common sentence endings; each sentence is its text part
+        # followed by the captured ending
+        sentence_parts = SENTENCE_END_PATTERN.split(text)
         
         for i in range(0, len(sentence_parts), 2):
-            sentence = sentence_parts[i]
-            if i + 1 < len(sentence_parts):
-                sentence += sentence_parts[i + 1]
-            
-            if sentence.strip():
-                sentences.append(sentence.strip())
+            sentence = ''.join(sentence_parts[i:i + 2]).strip()
+            if sentence:
+                sentences.append(sentence)
         
         # If no sentences found, split by commas or length
         if not sentences:
@@ -403,20 +506,7 @@ class ScriptOptimizer:
                 sentences = parts
             else:
                 # Split by length as last resort
-                words = text.split()
-                current_line = ""
-                sentences = []
-                
-                for word in words:
-                    if len(current_line + " " + word) <= max_chars_per_line:
-                        current_line += " " + word if current_line else word
-                    else:
-                        if current_line:
-                            sentences.append(current_line)
-                        current_line = word
-                
-                if current_line:
-                    sentences.append(current_line)
+                sentences = self._wrap_words(text.split(), max_chars_per_line)
         
         # Ensure each line is not too long
         final_lines = []
@@ -425,34 +515,53 @@ class ScriptOptimizer:
                 final_lines.append(sentence)
             else:
                 # Split long sentence into multiple lines
-                words = sentence.split()
-                current_line = ""
-                
-                for word in words:
-                    if len(current_line + " " + word) <= max_chars_per_line:
-                        current_line += " " + word if current_line else word
-                    else:
-                        if current_line:
-                            final_lines.append(current_line)
-                        current_line = word
-                
-                if current_line:
-                    final_lines.append(current_line)
+                final_lines.extend(self._wrap_words(sentence.split(), max_chars_per_line))
         
         return final_lines if final_lines else [text]
     
+    def _wrap_words(self, words: List[str], max_chars_per_line: int) -> List[str]:
+        """Greedily pack words into lines of at most max_chars_per_line."""
+        lines = []
+        current_words = []
+        current_length = 0  # Length of ' '.join(current_words)
+        
+        for word in words:
+            # A word (even the first on a line) needs room for a joining space
+            if current_length + 1 + len(word) <= max_chars_per_line:
+                current_length += len(word) + (1 if current_words else 0)
+                current_words.append(word)
+            else:
+                if current_words:
+                    lines.append(' '.join(current_words))
+                current_words = [word]
+                current_length = len(word)
+        
+        if current_words:
+            lines.append(' '.join(current_words))
+        
+        return lines
+    
     def analyze_script_distribution(self, script_lines: List[str], num_images: int) -> Dict[str, Any]:
         """Analyze how the script would be distributed."""
-        cleaned_lines = self._clean_script_lines(script_lines)
+        key = (tuple(script_lines), num_images)
+        if self._last_analysis is not None and self._last_analysis[0] == key:
+            return dict(self._last_analysis[2])
+        
+        cleaned_lines, total_chars = self._clean_and_stats(script_lines)
+        analysis = self._build_analysis(script_lines, cleaned_lines, total_chars, num_images)
         
-        analysis = {
+        self._last_analysis = (key, cleaned_lines, analysis)
+        return dict(analysis)
+    
+    def _build_analysis(self, script_lines: List[str], cleaned_lines: List[str],
+                        total_chars: int, num_images: int) -> Dict[str, Any]:
+        """Build the analysis dictionary from a script and its cleaned lines."""
+        return {
             'original_lines': len(script_lines),
             'cleaned_lines': len(cleaned_lines),
             'available_images': num_images,
             'lines_per_image_avg': len(cleaned_lines) / num_images if num_images > 0 else 0,
-            'total_characters': sum(len(line) for line in cleaned_lines),
-            'avg_line_length': sum(len(line) for line in cleaned_lines) / len(cleaned_lines) if cleaned_lines else 0,
-            'recommended_method': self._choose_distribution_method(cleaned_lines, num_images)
-        }
-        
-        return analysis
\ No newline at end of file
+            'total_characters': total_chars,
+            'avg_line_length': total_chars / len(cleaned_lines) if cleaned_lines else 0,
+            'recommended_method': self._choose_distribution_method(cleaned_lines, num_images, total_chars)
+        }
\ No newline at end of file
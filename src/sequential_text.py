@@ -4,12 +4,17 @@ Sequential text animation module for line-by-line text reveals.
 import os
 import numpy as np
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import ImageClip, CompositeVideoClip
+from moviepy.editor import ImageClip, CompositeVideoClip, VideoClip
 
 logger = logging.getLogger(__name__)
 
+# Line animations that move, resize or wipe a line, so each line keeps its own
+# clip; every other animation is drawn from one batched clip
+PER_LINE_ANIMATIONS = frozenset({'slide_from_left', 'typewriter', 'zoom_in'})
+
 
 class SequentialTextAnimator:
     """Creates sequential text animations where lines appear one after another."""
@@ -18,9 +23,14 @@ class SequentialTextAnimator:
         self.config = config
         self.text_config = config.get('text', {})
         self.video_config = config.get('video', {})
+        # Loaded fonts by size; None records that no configured font could be loaded
+        self._font_cache: Dict[int, Optional[ImageFont.FreeTypeFont]] = {}
+        # Rasterized lines by (text, font size, colour, stroke colour, stroke width)
+        self._line_image_cache: OrderedDict = OrderedDict()
+        self._line_image_cache_size = self.text_config.get('sequential', {}).get('line_cache_size', 256)
     
     def create_sequential_text_clip(self, text_content: str, video_size: Tuple[int, int], 
-                                   duration: float, text_settings: Dict[str, Any]) -> Optional[CompositeVideoClip]:
+                                   duration: float, text_settings: Dict[str, Any]) -> Optional[VideoClip]:
         """
         Create a text clip where lines appear sequentially.
         
@@ -31,7 +41,8 @@ class SequentialTextAnimator:
             text_settings: Text styling settings
             
         Returns:
-            CompositeVideoClip with sequential text animation
+            Clip with sequential text animation (a positioned text-sized clip
+            for fade-in and static reveals, a frame-sized composite otherwise)
         """
         try:
             # Split text into lines
@@ -48,6 +59,7 @@ class SequentialTextAnimator:
             line_delay = sequential_config.get('line_delay', 1.5)  # Time between lines
             line_duration = sequential_config.get('line_duration', 'auto')  # How long each line stays
             animation_type = sequential_config.get('animation', 'fade_in')
+            animation_duration = sequential_config.get('animation_duration', 0.5)
             stagger_effect = sequential_config.get('stagger', True)  # Keep previous lines visible
             
             # Calculate timing
@@ -59,10 +71,8 @@ class SequentialTextAnimator:
             else:
                 line_duration = float(line_duration)
             
-            # Create individual line clips
-            line_clips = []
-            cumulative_height = 0
-            
+            # Work out when each line is on screen
+            windows = []
             for i, line in enumerate(lines):
                 # Calculate start time for this line
                 start_time = i * line_delay
@@ -75,12 +85,23 @@ class SequentialTextAnimator:
                     # Line disappears after its duration
                     end_time = start_time + line_duration
                 
+                windows.append((start_time, end_time))
+            
+            if animation_type not in PER_LINE_ANIMATIONS:
+                return self._create_batched_text_clip(lines, windows, video_size, duration, text_settings,
+                                                      animation_type, animation_duration)
+            
+            # Create individual line clips
+            line_clips = []
+            
+            for i, (line, (start_time, end_time)) in enumerate(zip(lines, windows)):
                 clip_duration = end_time - start_time
                 
                 if clip_duration > 0:
                     # Create individual line clip
                     line_clip = self._create_single_line_clip(
-                        line, video_size, clip_duration, text_settings, i, len(lines)
+                        line, video_size, clip_duration, text_settings, i, len(lines),
+                        animation_type, animation_duration
                     )
                     
                     if line_clip:
@@ -103,27 +124,108 @@ class SequentialTextAnimator:
             logger.error(f"Error creating sequential text clip: {e}")
             return None
     
+    def _create_batched_text_clip(self, lines: List[str], windows: List[Tuple[float, float]],
+                                  video_size: Tuple[int, int], duration: float,
+                                  text_settings: Dict[str, Any], animation_type: str,
+                                  animation_duration: float) -> Optional[VideoClip]:
+        """
+        Draw every line of a slide from one clip instead of one clip per line.
+        
+        Each line is rasterized once; a frame is rebuilt only when the set of
+        visible lines or a fade-in level changes, so reveals between fades
+        reuse the previous frame. Colours and mask follow MoviePy's own
+        compositing (lines blitted in order, masks summed and capped at 1).
+        """
+        fade = animation_type == 'fade_in'
+        
+        # (alpha-premultiplied rgb, alpha, left, top, start, end, fade length)
+        # per drawable line
+        layers = []
+        for i, (line, (start_time, end_time)) in enumerate(zip(lines, windows)):
+            if end_time - start_time <= 0:
+                continue
+            line_image = self._create_line_image(line, video_size, text_settings, i, len(lines))
+            if line_image is None:
+                continue
+            line_img, (left, top) = line_image
+            rgba = np.asarray(line_img)
+            fade_length = min(animation_duration, end_time - start_time) if fade else 0
+            alpha = rgba[:, :, 3] / 255.0
+            layers.append((alpha[:, :, None] * rgba[:, :, :3], alpha,
+                           left, top, start_time, end_time, fade_length))
+        
+        if not layers:
+            logger.error("No line clips created")
+            return None
+        
+        # One canvas covering every line, placed at the top-left-most line
+        origin_x = min(layer[2] for layer in layers)
+        origin_y = min(layer[3] for layer in layers)
+        width = max(layer[2] + layer[1].shape[1] for layer in layers) - origin_x
+        height = max(layer[3] + layer[1].shape[0] for layer in layers) - origin_y
+        
+        def opacities(t: float) -> Tuple[float, ...]:
+            levels = []
+            for _, _, _, _, start_time, end_time, fade_length in layers:
+                if t < start_time or t >= end_time:
+                    levels.append(0.0)
+                elif fade_length > 0 and t - start_time < fade_length:
+                    levels.append((t - start_time) / fade_length)
+                else:
+                    levels.append(1.0)
+            return tuple(levels)
+        
+        rendered = {}  # Last (opacities, frame, mask); shared by image and mask
+        
+        def render(t: float) -> Tuple[np.ndarray, np.ndarray]:
+            levels = opacities(t)
+            if rendered.get('levels') != levels:
+                frame = np.zeros((height, width, 3))
+                mask = np.zeros((height, width))
+                for (premultiplied, alpha, left, top, *_), level in zip(layers, levels):
+                    if level <= 0:
+                        continue
+                    h, w = alpha.shape
+                    y, x = top - origin_y, left - origin_x
+                    # Colour was multiplied by alpha once up front, so a fully
+                    # shown line blends in with a plain add
+                    a = alpha * level if level < 1 else alpha
+                    region = frame[y:y + h, x:x + w]
+                    region *= (1.0 - a)[:, :, None]
+                    region += premultiplied if level >= 1 else level * premultiplied
+                    mask_region = mask[y:y + h, x:x + w]
+                    mask_region += a
+                    np.minimum(mask_region, 1, out=mask_region)
+                rendered.update(levels=levels, frame=frame.astype('uint8'), mask=mask)
+            return rendered['frame'], rendered['mask']
+        
+        text_mask = VideoClip(lambda t: render(t)[1], ismask=True, duration=duration)
+        text_clip = VideoClip(lambda t: render(t)[0], duration=duration)
+        text_clip = text_clip.set_mask(text_mask).set_position((origin_x, origin_y))
+        
+        logger.info(f"Sequential text animation created with {len(layers)} lines in one clip")
+        return text_clip
+    
     def _create_single_line_clip(self, line: str, video_size: Tuple[int, int], 
                                 duration: float, text_settings: Dict[str, Any], 
-                                line_index: int, total_lines: int) -> Optional[ImageClip]:
-        """Create a clip for a single line of text."""
+                                line_index: int, total_lines: int, animation_type: str,
+                                animation_duration: float) -> Optional[ImageClip]:
+        """Create a clip for a single line of text (animation settings resolved by the caller)."""
         try:
             # Create PIL image for this line
-            line_img = self._create_line_image(line, video_size, text_settings, line_index, total_lines)
+            line_image = self._create_line_image(line, video_size, text_settings, line_index, total_lines)
             
-            if line_img is None:
+            if line_image is None:
                 return None
+            line_img, position = line_image
             
-            # Convert to MoviePy clip
-            img_array = np.array(line_img)
+            # Convert to MoviePy clip, placed where the line sits on the frame
+            img_array = np.asarray(line_img)
             clip = ImageClip(img_array, ismask=False, transparent=True).set_duration(duration)
+            clip = clip.set_position(position)
             
             # Apply line-specific animation
-            sequential_config = text_settings.get('sequential', {})
-            animation_type = sequential_config.get('animation', 'fade_in')
-            animation_duration = sequential_config.get('animation_duration', 0.5)
-            
-            clip = self._apply_line_animation(clip, animation_type, animation_duration)
+            clip = self._apply_line_animation(clip, animation_type, animation_duration, position)
             
             return clip
             
@@ -132,8 +234,15 @@ class SequentialTextAnimator:
             return None
     
     def _create_line_image(self, line: str, video_size: Tuple[int, int], 
-                          text_settings: Dict[str, Any], line_index: int, total_lines: int) -> Optional[Image.Image]:
-        """Create PIL image for a single line positioned correctly."""
+                          text_settings: Dict[str, Any], line_index: int,
+                          total_lines: int) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+        """
+        Create a PIL image holding just one line, and where it goes on the frame.
+        
+        The image is cropped to the line's box plus stroke padding rather than
+        covering the whole video, so each line clip carries only its own pixels.
+        Returns (image, (x, y) of the image's top-left corner) or None.
+        """
         try:
             # Get font settings
             font_size = text_settings.get('font_size', 60)
@@ -141,27 +250,10 @@ class SequentialTextAnimator:
             stroke_color = text_settings.get('stroke_color', 'black')
             stroke_width = text_settings.get('stroke_width', 3)
             
-            # Load font
-            font = self._load_font(font_size)
-            if font is None:
-                font = ImageFont.load_default()
-            
-            # Create temporary image to measure text
-            temp_img = Image.new('RGBA', video_size, (0, 0, 0, 0))
-            temp_draw = ImageDraw.Draw(temp_img)
-            
-            # Measure line dimensions
-            try:
-                if hasattr(temp_draw, 'textbbox'):
-                    bbox = temp_draw.textbbox((0, 0), line, font=font)
-                    line_width = bbox[2] - bbox[0]
-                    line_height = bbox[3] - bbox[1]
-                else:
-                    line_width, line_height = temp_draw.textsize(line, font=font)
-            except Exception:
-                # Fallback measurement
-                line_width = len(line) * (font_size * 0.6)
-                line_height = font_size * 1.2
+            rasterized = self._rasterize_line(line, font_size, color, stroke_color, stroke_width)
+            if rasterized is None:
+                return None
+            img, ink_left, ink_top, line_width, line_height, padding = rasterized
             
             # Calculate positioning
             position_setting = text_settings.get('position', 'center')
@@ -170,33 +262,71 @@ class SequentialTextAnimator:
                 line_index, total_lines, font_size
             )
             
-            # Create full-size image with transparent background
-            img = Image.new('RGBA', video_size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # Draw stroke
-            if stroke_width > 0 and stroke_color != color:
-                for adj_x in range(-stroke_width, stroke_width + 1):
-                    for adj_y in range(-stroke_width, stroke_width + 1):
-                        if adj_x != 0 or adj_y != 0:
-                            try:
-                                draw.text((x + adj_x, y + adj_y), line, font=font, fill=stroke_color)
-                            except Exception as e:
-                                logger.warning(f"Error drawing stroke: {e}")
-            
-            # Draw main text
-            try:
-                draw.text((x, y), line, font=font, fill=color)
-            except Exception as e:
-                logger.error(f"Error drawing main text: {e}")
-                return None
-            
-            return img
+            # The text was drawn so that placing the image here puts it at (x, y)
+            return img, (x + ink_left - padding, y + ink_top - padding)
             
         except Exception as e:
             logger.error(f"Error creating line image: {e}")
             return None
     
+    def _rasterize_line(self, line: str, font_size: int, color: str, stroke_color: str,
+                        stroke_width: int) -> Optional[Tuple[Image.Image, int, int, int, int, int]]:
+        """
+        Draw one line onto a tight transparent image (cached per text and style).
+        
+        Returns (image, ink_left, ink_top, line_width, line_height, padding).
+        The image doesn't depend on where the line is placed, so repeated
+        lines across slides are drawn once; the least recently used entries
+        are dropped past the configured size. Callers must not modify it.
+        """
+        key = (line, font_size, color, stroke_color, stroke_width)
+        cached = self._line_image_cache.get(key)
+        if cached is not None:
+            self._line_image_cache.move_to_end(key)
+            return cached
+        
+        # Load font
+        font = self._load_font(font_size)
+        if font is None:
+            font = ImageFont.load_default()
+        
+        # Measure line dimensions straight from the font, with no scratch image
+        try:
+            if hasattr(font, 'getbbox'):
+                bbox = font.getbbox(line)
+                line_width = bbox[2] - bbox[0]
+                line_height = bbox[3] - bbox[1]
+                ink_left, ink_top = bbox[0], bbox[1]
+            else:
+                line_width, line_height = font.getsize(line)
+                ink_left, ink_top = 0, 0
+        except Exception:
+            # Fallback measurement
+            line_width = int(len(line) * (font_size * 0.6))
+            line_height = int(font_size * 1.2)
+            ink_left, ink_top = 0, 0
+        
+        # Create a transparent image just big enough for the line and its outline
+        stroke = stroke_width if stroke_width > 0 and stroke_color != color else 0
+        padding = stroke + 2
+        img = Image.new('RGBA', (line_width + 2 * padding, line_height + 2 * padding), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        
+        # Draw text and its outline; Pillow strokes the glyphs in the same call
+        try:
+            draw.text((padding - ink_left, padding - ink_top), line, font=font, fill=color,
+                      stroke_width=stroke, stroke_fill=stroke_color)
+        except Exception as e:
+            logger.error(f"Error drawing main text: {e}")
+            return None
+        
+        rasterized = (img, ink_left, ink_top, line_width, line_height, padding)
+        if self._line_image_cache_size > 0:
+            self._line_image_cache[key] = rasterized
+            if len(self._line_image_cache) > self._line_image_cache_size:
+                self._line_image_cache.popitem(last=False)
+        return rasterized
+    
     def _calculate_line_position(self, position_setting: str, line_width: int, line_height: int,
                                video_size: Tuple[int, int], line_index: int, total_lines: int,
                                font_size: int) -> Tuple[int, int]:
@@ -234,7 +364,21 @@ class SequentialTextAnimator:
         return (x, y)
     
     def _load_font(self, font_size: int) -> Optional[ImageFont.FreeTypeFont]:
-        """Load font from system font paths."""
+        """Load font from system font paths (cached per size)."""
+        if font_size in self._font_cache:
+            return self._font_cache[font_size]
+        
+        # Once one size has loaded, other sizes are variants of the same face
+        # and skip the path search
+        for font in self._font_cache.values():
+            if font is not None:
+                try:
+                    variant = font.font_variant(size=font_size)
+                except Exception:
+                    break
+                self._font_cache[font_size] = variant
+                return variant
+        
         font_paths = self.text_config.get('fonts', [
             "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
             "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
@@ -243,17 +387,21 @@ class SequentialTextAnimator:
             "C:/Windows/Fonts/arial.ttf"
         ])
         
+        font = None
         for font_path in font_paths:
             if os.path.exists(font_path):
                 try:
-                    return ImageFont.truetype(font_path, font_size)
+                    font = ImageFont.truetype(font_path, font_size)
+                    break
                 except Exception:
                     continue
         
-        return None
+        self._font_cache[font_size] = font
+        return font
     
-    def _apply_line_animation(self, clip: ImageClip, animation_type: str, animation_duration: float) -> ImageClip:
-        """Apply animation to individual line clip."""
+    def _apply_line_animation(self, clip: ImageClip, animation_type: str, animation_duration: float,
+                              position: Tuple[int, int] = (0, 0)) -> ImageClip:
+        """Apply animation to individual line clip resting at position on the frame."""
         try:
             if animation_type == 'fade_in':
                 return clip.crossfadein(min(animation_duration, clip.duration))
@@ -263,23 +411,31 @@ class SequentialTextAnimator:
                         progress = min(t / animation_duration, 1.0)
                         progress = 1 - (1 - progress) ** 3  # Ease-out
                         start_x = -clip.w
-                        target_x = 0
+                        target_x = position[0]
                         current_x = start_x + (target_x - start_x) * progress
-                        return (current_x, 0)
-                    return (0, 0)
+                        return (current_x, position[1])
+                    return position
                 return clip.set_position(slide_pos)
             elif animation_type == 'typewriter':
+                # The line's alpha lives in the clip's mask, so the wipe is
+                # applied there; one buffer is reused for every wiped frame
+                if clip.mask is None:
+                    return clip
+                wiped = []
+                
                 def typewriter_fx(get_frame, t):
-                    frame = get_frame(t)
-                    if t < animation_duration:
-                        progress = min(t / animation_duration, 1.0)
-                        reveal_width = int(frame.shape[1] * progress)
-                        # Create mask
-                        mask = np.zeros_like(frame[:, :, 3], dtype=np.uint8)
-                        mask[:, :reveal_width] = frame[:, :reveal_width, 3]
-                        frame[:, :, 3] = mask
-                    return frame
-                return clip.fl(typewriter_fx)
+                    mask = get_frame(t)
+                    if t >= animation_duration:
+                        return mask
+                    progress = min(t / animation_duration, 1.0)
+                    reveal_width = int(mask.shape[1] * progress)
+                    if not wiped:
+                        wiped.append(np.empty_like(mask))
+                    buffer = wiped[0]
+                    buffer[:, :reveal_width] = mask[:, :reveal_width]
+                    buffer[:, reveal_width:] = 0
+                    return buffer
+                return clip.set_mask(clip.mask.fl(typewriter_fx))
             elif animation_type == 'zoom_in':
                 def zoom_resize(t):
                     if t < animation_duration:
@@ -287,7 +443,12 @@ class SequentialTextAnimator:
                         progress = 1 - (1 - progress) ** 3
                         return 0.3 + 0.7 * progress
                     return 1.0
-                return clip.resize(zoom_resize)
+                def zoom_pos(t):
+                    # Grow from the line's centre rather than its top-left corner
+                    scale = zoom_resize(t)
+                    return (position[0] + clip.w * (1 - scale) / 2,
+                            position[1] + clip.h * (1 - scale) / 2)
+                return clip.resize(zoom_resize).set_position(zoom_pos)
             else:
                 # No animation or unknown type
                 return clip
@@ -1,7 +1,8 @@
 import os
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import timedelta
+
+from .utils import find_hw_h264_encoder
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,7 @@ class SubtitleGenerator:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.paths = config.get('paths', {})
+        self.video_config = config.get('video', {})
     
     def generate_subtitles(self, text_settings: Optional[Dict[str, Any]], 
                           audio_duration: float, num_images: int) -> Optional[str]:
@@ -37,19 +39,7 @@ class SubtitleGenerator:
                 logger.warning("No subtitle entries created")
                 return None
             
-            # Generate SRT file
-            output_dir = self.paths.get('output_dir', 'data/output')
-            os.makedirs(output_dir, exist_ok=True)
-            srt_path = os.path.join(output_dir, 'subtitles.srt')
-            
-            with open(srt_path, 'w', encoding='utf-8') as f:
-                for i, entry in enumerate(subtitle_entries, 1):
-                    f.write(f"{i}\n")
-                    f.write(f"{entry['start_time']} --> {entry['end_time']}\n")
-                    f.write(f"{entry['text']}\n\n")
-            
-            logger.info(f"Subtitles generated: {srt_path}")
-            return srt_path
+            return self._write_srt(subtitle_entries)
             
         except Exception as e:
             logger.error(f"Error generating subtitles: {e}")
@@ -60,15 +50,17 @@ class SubtitleGenerator:
         """Create subtitle entries with timing information."""
         entries = []
         mode = text_settings.get('mode', 'single')
-        base_duration = audio_duration / num_images
+        # Slide boundaries are worked out in whole milliseconds, so they don't
+        # drift with float accumulation and the last one lands on the end
+        total_ms = int(round(audio_duration * 1000))
         
         if mode == 'single':
             # Single text for entire video
             text = text_settings.get('text', '').strip()
             if text:
                 entries.append({
-                    'start_time': self._format_timestamp(0),
-                    'end_time': self._format_timestamp(audio_duration),
+                    'start_time': self._format_ms(0),
+                    'end_time': self._format_ms(total_ms),
                     'text': text
                 })
         
@@ -78,12 +70,12 @@ class SubtitleGenerator:
             
             for i, text in enumerate(texts):
                 if text and text.strip():
-                    start_time = i * base_duration
-                    end_time = (i + 1) * base_duration
+                    start_ms = i * total_ms // num_images
+                    end_ms = (i + 1) * total_ms // num_images
                     
                     entries.append({
-                        'start_time': self._format_timestamp(start_time),
-                        'end_time': self._format_timestamp(end_time),
+                        'start_time': self._format_ms(start_ms),
+                        'end_time': self._format_ms(end_ms),
                         'text': text.strip()
                     })
         
@@ -91,12 +83,14 @@ class SubtitleGenerator:
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format timestamp in SRT format (HH:MM:SS,mmm)."""
-        td = timedelta(seconds=seconds)
-        total_seconds = int(td.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        secs = total_seconds % 60
-        milliseconds = int((seconds - total_seconds) * 1000)
+        return self._format_ms(int(round(seconds * 1000)))
+    
+    @staticmethod
+    def _format_ms(total_ms: int) -> str:
+        """Format a whole number of milliseconds in SRT format (HH:MM:SS,mmm)."""
+        hours, remainder = divmod(total_ms, 3_600_000)
+        minutes, remainder = divmod(remainder, 60_000)
+        secs, milliseconds = divmod(remainder, 1000)
         
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
     
@@ -122,28 +116,86 @@ class SubtitleGenerator:
             if not subtitle_entries:
                 return None
             
-            # Generate VTT file
-            output_dir = self.paths.get('output_dir', 'data/output')
-            os.makedirs(output_dir, exist_ok=True)
-            vtt_path = os.path.join(output_dir, 'subtitles.vtt')
-            
-            with open(vtt_path, 'w', encoding='utf-8') as f:
-                f.write("WEBVTT\n\n")
-                
-                for i, entry in enumerate(subtitle_entries, 1):
-                    start_time = entry['start_time'].replace(',', '.')
-                    end_time = entry['end_time'].replace(',', '.')
-                    f.write(f"{i}\n")
-                    f.write(f"{start_time} --> {end_time}\n")
-                    f.write(f"{entry['text']}\n\n")
-            
-            logger.info(f"VTT subtitles generated: {vtt_path}")
-            return vtt_path
+            return self._write_vtt(subtitle_entries)
             
         except Exception as e:
             logger.error(f"Error generating VTT subtitles: {e}")
             return None
     
+    def generate_srt_and_vtt(self, text_settings: Optional[Dict[str, Any]], 
+                             audio_duration: float, num_images: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Generate both SRT and WebVTT subtitle files from one set of entries.
+        
+        Args:
+            text_settings: Text overlay settings
+            audio_duration: Total duration of the audio/video
+            num_images: Number of images/slides
+            
+        Returns:
+            (SRT path, VTT path); either is None if its generation fails
+        """
+        if not text_settings or not text_settings.get('enabled', True):
+            logger.info("Subtitles disabled or no text content available")
+            return None, None
+        
+        try:
+            subtitle_entries = self._create_subtitle_entries(text_settings, audio_duration, num_images)
+        except Exception as e:
+            logger.error(f"Error generating subtitles: {e}")
+            return None, None
+        
+        if not subtitle_entries:
+            logger.warning("No subtitle entries created")
+            return None, None
+        
+        srt_path = vtt_path = None
+        try:
+            srt_path = self._write_srt(subtitle_entries)
+        except Exception as e:
+            logger.error(f"Error generating subtitles: {e}")
+        try:
+            vtt_path = self._write_vtt(subtitle_entries)
+        except Exception as e:
+            logger.error(f"Error generating VTT subtitles: {e}")
+        
+        return srt_path, vtt_path
+    
+    def _write_srt(self, subtitle_entries: List[Dict[str, Any]]) -> str:
+        """Write entries to subtitles.srt in the output directory."""
+        output_dir = self.paths.get('output_dir', 'data/output')
+        os.makedirs(output_dir, exist_ok=True)
+        srt_path = os.path.join(output_dir, 'subtitles.srt')
+        
+        # Build the whole file first so it goes out in one write
+        body = ''.join(
+            f"{i}\n{entry['start_time']} --> {entry['end_time']}\n{entry['text']}\n\n"
+            for i, entry in enumerate(subtitle_entries, 1)
+        )
+        with open(srt_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        
+        logger.info(f"Subtitles generated: {srt_path}")
+        return srt_path
+    
+    def _write_vtt(self, subtitle_entries: List[Dict[str, Any]]) -> str:
+        """Write entries to subtitles.vtt in the output directory."""
+        output_dir = self.paths.get('output_dir', 'data/output')
+        os.makedirs(output_dir, exist_ok=True)
+        vtt_path = os.path.join(output_dir, 'subtitles.vtt')
+        
+        # Build the whole file first so it goes out in one write
+        body = ''.join(
+            f"{i}\n{entry['start_time'].replace(',', '.')} --> "
+            f"{entry['end_time'].replace(',', '.')}\n{entry['text']}\n\n"
+            for i, entry in enumerate(subtitle_entries, 1)
+        )
+        with open(vtt_path, 'w', encoding='utf-8') as f:
+            f.write("WEBVTT\n\n" + body)
+        
+        logger.info(f"VTT subtitles generated: {vtt_path}")
+        return vtt_path
+    
     def create_subtitle_overlay_video(self, video_path: str, subtitle_path: str) -> Optional[str]:
         """
         Create a new video with burned-in subtitles using FFmpeg.
@@ -164,22 +216,46 @@ class SubtitleGenerator:
             output_path = os.path.join(output_dir, f"{base_name}_with_subtitles.mp4")
             
             # FFmpeg command to burn in subtitles
-            cmd = [
-                'ffmpeg', '-i', video_path,
-                '-vf', f"subtitles={subtitle_path}:force_style='FontSize=24,PrimaryColour=&Hffffff,OutlineColour=&H000000,Outline=2'",
-                '-c:a', 'copy',
-                '-y',  # Overwrite output file
-                output_path
-            ]
+            subtitles_filter = f"subtitles={subtitle_path}:force_style='FontSize=24,PrimaryColour=&Hffffff,OutlineColour=&H000000,Outline=2'"
+            
+            def burn_in_command(encoder_args, decode_args=()):
+                return [
+                    'ffmpeg', '-hide_banner', '-nostats', '-loglevel', 'error',
+                    *decode_args, '-i', video_path,
+                    '-vf', subtitles_filter,
+                    *encoder_args,
+                    '-c:a', 'copy',
+                    '-y',  # Overwrite output file
+                    output_path
+                ]
             
             logger.info("Burning subtitles into video using FFmpeg...")
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            
+            # The subtitles filter itself runs on the CPU (libass); decoding and
+            # encoding go to the GPU when video.hw_accel finds a working encoder
+            result = None
+            hw_encoder = find_hw_h264_encoder('ffmpeg', self.video_config.get('hw_accel', 'auto'))
+            if hw_encoder:
+                logger.info(f"Using hardware encoder: {hw_encoder}")
+                hw_bitrate = str(self.video_config.get('hw_bitrate', '6M'))
+                cmd = burn_in_command(['-c:v', hw_encoder, '-b:v', hw_bitrate], ['-hwaccel', 'auto'])
+                # Only errors are logged, and stderr is decoded only when needed
+                result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                if result.returncode != 0:
+                    logger.warning(f"Hardware burn-in failed "
+                                   f"({result.stderr.decode('utf-8', errors='replace').strip()}), "
+                                   f"retrying with software encoding")
+                    result = None
+            
+            if result is None:
+                cmd = burn_in_command([])
+                result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             
             if result.returncode == 0:
                 logger.info(f"Video with burned-in subtitles created: {output_path}")
                 return output_path
             else:
-                logger.error(f"FFmpeg error: {result.stderr}")
+                logger.error(f"FFmpeg error: {result.stderr.decode('utf-8', errors='replace')}")
                 return None
                 
         except FileNotFoundError:
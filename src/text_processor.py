@@ -1,11 +1,35 @@
 import os
 import json
 import logging
+import mmap
+import pickle
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Scripts larger than this are decoded straight out of a memory map instead
+# of being read into a bytes buffer first; small files keep the plain read.
+MMAP_READ_THRESHOLD = 64 * 1024
+
+
+def _is_text_json(json_data: Any) -> bool:
+    """Check that parsed JSON is text settings: an object with 'texts' or 'text'."""
+    return isinstance(json_data, dict) and ('texts' in json_data or 'text' in json_data)
+
+
+def _read_json(path: str) -> Any:
+    """Parse a JSON file, with orjson when it is installed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
 
 class TextProcessor:
     """Handles text processing and content preparation for video generation."""
@@ -14,6 +38,19 @@ class TextProcessor:
         self.config = config
         self.text_config = config.get('text', {})
         self.paths = config.get('paths', {})
+        
+        # Style defaults shared by every settings dict; text_config does not
+        # change after construction, so they are looked up once here
+        animation_config = self.text_config.get('animation', {})
+        self._settings_template = {
+            'font_size': self.text_config.get('font_size', 60),
+            'color': self.text_config.get('color', 'white'),
+            'stroke_color': self.text_config.get('stroke_color', 'black'),
+            'stroke_width': self.text_config.get('stroke_width', 3),
+            'position': self.text_config.get('position', 'center'),
+            'animation': animation_config.get('type', 'fade_in'),
+            'animation_duration': animation_config.get('duration', 1.5)
+        }
     
     def process_text_content(self, num_images: int) -> Optional[Dict[str, Any]]:
         """
@@ -31,7 +68,7 @@ class TextProcessor:
         
         text_mode = self.text_config.get('mode', 'auto')
         
-        logger.info(f"Processing text content in mode: {text_mode}")
+        logger.info("Processing text content in mode: %s", text_mode)
         
         if text_mode == "auto":
             return self._auto_detect_text_mode(num_images)
@@ -42,56 +79,75 @@ class TextProcessor:
         elif text_mode == "from_file":
             return self._process_from_file_optimized(num_images)  # Use optimized version
         else:
-            logger.error(f"Unknown text mode: {text_mode}")
+            logger.error("Unknown text mode: %s", text_mode)
             return None
     
     def _process_from_file_optimized(self, num_images: int) -> Optional[Dict[str, Any]]:
         """Process text content from input file with script optimization."""
         input_text_path = self.paths.get('input_text', 'data/input.txt')
         
-        if not os.path.exists(input_text_path):
-            logger.error(f"Input text file not found: {input_text_path}")
-            return None
-        
         try:
-            with open(input_text_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
+            raw_lines = self._read_script_lines(input_text_path)
             
-            if not content:
+            if raw_lines is None:
                 logger.warning("Input text file is empty")
                 return None
             
-            # Split content into lines
-            raw_lines = content.split('\n')
-            
             # Import and use script optimizer
             from .script_optimizer import ScriptOptimizer
             optimizer = ScriptOptimizer(self.config)
             
-            # Analyze the script first
-            analysis = optimizer.analyze_script_distribution(raw_lines, num_images)
-            logger.info(f"Script analysis: {analysis['original_lines']} lines -> {analysis['cleaned_lines']} cleaned lines")
-            logger.info(f"Average {analysis['lines_per_image_avg']:.1f} lines per image")
-            logger.info(f"Recommended method: {analysis['recommended_method']}")
-            
-            # Optimize distribution
-            optimized_settings = optimizer.optimize_script_distribution(raw_lines, num_images)
+            # Analyze and distribute the script in one pass over its lines
+            analysis, optimized_settings = optimizer.analyze_and_optimize(raw_lines, num_images)
+            logger.info("Script analysis: %s lines -> %s cleaned lines", analysis['original_lines'], analysis['cleaned_lines'])
+            logger.info("Average %.1f lines per image", analysis['lines_per_image_avg'])
+            logger.info("Recommended method: %s", analysis['recommended_method'])
             
             if optimized_settings:
                 # Merge with base text settings
                 base_settings = self._create_text_settings('per_image', texts=[])
                 base_settings.update(optimized_settings)
                 
-                logger.info(f"Script optimized successfully: {len(optimized_settings['texts'])} slides created")
+                logger.info("Script optimized successfully: %s slides created", len(optimized_settings['texts']))
                 return base_settings
             else:
                 logger.error("Failed to optimize script distribution")
                 return None
             
+        except FileNotFoundError:
+            logger.error("Input text file not found: %s", input_text_path)
+            return None
         except Exception as e:
-            logger.error(f"Error processing optimized text file {input_text_path}: {e}")
+            logger.error("Error processing optimized text file %s: %s", input_text_path, e)
             return None
     
+    @staticmethod
+    def _read_script_lines(input_text_path: str) -> Optional[List[str]]:
+        """
+        Read a script file as a list of lines, or None if it is blank.
+        
+        Raises FileNotFoundError if the file does not exist; the one stat
+        call doubles as the existence check and the size check.
+        """
+        size = os.stat(input_text_path).st_size
+        if size == 0:
+            return None
+        
+        if size > MMAP_READ_THRESHOLD:
+            with open(input_text_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = str(mm, 'utf-8')
+        else:
+            with open(input_text_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        
+        if not content or content.isspace():
+            return None
+        
+        # splitlines() handles LF and CRLF in one pass; blank lines are
+        # dropped later by the script optimizer's cleaning step
+        return content.splitlines()
+    
     def _auto_detect_text_mode(self, num_images: int) -> Optional[Dict[str, Any]]:
         """Auto-detect the best text processing mode based on available content."""
         
@@ -130,31 +186,24 @@ class TextProcessor:
     def _process_per_image_text(self, num_images: int) -> Optional[Dict[str, Any]]:
         """Process individual text for each image."""
         # Generate placeholder text for each image
-        texts = []
-        for i in range(num_images):
-            texts.append(f"Slide {i + 1}")
+        texts = [f"Slide {i}" for i in range(1, num_images + 1)]
         
-        logger.info(f"Generated placeholder text for {num_images} images")
+        logger.info("Generated placeholder text for %s images", num_images)
         return self._create_text_settings('per_image', texts=texts)
     
     def _process_from_file(self, num_images: int) -> Optional[Dict[str, Any]]:
         """Process text content from input file."""
         input_text_path = self.paths.get('input_text', 'data/input.txt')
         
-        if not os.path.exists(input_text_path):
-            logger.error(f"Input text file not found: {input_text_path}")
-            return None
-        
         try:
-            with open(input_text_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
+            raw_lines = self._read_script_lines(input_text_path)
             
-            if not content:
+            if raw_lines is None:
                 logger.warning("Input text file is empty")
                 return None
             
-            # Split content into lines and clean
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
+            # Strip and drop blank lines in one pass
+            lines = [s for s in (line.strip() for line in raw_lines) if s]
             
             # If we have only one line, use it for all images
             if len(lines) == 1:
@@ -164,18 +213,22 @@ class TextProcessor:
             # Adjust text list to match number of images
             texts = self._adjust_text_list_to_images(lines, num_images)
             
-            logger.info(f"Processed {len(texts)} text entries from file")
+            logger.info("Processed %s text entries from file", len(texts))
             return self._create_text_settings('per_image', texts=texts)
             
+        except FileNotFoundError:
+            logger.error("Input text file not found: %s", input_text_path)
+            return None
         except Exception as e:
-            logger.error(f"Error reading text file {input_text_path}: {e}")
+            logger.error("Error reading text file %s: %s", input_text_path, e)
             return None
     
     def _try_load_json_file(self) -> Optional[Dict[str, Any]]:
         """Try to load text settings from JSON file."""
         # Look for JSON files in data directory
         data_dir = os.path.dirname(self.paths.get('input_text', 'data/input.txt'))
-        json_files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+        with os.scandir(data_dir) as entries:
+            json_files = [entry.name for entry in entries if entry.name.endswith('.json')]
         
         if not json_files:
             return None
@@ -184,12 +237,11 @@ class TextProcessor:
         json_path = os.path.join(data_dir, json_files[0])
         
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            json_data = _read_json(json_path)
             
             # Validate JSON structure
-            if 'texts' in json_data or 'text' in json_data:
-                logger.info(f"Loaded text settings from JSON: {json_path}")
+            if _is_text_json(json_data):
+                logger.info("Loaded text settings from JSON: %s", json_path)
                 
                 # Create text settings from JSON
                 if 'texts' in json_data:
@@ -200,7 +252,7 @@ class TextProcessor:
                                                     json_settings=json_data.get('settings', {}))
             
         except Exception as e:
-            logger.error(f"Error loading JSON file {json_path}: {e}")
+            logger.error("Error loading JSON file %s: %s", json_path, e)
         
         return None
     
@@ -210,32 +262,18 @@ class TextProcessor:
             return texts
         elif len(texts) > num_images:
             # Truncate to match number of images
-            logger.info(f"Truncating text list from {len(texts)} to {num_images} entries")
+            logger.info("Truncating text list from %s to %s entries", len(texts), num_images)
             return texts[:num_images]
         else:
             # Extend list by repeating the last entry or using empty strings
-            logger.info(f"Extending text list from {len(texts)} to {num_images} entries")
-            extended_texts = texts.copy()
+            logger.info("Extending text list from %s to %s entries", len(texts), num_images)
             last_text = texts[-1] if texts else ""
-            
-            while len(extended_texts) < num_images:
-                extended_texts.append(last_text)
-            
-            return extended_texts
+            return texts + [last_text] * (num_images - len(texts))
     
     def _create_text_settings(self, mode: str, text: str = "", texts: List[str] = None, 
                              json_settings: Dict[str, Any] = None) -> Dict[str, Any]:
         """Create text settings dictionary."""
-        settings = {
-            'mode': mode,
-            'font_size': self.text_config.get('font_size', 60),
-            'color': self.text_config.get('color', 'white'),
-            'stroke_color': self.text_config.get('stroke_color', 'black'),
-            'stroke_width': self.text_config.get('stroke_width', 3),
-            'position': self.text_config.get('position', 'center'),
-            'animation': self.text_config.get('animation', {}).get('type', 'fade_in'),
-            'animation_duration': self.text_config.get('animation', {}).get('duration', 1.5)
-        }
+        settings = {'mode': mode, **self._settings_template}
         
         # Override with JSON settings if provided
         if json_settings:
@@ -250,7 +288,14 @@ class TextProcessor:
         return settings
     
     def save_text_settings(self, text_settings: Dict[str, Any], output_name: str = None) -> bool:
-        """Save text settings to JSON file for future use."""
+        """
+        Save text settings for future use.
+        
+        Settings go to a JSON file that people can read and edit, unless
+        output_name ends in '.pkl': then they are pickled instead, which is
+        much faster for large per-image text lists that only the program
+        reads back (see load_text_settings).
+        """
         if not text_settings:
             return False
         
@@ -259,7 +304,7 @@ class TextProcessor:
         
         if output_name is None:
             output_name = "text_settings.json"
-        elif not output_name.endswith('.json'):
+        elif not output_name.endswith(('.json', '.pkl')):
             output_name += '.json'
         
         output_path = os.path.join(output_dir, output_name)
@@ -284,12 +329,39 @@ class TextProcessor:
             elif text_settings.get('mode') == 'per_image':
                 save_data['texts'] = text_settings.get('texts', [])
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+            if output_name.endswith('.pkl'):
+                with open(output_path, 'wb') as f:
+                    pickle.dump(save_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            elif ORJSON_AVAILABLE:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(save_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(save_data, f, indent=2, ensure_ascii=False)
             
-            logger.info(f"Text settings saved to: {output_path}")
+            logger.info("Text settings saved to: %s", output_path)
             return True
             
         except Exception as e:
-            logger.error(f"Error saving text settings: {e}")
-            return False
\ No newline at end of file
+            logger.error("Error saving text settings: %s", e)
+            return False
+    
+    def load_text_settings(self, settings_path: str) -> Optional[Dict[str, Any]]:
+        """Load text settings written by save_text_settings (JSON or '.pkl')."""
+        try:
+            if settings_path.endswith('.pkl'):
+                with open(settings_path, 'rb') as f:
+                    saved = pickle.load(f)
+            else:
+                saved = _read_json(settings_path)
+        except Exception as e:
+            logger.error("Error loading text settings %s: %s", settings_path, e)
+            return None
+        
+        if 'texts' in saved:
+            return self._create_text_settings('per_image', texts=saved['texts'],
+                                              json_settings=saved.get('settings', {}))
+        if 'text' in saved:
+            return self._create_text_settings('single', text=saved['text'],
+                                              json_settings=saved.get('settings', {}))
+        return None
\ No newline at end of file
@@ -1,8 +1,32 @@
+import copy
+import functools
+import hashlib
+import json
 import logging
 import os
+import subprocess
+import tempfile
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    # libyaml-backed loader, much faster than the pure-Python one
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader
+
+logger = logging.getLogger(__name__)
+
+IMAGE_PROBE_WORKERS = 16
+IMAGE_PROBE_THREAD_MIN_FILES = 64
+
+# Directory of this tool under the per-user cache directory
+CACHE_DIR_NAME = 'video_generator'
+
+# Parsed configs of this process by (absolute path, mtime_ns, size)
+_CONFIG_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
 
 
 def setup_logging(config: Dict[str, Any]) -> logging.Logger:
@@ -34,109 +58,337 @@ def setup_logging(config: Dict[str, Any]) -> logging.Logger:
     return logging.getLogger(__name__)
 
 
+def get_cache_dir(*parts: str) -> str:
+    """Return a path in the per-user cache directory, independent of the working directory.
+
+    Uses ``$XDG_CACHE_HOME`` or ``%LOCALAPPDATA%`` when set, otherwise
+    ``~/.cache``. The directory is not created.
+    """
+    base = (os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, CACHE_DIR_NAME, *parts)
+
+
 def load_config(config_path: str = "config/settings.yaml") -> Dict[str, Any]:
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file.
+
+    The parsed config is kept in memory for the process, and as JSON in the
+    per-user cache directory keyed on a hash of the file's contents, so a
+    later run skips the YAML parse while the file is unchanged. Each call
+    returns its own copy, so callers may modify it freely;
+    ``load_config.cache_clear()`` drops the in-memory copies.
+    """
+    try:
+        stat = os.stat(config_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    
+    abs_path = os.path.abspath(config_path)
+    memo_key = (abs_path, stat.st_mtime_ns, stat.st_size)
+    
+    # A later call in the same process only needs the stat above
+    memoized = _CONFIG_CACHE.get(memo_key)
+    if memoized is not None:
+        return copy.deepcopy(memoized)
+    
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-        return config
+        with open(config_path, 'rb') as f:
+            raw = f.read()
     except FileNotFoundError:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    
+    digest = hashlib.sha256(raw).hexdigest()
+    cache_path = get_cache_dir('config', hashlib.sha1(abs_path.encode('utf-8')).hexdigest() + '.json')
+    
+    # Try the cached copy first
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('sha256') == digest:
+            _CONFIG_CACHE[memo_key] = cached['config']
+            return copy.deepcopy(cached['config'])
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    
+    try:
+        config = yaml.load(raw.decode('utf-8'), Loader=YAMLLoader)
     except yaml.YAMLError as e:
         raise ValueError(f"Error parsing YAML config: {e}")
+    
+    if isinstance(config, dict):
+        _save_config_cache(cache_path, digest, config)
+        _CONFIG_CACHE[memo_key] = config
+        return copy.deepcopy(config)
+    return config
+
+
+def _save_config_cache(cache_path: str, digest: str, config: Dict[str, Any]) -> None:
+    """Write the parsed config to its JSON cache (best effort, atomic)."""
+    try:
+        data = json.dumps({'sha256': digest, 'config': config}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return  # e.g. YAML dates; such configs are just parsed every run
+    # Only cache what JSON gives back unchanged (int keys would become strings)
+    if json.loads(data)['config'] != config:
+        return
+    
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except OSError:
+        pass
+
+
+load_config.cache_clear = _CONFIG_CACHE.clear
 
 
 def ensure_directories(config: Dict[str, Any]) -> None:
     """Ensure all required directories exist."""
     paths = config.get('paths', {})
     
-    # Create directories
-    dirs_to_create = [
-        os.path.dirname(paths.get('input_text', 'data/input.txt')),
-        paths.get('images_dir', 'data/images'),
-        paths.get('output_dir', 'data/output'),
-        'logs'
-    ]
+    # Create directories; a set so paths that appear twice (or spelled
+    # differently, e.g. 'data' and 'data/') are only created once
+    dirs_to_create = {
+        os.path.normpath(directory) for directory in (
+            os.path.dirname(paths.get('input_text', 'data/input.txt')),
+            paths.get('images_dir', 'data/images'),
+            paths.get('output_dir', 'data/output'),
+            'logs'
+        ) if directory
+    }
     
     for directory in dirs_to_create:
-        if directory:
-            os.makedirs(directory, exist_ok=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def _is_nonempty_file(entry: os.DirEntry) -> bool:
+    """Check that a directory entry is a regular file with content."""
+    try:
+        return entry.is_file() and entry.stat().st_size > 0
+    except OSError:
+        return False
 
 
 def get_supported_image_files(directory: str, supported_formats: List[str] = None) -> List[str]:
-    """Get list of supported image files from directory."""
+    """Get list of supported (non-empty) image files from directory."""
     if supported_formats is None:
         supported_formats = [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]
     
     if not os.path.exists(directory):
         return []
     
-    image_files = []
-    for file in os.listdir(directory):
-        if any(file.lower().endswith(fmt) for fmt in supported_formats):
-            image_files.append(os.path.join(directory, file))
+    extensions = tuple(fmt.lower() for fmt in supported_formats)
+    with os.scandir(directory) as entries:
+        candidates = [entry for entry in entries if entry.name.lower().endswith(extensions)]
+    
+    return _sorted_nonempty_paths(candidates)
+
+
+def _sorted_nonempty_paths(candidates: List[os.DirEntry]) -> List[str]:
+    """Sorted paths of the candidate entries that are non-empty regular files."""
+    # The stat calls dominate on network or USB storage; overlap them when
+    # there are enough files to be worth a thread pool
+    if len(candidates) > IMAGE_PROBE_THREAD_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=IMAGE_PROBE_WORKERS) as executor:
+            usable = list(executor.map(_is_nonempty_file, candidates))
+    else:
+        usable = [_is_nonempty_file(entry) for entry in candidates]
+    
+    image_files = [entry.path for entry, ok in zip(candidates, usable) if ok]
+    
+    skipped = sorted(entry.name for entry, ok in zip(candidates, usable) if not ok)
+    if skipped:
+        logger.warning(f"Skipping {len(skipped)} empty or unreadable image file(s): {', '.join(skipped)}")
     
     # Sort files naturally
     image_files.sort()
     return image_files
 
 
+# Sets for O(1) membership checks; sorted() gives the error messages a
+# stable order
+VALID_RESOLUTIONS = frozenset({"1080p", "720p"})
+VALID_SCALING_METHODS = frozenset({"fit", "crop"})
+VALID_TEXT_MODES = frozenset({"auto", "single", "per_image", "from_file"})
+VALID_ANIMATIONS = frozenset({
+    "fade_in", "fade_in_out", "slide_from_left", "slide_from_right",
+    "slide_from_top", "slide_from_bottom", "zoom_in", "zoom_out",
+    "bounce_in", "pulse", "rotate_in", "none"
+})
+
 def validate_config(config: Dict[str, Any]) -> bool:
     """Validate configuration settings."""
     # Check video resolution
-    valid_resolutions = ["1080p", "720p"]
-    if config.get('video', {}).get('resolution') not in valid_resolutions:
-        raise ValueError(f"Invalid resolution. Must be one of: {valid_resolutions}")
+    if config.get('video', {}).get('resolution') not in VALID_RESOLUTIONS:
+        raise ValueError(f"Invalid resolution. Must be one of: {sorted(VALID_RESOLUTIONS)}")
     
     # Check scaling method
-    valid_scaling = ["fit", "crop"]
-    if config.get('video', {}).get('scaling_method') not in valid_scaling:
-        raise ValueError(f"Invalid scaling method. Must be one of: {valid_scaling}")
+    if config.get('video', {}).get('scaling_method') not in VALID_SCALING_METHODS:
+        raise ValueError(f"Invalid scaling method. Must be one of: {sorted(VALID_SCALING_METHODS)}")
     
     # Check text mode
-    valid_text_modes = ["auto", "single", "per_image", "from_file"]
-    if config.get('text', {}).get('mode') not in valid_text_modes:
-        raise ValueError(f"Invalid text mode. Must be one of: {valid_text_modes}")
+    if config.get('text', {}).get('mode') not in VALID_TEXT_MODES:
+        raise ValueError(f"Invalid text mode. Must be one of: {sorted(VALID_TEXT_MODES)}")
     
     # Check animation type
-    valid_animations = [
-        "fade_in", "fade_in_out", "slide_from_left", "slide_from_right",
-        "slide_from_top", "slide_from_bottom", "zoom_in", "zoom_out",
-        "bounce_in", "pulse", "rotate_in", "none"
-    ]
     animation_type = config.get('text', {}).get('animation', {}).get('type')
-    if animation_type not in valid_animations:
-        raise ValueError(f"Invalid animation type. Must be one of: {valid_animations}")
+    if animation_type not in VALID_ANIMATIONS:
+        raise ValueError(f"Invalid animation type. Must be one of: {sorted(VALID_ANIMATIONS)}")
     
     return True
 
 
+VIDEO_SIZES = {
+    "1080p": (1920, 1080),
+    "720p": (1280, 720)
+}
+
+
 def get_video_size(resolution: str) -> tuple:
     """Get video dimensions for given resolution."""
-    sizes = {
-        "1080p": (1920, 1080),
-        "720p": (1280, 720)
-    }
-    return sizes.get(resolution, (1280, 720))
+    return VIDEO_SIZES.get(resolution, VIDEO_SIZES["720p"])
+
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg')
 
 
 def find_audio_file(directory: str = "data") -> Optional[str]:
     """Find audio file in the given directory."""
-    audio_extensions = ['.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg']
+    # Directory entries are streamed and the search stops at the first match
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(AUDIO_EXTENSIONS) and entry.is_file():
+                return entry.path
+    
+    return None
+
+
+def scan_media(directory: str, supported_formats: List[str] = None) -> Tuple[List[str], List[str]]:
+    """
+    Find image and audio files in one pass over a directory.
     
-    for file in os.listdir(directory):
-        if any(file.lower().endswith(ext) for ext in audio_extensions):
-            return os.path.join(directory, file)
+    For a directory that holds both, this replaces a get_supported_image_files()
+    call plus a find_audio_file() call, which would each list it.
     
+    Returns:
+        Tuple of (sorted non-empty image paths, audio paths in directory order)
+    """
+    if supported_formats is None:
+        supported_formats = [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]
+    
+    if not os.path.exists(directory):
+        return [], []
+    
+    image_extensions = tuple(fmt.lower() for fmt in supported_formats)
+    image_candidates = []
+    audio_files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name.lower()
+            if name.endswith(image_extensions):
+                image_candidates.append(entry)
+            elif name.endswith(AUDIO_EXTENSIONS) and entry.is_file():
+                audio_files.append(entry.path)
+    
+    return _sorted_nonempty_paths(image_candidates), audio_files
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """
+    Read a media file's duration with ffprobe without decoding it.
+    
+    Returns None if ffprobe is not installed or cannot read the file.
+    """
+    cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', path]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except (FileNotFoundError, OSError):
+        return None
+    
+    if result.returncode != 0:
+        return None
+    
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+# Hardware H.264 encoders by video.hw_accel name, in auto-detection order
+HW_H264_ENCODERS = {
+    'nvenc': 'h264_nvenc',
+    'qsv': 'h264_qsv',
+    'videotoolbox': 'h264_videotoolbox',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _list_ffmpeg_encoders(ffmpeg_binary: str) -> str:
+    """Return the output of ``ffmpeg -encoders`` (empty if ffmpeg can't run)."""
+    try:
+        result = subprocess.run([ffmpeg_binary, '-hide_banner', '-encoders'],
+                                capture_output=True, text=True)
+    except OSError:
+        return ''
+    return result.stdout if result.returncode == 0 else ''
+
+
+@functools.lru_cache(maxsize=None)
+def hw_encoder_available(ffmpeg_binary: str, encoder: str) -> bool:
+    """
+    Check that ffmpeg can actually use a hardware encoder on this machine.
+    
+    Being listed by ``ffmpeg -encoders`` isn't enough (static builds list
+    NVENC everywhere), so a listed encoder is also tried on a short test
+    clip. Results are cached for the life of the process.
+    """
+    if f" {encoder} " not in _list_ffmpeg_encoders(ffmpeg_binary):
+        return False
+    
+    cmd = [ffmpeg_binary, '-hide_banner', '-v', 'error',
+           '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.2',
+           '-c:v', encoder, '-f', 'null', '-']
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def find_hw_h264_encoder(ffmpeg_binary: str, hw_accel: Optional[str] = 'auto') -> Optional[str]:
+    """
+    Return the first working hardware H.264 encoder allowed by hw_accel.
+    
+    hw_accel is a video.hw_accel value: 'auto' tries every known encoder in
+    order, a name from HW_H264_ENCODERS tries just that one, and 'off' (or
+    anything falsy or unknown) returns None.
+    """
+    if not hw_accel or hw_accel == 'off':
+        return None
+    
+    names = list(HW_H264_ENCODERS) if hw_accel == 'auto' else [hw_accel]
+    for name in names:
+        encoder = HW_H264_ENCODERS.get(name)
+        if encoder and hw_encoder_available(ffmpeg_binary, encoder):
+            return encoder
     return None
 
 
+# Characters that aren't allowed in file names, each mapped to '_'
+FILENAME_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to be filesystem-safe."""
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
+    # Replace invalid characters in one pass
+    filename = filename.translate(FILENAME_SANITIZE_TABLE)
     
     # Limit length
     if len(filename) > 200:
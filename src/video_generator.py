@@ -1,12 +1,63 @@
 import os
+import bisect
+import subprocess
 import numpy as np
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import ImageClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip
+from moviepy.config import get_setting
+from moviepy.editor import ImageClip, VideoClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip
+from moviepy.video.fx.all import fadein, fadeout
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Image decode and resize release the GIL in Pillow and OpenCV, so slide
+# frames are prepared on a small thread pool
+FRAME_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+# Image.Resampling only exists from Pillow 9.1; older Pillow and Pillow-SIMD
+# (which tracks Pillow 9.0) keep the filters on the Image module itself
+RESAMPLE_LANCZOS = getattr(Image, 'Resampling', Image).LANCZOS
+
+# Output frame size for each supported resolution name (720p otherwise)
+VIDEO_SIZES = {
+    "1080p": (1920, 1080),
+    "720p": (1280, 720)
+}
+DEFAULT_VIDEO_SIZE = VIDEO_SIZES["720p"]
+
+# A slide: an image file path, or an image already decoded by the caller
+ImageSource = Union[str, np.ndarray, Image.Image]
+
+# Result of VideoGenerator.plan_slideshow: (slide durations, crossfade
+# duration, prepared text settings, finished still frames or None)
+SlideshowPlan = Tuple[List[float], float, Optional[Dict[str, Any]], Optional[List[np.ndarray]]]
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, parallel=True)
+    def _lut_kernel(frame, lut):
+        """Map every byte of a uint8 frame through a 256-entry table, rows split across threads."""
+        out = np.empty_like(frame)
+        for y in numba.prange(frame.shape[0]):
+            for x in range(frame.shape[1]):
+                for c in range(frame.shape[2]):
+                    out[y, x, c] = lut[frame[y, x, c]]
+        return out
+
 
 class VideoGenerator:
     """Handles video generation with text overlays and animations."""
@@ -16,16 +67,29 @@ class VideoGenerator:
         self.video_config = config.get('video', {})
         self.text_config = config.get('text', {})
         self.paths = config.get('paths', {})
+        self.audio_sync = None
+        self.sequential_animator = None
+        # Fonts by size; the font file is located once, on the first load
+        self._font_cache: Dict[int, Optional[ImageFont.FreeTypeFont]] = {}
+        self._font_path: Optional[str] = None
+        # Rendered overlay clips by (text, video size, font size, colour,
+        # stroke colour, stroke width); single mode repeats one text per slide
+        self._text_clip_cache: OrderedDict = OrderedDict()
+        self._text_clip_cache_size = self.text_config.get('overlay_cache_size', 64)
     
-    def create_slideshow_video(self, images: List[str], audio: AudioFileClip, 
-                              text_settings: Optional[Dict[str, Any]] = None) -> Optional[CompositeVideoClip]:
+    def create_slideshow_video(self, images: List[ImageSource], audio: AudioFileClip, 
+                              text_settings: Optional[Dict[str, Any]] = None,
+                              plan: Optional[SlideshowPlan] = None) -> Optional[CompositeVideoClip]:
         """
         Create slideshow video with images, audio, and optional text overlays.
         
         Args:
-            images: List of image file paths
+            images: List of image file paths (or already decoded images,
+                as arrays or PIL images)
             audio: Audio clip for the video
             text_settings: Optional text overlay settings
+            plan: Result of plan_slideshow() for these arguments, if already
+                computed; saves planning and loading the slides again
             
         Returns:
             CompositeVideoClip object or None if creation fails
@@ -46,12 +110,75 @@ class VideoGenerator:
         logger.info(f"Creating {resolution} video with {len(images)} images")
         logger.info(f"Video size: {video_size}, scaling method: {scaling_method}")
         
+        try:
+            if plan is None:
+                plan = self.plan_slideshow(images, audio, text_settings)
+            slide_durations, crossfade_duration, text_settings, frames = plan
+            
+            if frames is not None:
+                # Nothing on screen moves, so each frame is just a slide (or a
+                # faded one) and MoviePy's per-frame compositing can be skipped
+                logger.info("Building slideshow directly from still frames...")
+                final_video = VideoClip(
+                    self._slideshow_frame_function(frames, slide_durations, crossfade_duration),
+                    duration=audio.duration
+                )
+            else:
+                # Build slideshow clips with synchronized timing
+                clips = self._build_slideshow_clips_with_sync(
+                    images, video_size, slide_durations, crossfade_duration,
+                    scaling_method, text_settings
+                )
+                
+                if not clips:
+                    logger.error("No valid clips created")
+                    return None
+                
+                # Concatenate clips
+                logger.info("Concatenating synchronized video clips...")
+                final_video = concatenate_videoclips(clips, method="compose")
+                final_video = final_video.set_duration(audio.duration)
+            final_video = final_video.set_audio(audio)
+            
+            logger.info(f"Synchronized video creation completed: {final_video.duration:.2f}s")
+            return final_video
+            
+        except Exception as e:
+            logger.error(f"Error creating slideshow video: {e}")
+            return None
+    
+    def plan_slideshow(self, images: List[ImageSource], audio: AudioFileClip,
+                       text_settings: Optional[Dict[str, Any]] = None) -> SlideshowPlan:
+        """
+        Plan slide timing and text, and load the slides if nothing animates.
+        
+        The result can be given to both write_slideshow_ffmpeg() and
+        create_slideshow_video(), so trying one after the other analyses the
+        audio and decodes the images only once.
+        """
+        video_size = self._get_video_size(self.video_config.get('resolution', '720p'))
+        scaling_method = self.video_config.get('scaling_method', 'fit')
+        
+        slide_durations, crossfade_duration = self._plan_slide_timing(images, audio)
+        text_settings = self._prepare_text_settings(text_settings, video_size)
+        try:
+            frames = self._load_still_slides(images, video_size, scaling_method,
+                                             slide_durations, text_settings)
+        except Exception as e:
+            # MoviePy's clip building loads the slides again and skips bad ones
+            logger.warning(f"Could not load still slides ({e})")
+            frames = None
+        return slide_durations, crossfade_duration, text_settings, frames
+    
+    def _plan_slide_timing(self, images: List[ImageSource], audio: AudioFileClip) -> Tuple[List[float], float]:
+        """Work out each slide's duration (audio-synced when possible) and the crossfade length."""
         # Import and use audio synchronization
         try:
             from .audio_sync import AudioSyncManager
-            sync_manager = AudioSyncManager(self.config)
-            slide_timings = sync_manager.calculate_slide_timings(audio, len(images))
-            slide_durations = sync_manager.get_slide_durations(slide_timings, audio.duration)
+            if self.audio_sync is None:
+                self.audio_sync = AudioSyncManager(self.config)
+            slide_timings = self.audio_sync.calculate_slide_timings(audio, len(images))
+            slide_durations = self.audio_sync.get_slide_durations(slide_timings, audio.duration)
             
             logger.info("Audio-sync enabled:")
             for i, (start_time, duration) in enumerate(zip(slide_timings, slide_durations)):
@@ -73,117 +200,406 @@ class VideoGenerator:
             min_slide_duration / 3  # Never more than 1/3 of shortest slide
         )
         
-        try:
-            # Build slideshow clips with synchronized timing
-            clips = self._build_slideshow_clips_with_sync(
-                images, video_size, slide_durations, crossfade_duration,
-                scaling_method, text_settings
+        return slide_durations, crossfade_duration
+    
+    def _prepare_text_settings(self, text_settings: Optional[Dict[str, Any]],
+                               video_size: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """Resolve slideshow-wide text options before any slide is rendered."""
+        if (text_settings and text_settings.get('mode') == 'per_image'
+                and self.text_config.get('scaling', {}).get('auto_scale', True)):
+            # Fit every slide's text at one size up front, so the slides share
+            # a typeface size and each render skips its own auto-fit
+            shared_size = self._compute_shared_font_size(
+                text_settings.get('texts', []), video_size, text_settings.get('font_size', 60)
             )
+            text_settings = {**text_settings, 'font_size': shared_size, 'auto_scale': False}
+        return text_settings
+    
+    @staticmethod
+    def _crossfade_joins(slide_durations: List[float], crossfade_duration: float) -> np.ndarray:
+        """
+        Flag which slides crossfade in from the previous one.
+        
+        Entry i is True when slides i-1 and i are both longer than twice the
+        crossfade, so the fade never eats into a short slide; entry 0 is
+        always False.
+        """
+        durations = np.asarray(slide_durations, dtype=float)
+        joins = np.zeros(len(durations), dtype=bool)
+        if crossfade_duration > 0 and len(durations) > 1:
+            long_enough = durations > crossfade_duration * 2
+            joins[1:] = long_enough[1:] & long_enough[:-1]
+        return joins
+    
+    def write_slideshow_ffmpeg(self, images: List[ImageSource], audio: AudioFileClip, output_path: str,
+                               codec: str = 'libx264', ffmpeg_params: Optional[list] = None,
+                               text_settings: Optional[Dict[str, Any]] = None,
+                               plan: Optional[SlideshowPlan] = None) -> bool:
+        """
+        Encode a slideshow of still frames by piping raw frames to ffmpeg.
+        
+        Slides are still images (with any static text baked in), so each one
+        is decoded once and written straight from its array for every frame
+        it is on screen; only the crossfade frames are computed (see
+        _slideshow_frame_function). MoviePy's per-frame compositing is
+        skipped entirely.
+        
+        ``plan`` is the result of plan_slideshow() for these arguments, if
+        already computed.
+        
+        Returns:
+            True if the video was written; False if this slideshow can't be
+            written this way, e.g. its text animates (the caller should fall
+            back to MoviePy)
+        """
+        audio_path = getattr(audio, 'filename', None)
+        if not images or not audio_path or not os.path.exists(audio_path):
+            return False
+        
+        if plan is None:
+            # Check before the (possibly audio-analysing) timing pass
+            if text_settings and not all(self._is_static_text(text_settings, i) for i in range(len(images))):
+                return False
+            plan = self.plan_slideshow(images, audio, text_settings)
+        slide_durations, crossfade_duration, text_settings, frames = plan
+        if frames is None:
+            return False
+        
+        video_size = self._get_video_size(self.video_config.get('resolution', '720p'))
+        fps = self.video_config.get('fps', 24)
+        
+        num_slides = len(frames)
+        make_frame = self._slideshow_frame_function(frames, slide_durations, crossfade_duration)
+        
+        width, height = video_size
+        # Converting each still slide to the encoder's yuv420p once, instead
+        # of ffmpeg converting every frame, takes a full-frame pass off the
+        # encode; only fade frames are converted as they are written
+        yuv_input = (CV2_AVAILABLE and self.video_config.get('yuv_frames', True)
+                     and width % 2 == 0 and height % 2 == 0)
+        if yuv_input:
+            slide_yuv = {id(frame): cv2.cvtColor(frame, cv2.COLOR_RGB2YUV_I420) for frame in frames}
+        
+        cmd = [
+            get_setting("FFMPEG_BINARY"), '-y', '-hide_banner', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'yuv420p' if yuv_input else 'rgb24',
+            '-s', f'{width}x{height}', '-r', str(fps),
+            '-i', 'pipe:0', '-i', audio_path, '-map', '0:v', '-map', '1:a',
+            '-c:v', codec, '-pix_fmt', 'yuv420p',
+            '-c:a', self.video_config.get('audio_codec', 'aac'),
+            '-t', f'{audio.duration:.3f}'
+        ]
+        if codec == 'libx264':
+            cmd += ['-preset', self.video_config.get('preset', 'medium')]
+            if self.video_config.get('tune'):
+                cmd += ['-tune', str(self.video_config['tune'])]
+        threads = self.video_config.get('threads')
+        if threads is not None:
+            cmd += ['-threads', str(threads)]
+        cmd += list(ffmpeg_params or []) + [output_path]
+        
+        logger.info(f"Encoding {num_slides} slides directly with ffmpeg ({codec})")
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
+        try:
+            # Same frame times as MoviePy's writer: k / fps for k < duration * fps
+            for k in range(int(audio.duration * fps)):
+                frame = make_frame(k / fps)
+                if yuv_input:
+                    # make_frame returns the slide array itself outside fades
+                    yuv = slide_yuv.get(id(frame))
+                    frame = yuv if yuv is not None else cv2.cvtColor(frame, cv2.COLOR_RGB2YUV_I420)
+                proc.stdin.write(frame)
+            proc.stdin.close()
+        except BrokenPipeError:
+            # ffmpeg exited early; its error message is reported below
+            pass
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+        return True
+    
+    def _load_still_slides(self, images: List[ImageSource], video_size: Tuple[int, int], scaling_method: str,
+                           slide_durations: List[float],
+                           text_settings: Optional[Dict[str, Any]] = None) -> Optional[List[np.ndarray]]:
+        """
+        Load every slide as one finished frame, text included, if nothing animates.
+        
+        Returns None when some slide's text animates or an image can't be
+        read; MoviePy then builds the clips (and skips unreadable slides).
+        """
+        num_slides = len(slide_durations)
+        if text_settings and not all(self._is_static_text(text_settings, i) for i in range(num_slides)):
+            return None
+        
+        frames = self._load_frames(images[:num_slides], video_size, scaling_method)
+        if not frames or any(frame is None for frame in frames):
+            return None
+        
+        if text_settings:
+            frames = [
+                self._build_slide_clip(frame, duration, text_settings, i, video_size).get_frame(0)
+                for i, (frame, duration) in enumerate(zip(frames, slide_durations))
+            ]
+        # Contiguous frames can be written to a pipe without another copy
+        return [np.ascontiguousarray(frame, dtype=np.uint8) for frame in frames]
+    
+    def _slideshow_frame_function(self, frames: List[np.ndarray], slide_durations: List[float],
+                                  crossfade_duration: float) -> Callable[[float], np.ndarray]:
+        """
+        Frame function for a slideshow of still frames.
+        
+        Gives the same frames as the concatenated MoviePy clips: each slide
+        fades through black into the next where _crossfade_joins allows a
+        crossfade, and only those fade frames are computed.
+        """
+        num_slides = len(frames)
+        joined = self._crossfade_joins(slide_durations[:num_slides], crossfade_duration).tolist()
+        fade_in = joined
+        fade_out = joined[1:] + [False]
+        # Slide start and end times as concatenate_videoclips computes them,
+        # so fade progress matches to the last bit
+        slide_times = np.cumsum([0] + list(slide_durations[:num_slides])).tolist()
+        slide_ends = slide_times[1:]
+        
+        def make_frame(t: float) -> np.ndarray:
+            i = min(bisect.bisect_right(slide_ends, t), num_slides - 1)
+            local_t = t - slide_times[i]
             
-            if not clips:
-                logger.error("No valid clips created")
-                return None
-            
-            # Concatenate clips
-            logger.info("Concatenating synchronized video clips...")
-            final_video = concatenate_videoclips(clips, method="compose")
-            final_video = final_video.set_duration(audio.duration)
-            final_video = final_video.set_audio(audio)
-            
-            logger.info(f"Synchronized video creation completed: {final_video.duration:.2f}s")
-            return final_video
+            fading = 1.0
+            if fade_in[i] and local_t < crossfade_duration:
+                fading = local_t / crossfade_duration
+            if fade_out[i] and slide_durations[i] - local_t < crossfade_duration:
+                fading = min(fading, (slide_durations[i] - local_t) / crossfade_duration)
             
-        except Exception as e:
-            logger.error(f"Error creating slideshow video: {e}")
-            return None
+            if fading >= 1.0:
+                return frames[i]
+            return self._scale_frame(frames[i], max(fading, 0.0))
+        
+        return make_frame
     
-    def _build_slideshow_clips_with_sync(self, images: List[str], video_size: Tuple[int, int], 
+    @staticmethod
+    def _scale_frame(frame: np.ndarray, fading: float) -> np.ndarray:
+        """
+        Darken a uint8 frame by a fade factor, as (frame * fading).astype('uint8') would.
+        
+        The factor is the same for every pixel, so a 256-entry lookup table
+        (scaled in float once per value) gives the same bytes without a
+        float64 copy of the whole frame: through OpenCV's SIMD cv2.LUT, or a
+        numba kernel. NumPy fancy indexing is slower than the float multiply,
+        so that stays the fallback.
+        """
+        if CV2_AVAILABLE:
+            return cv2.LUT(frame, (np.arange(256) * fading).astype(np.uint8))
+        if NUMBA_AVAILABLE and frame.ndim == 3:
+            return _lut_kernel(frame, (np.arange(256) * fading).astype(np.uint8))
+        return (frame * fading).astype('uint8')
+    
+    def _build_slideshow_clips_with_sync(self, images: List[ImageSource], video_size: Tuple[int, int], 
                                         slide_durations: List[float], crossfade_duration: float,
                                         scaling_method: str, text_settings: Optional[Dict[str, Any]]) -> List[ImageClip]:
         """Build individual slideshow clips with synchronized timing."""
         clips = []
         
+        # Decode and scale every slide up front; clips are built in order below
+        frames = self._load_frames(images[:len(slide_durations)], video_size, scaling_method)
+        # Only slides long enough on both sides of a cut get a crossfade
+        joins = self._crossfade_joins(slide_durations, crossfade_duration)
+        
         for i, (img_path, duration) in enumerate(zip(images, slide_durations)):
-            logger.info(f"Processing slide {i+1}/{len(images)}: {os.path.basename(img_path)} (duration: {duration:.2f}s)")
+            logger.info(f"Processing slide {i+1}/{len(images)}: {self._describe_image(img_path)} (duration: {duration:.2f}s)")
             
             try:
-                # Load and scale image
-                processed_image = self._process_image(img_path, video_size, scaling_method)
-                if processed_image is None:
+                img_array = frames[i]
+                if img_array is None:
                     continue
                 
-                # Create image clip with specific duration
-                img_array = np.array(processed_image)
-                clip = ImageClip(img_array).set_duration(duration)
-                
-                # Add text overlay if settings provided
-                if text_settings:
-                    text_clip = self._create_text_overlay(
-                        text_settings, i, video_size, duration
-                    )
-                    if text_clip:
-                        clip = CompositeVideoClip([clip, text_clip])
+                # Create image clip with specific duration and its text
+                clip = self._build_slide_clip(img_array, duration, text_settings, i, video_size)
                 
                 # Apply crossfade transitions (but respect slide timing)
-                if i > 0 and crossfade_duration > 0:
-                    # Only apply crossfade if slides are long enough
-                    if duration > crossfade_duration * 2 and slide_durations[i-1] > crossfade_duration * 2:
-                        clips[-1] = clips[-1].crossfadeout(crossfade_duration)
-                        clip = clip.crossfadein(crossfade_duration)
+                if joins[i]:
+                    # Slides are concatenated over black, so fading the
+                    # colour gives the same frames as a mask crossfade
+                    # without adding a mask that every frame must blend
+                    clips[-1] = clips[-1].fx(fadeout, crossfade_duration)
+                    clip = clip.fx(fadein, crossfade_duration)
                 
                 clips.append(clip)
                 
             except Exception as e:
-                logger.error(f"Error processing image {img_path}: {e}")
+                logger.error(f"Error processing image {self._describe_image(img_path)}: {e}")
                 continue
         
         return clips
     
-    def _build_slideshow_clips(self, images: List[str], video_size: Tuple[int, int], 
+    def _build_slideshow_clips(self, images: List[ImageSource], video_size: Tuple[int, int], 
                               base_duration: float, crossfade_duration: float,
                               scaling_method: str, text_settings: Optional[Dict[str, Any]]) -> List[ImageClip]:
         """Build individual slideshow clips with scaling and text overlays."""
         clips = []
         
+        # Decode and scale every image up front; clips are built in order below
+        frames = self._load_frames(images, video_size, scaling_method)
+        
         for i, img_path in enumerate(images):
-            logger.info(f"Processing image {i+1}/{len(images)}: {os.path.basename(img_path)}")
+            logger.info(f"Processing image {i+1}/{len(images)}: {self._describe_image(img_path)}")
             
             try:
-                # Load and scale image
-                processed_image = self._process_image(img_path, video_size, scaling_method)
-                if processed_image is None:
+                img_array = frames[i]
+                if img_array is None:
                     continue
                 
-                # Create image clip
-                img_array = np.array(processed_image)
-                clip = ImageClip(img_array).set_duration(base_duration)
-                
-                # Add text overlay if settings provided
-                if text_settings:
-                    text_clip = self._create_text_overlay(
-                        text_settings, i, video_size, base_duration
-                    )
-                    if text_clip:
-                        clip = CompositeVideoClip([clip, text_clip])
+                # Create image clip with its text
+                clip = self._build_slide_clip(img_array, base_duration, text_settings, i, video_size)
                 
                 # Apply crossfade transitions
                 if i > 0 and crossfade_duration > 0:
-                    clips[-1] = clips[-1].crossfadeout(crossfade_duration)
-                    clip = clip.crossfadein(crossfade_duration)
+                    clips[-1] = clips[-1].fx(fadeout, crossfade_duration)
+                    clip = clip.fx(fadein, crossfade_duration)
                 
                 clips.append(clip)
                 
             except Exception as e:
-                logger.error(f"Error processing image {img_path}: {e}")
+                logger.error(f"Error processing image {self._describe_image(img_path)}: {e}")
                 continue
         
         return clips
     
-    def _process_image(self, img_path: str, video_size: Tuple[int, int], 
+    def _build_slide_clip(self, img_array: np.ndarray, duration: float,
+                          text_settings: Optional[Dict[str, Any]], image_index: int,
+                          video_size: Tuple[int, int]) -> ImageClip:
+        """Build one slide's clip, with its text overlay if settings provided."""
+        clip = ImageClip(img_array).set_duration(duration)
+        if not text_settings:
+            return clip
+        
+        text_clip = self._create_text_overlay(text_settings, image_index, video_size, duration)
+        if not text_clip:
+            return clip
+        
+        # The slide is the background, so the composite needs no mask of its own
+        clip = CompositeVideoClip([clip, text_clip], use_bgclip=True)
+        if self._is_static_text(text_settings, image_index):
+            # Nothing moves, so composite one frame and show it for the whole
+            # slide instead of blending the text layer into every frame
+            clip = ImageClip(clip.get_frame(0)).set_duration(duration)
+        return clip
+    
+    def _is_static_text(self, text_settings: Dict[str, Any], image_index: int) -> bool:
+        """Whether a slide's text overlay looks the same in every frame."""
+        if text_settings.get('animation', 'fade_in') != 'none':
+            return False
+        # Multi-line text may be revealed line by line instead
+        if text_settings.get('sequential', {}).get('enabled', False):
+            return '\n' not in self._get_text_for_image(text_settings, image_index)
+        return True
+    
+    @staticmethod
+    def _describe_image(image: ImageSource) -> str:
+        """Short name for an image in log messages."""
+        if isinstance(image, str):
+            return os.path.basename(image)
+        return f"<decoded {type(image).__name__}>"
+    
+    def _load_frames(self, images: List[ImageSource], video_size: Tuple[int, int],
+                     scaling_method: str) -> List[Optional[np.ndarray]]:
+        """Load and scale several images in parallel, in input order (None for failures)."""
+        if len(images) < 2 or FRAME_LOAD_WORKERS < 2:
+            return [self._load_frame(img_path, video_size, scaling_method) for img_path in images]
+        
+        with ThreadPoolExecutor(max_workers=FRAME_LOAD_WORKERS) as executor:
+            return list(executor.map(
+                lambda img_path: self._load_frame(img_path, video_size, scaling_method), images
+            ))
+    
+    def _load_frame(self, img_path: ImageSource, video_size: Tuple[int, int],
+                    scaling_method: str) -> Optional[np.ndarray]:
+        """Load an image scaled to the video size as an RGB frame array."""
+        if (CV2_AVAILABLE and isinstance(img_path, str)
+                and self.config.get('image', {}).get('use_opencv', True)):
+            return self._process_image_cv2(img_path, video_size, scaling_method)
+        
+        processed_image = self._process_image(img_path, video_size, scaling_method)
+        if processed_image is None:
+            return None
+        return np.asarray(processed_image)
+    
+    def _process_image_cv2(self, img_path: str, video_size: Tuple[int, int],
+                           scaling_method: str) -> Optional[np.ndarray]:
+        """
+        OpenCV version of _process_image, returning the frame array directly.
+        
+        Same geometry as the PIL path (fit never upscales, like thumbnail());
+        OpenCV's resize is several times faster than Pillow's on HD frames.
+        """
+        try:
+            img = cv2.imread(img_path, cv2.IMREAD_COLOR)
+            if img is None:
+                logger.error(f"Error processing image {img_path}: could not be read")
+                return None
+            
+            original_height, original_width = img.shape[:2]
+            target_width, target_height = video_size
+            
+            if scaling_method == 'crop':
+                # Scale and crop to fill frame
+                img_aspect = original_width / original_height
+                if img_aspect > target_width / target_height:
+                    new_height = target_height
+                    new_width = int(new_height * img_aspect)
+                else:
+                    new_width = target_width
+                    new_height = int(new_width / img_aspect)
+            else:  # fit method
+                scale = min(target_width / original_width, target_height / original_height, 1.0)
+                new_width = max(1, round(original_width * scale))
+                new_height = max(1, round(original_height * scale))
+            
+            if (new_width, new_height) != (original_width, original_height):
+                # INTER_AREA avoids aliasing when shrinking; Lanczos when enlarging
+                shrinking = new_width < original_width
+                interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4
+                img = cv2.resize(img, (new_width, new_height), interpolation=interpolation)
+            
+            if scaling_method == 'crop':
+                # Crop center
+                left = (new_width - target_width) // 2
+                top = (new_height - target_height) // 2
+                return cv2.cvtColor(img[top:top + target_height, left:left + target_width],
+                                    cv2.COLOR_BGR2RGB)
+            
+            # Letterbox onto black, converting first so the colour swap only
+            # touches the picture and the border is written once, already RGB
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            pad_x = target_width - new_width
+            pad_y = target_height - new_height
+            if pad_x == 0 and pad_y == 0:
+                return img
+            return cv2.copyMakeBorder(img, pad_y // 2, pad_y - pad_y // 2,
+                                      pad_x // 2, pad_x - pad_x // 2,
+                                      cv2.BORDER_CONSTANT, value=(0, 0, 0))
+            
+        except Exception as e:
+            logger.error(f"Error processing image {img_path}: {e}")
+            return None
+    
+    def _process_image(self, img_path: ImageSource, video_size: Tuple[int, int], 
                       scaling_method: str) -> Optional[Image.Image]:
         """Process and scale image to fit video dimensions."""
         try:
-            img = Image.open(img_path)
+            if isinstance(img_path, np.ndarray):
+                img = Image.fromarray(img_path)
+            elif isinstance(img_path, Image.Image):
+                # thumbnail() below resizes in place; leave the caller's image alone
+                img = img_path.copy()
+            else:
+                img = Image.open(img_path)
             original_size = img.size
             target_size = video_size
             
@@ -201,7 +617,11 @@ class VideoGenerator:
                     new_width = target_size[0]
                     new_height = int(new_width / img_aspect)
                 
-                img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                # Let the JPEG decoder scale down by 1/2-1/8 while decoding,
+                # staying at least as large as the resize target (no-op for
+                # other formats); thumbnail() below does the same for fit
+                img.draft('RGB', (new_width, new_height))
+                img_resized = img.resize((new_width, new_height), RESAMPLE_LANCZOS)
                 
                 # Crop center
                 left = (new_width - target_size[0]) // 2
@@ -210,16 +630,24 @@ class VideoGenerator:
                 
             else:  # fit method
                 # Scale to fit within frame with letterboxing
-                img.thumbnail(target_size, Image.Resampling.LANCZOS)
-                img_final = Image.new('RGB', target_size, (0, 0, 0))
-                paste_x = (target_size[0] - img.size[0]) // 2
-                paste_y = (target_size[1] - img.size[1]) // 2
-                img_final.paste(img, (paste_x, paste_y))
+                img.thumbnail(target_size, RESAMPLE_LANCZOS)
+                if img.size == tuple(target_size):
+                    # Same aspect as the video: nothing to letterbox, so skip
+                    # allocating and filling a black canvas for this slide.
+                    # thumbnail() doesn't decode an image it leaves unchanged,
+                    # so load here to keep decode errors inside this try
+                    img.load()
+                    img_final = img if img.mode == 'RGB' else img.convert('RGB')
+                else:
+                    img_final = Image.new('RGB', target_size, (0, 0, 0))
+                    paste_x = (target_size[0] - img.size[0]) // 2
+                    paste_y = (target_size[1] - img.size[1]) // 2
+                    img_final.paste(img, (paste_x, paste_y))
             
             return img_final
             
         except Exception as e:
-            logger.error(f"Error processing image {img_path}: {e}")
+            logger.error(f"Error processing image {self._describe_image(img_path)}: {e}")
             return None
     
     def _create_text_overlay(self, text_settings: Dict[str, Any], image_index: int, 
@@ -241,8 +669,10 @@ class VideoGenerator:
                 logger.info("Using sequential text animation (line-by-line)")
                 from .sequential_text import SequentialTextAnimator
                 
-                animator = SequentialTextAnimator(self.config)
-                text_clip = animator.create_sequential_text_clip(
+                # One animator for every slide, so its loaded fonts are reused
+                if self.sequential_animator is None:
+                    self.sequential_animator = SequentialTextAnimator(self.config)
+                text_clip = self.sequential_animator.create_sequential_text_clip(
                     text_content, video_size, duration, text_settings
                 )
                 
@@ -255,22 +685,40 @@ class VideoGenerator:
             # Fallback to standard text overlay (all text at once)
             logger.info("Using standard text overlay (all text at once)")
             
-            # Create text image using PIL - this creates a tight-fitting image
-            text_img = self._create_pil_text_image(
-                text_content, video_size,
+            style = (
                 text_settings.get('font_size', 60),
                 text_settings.get('color', 'white'),
                 text_settings.get('stroke_color', 'black'),
                 text_settings.get('stroke_width', 3)
             )
+            # Set by create_slideshow_video once it has fitted a shared size
+            auto_scale = text_settings.get('auto_scale')
+            cache_key = (text_content, tuple(video_size)) + style + (auto_scale,)
+            base_clip = self._text_clip_cache.get(cache_key)
             
-            if text_img is None:
-                logger.error("Failed to create PIL text image")
-                return None
+            if base_clip is not None:
+                self._text_clip_cache.move_to_end(cache_key)
+            else:
+                # Create text image using PIL - this creates a tight-fitting image
+                text_img = self._create_pil_text_image(text_content, video_size, *style,
+                                                       auto_scale=auto_scale)
+                
+                if text_img is None:
+                    logger.error("Failed to create PIL text image")
+                    return None
+                
+                # Create MoviePy text clip from the PIL image. The set_* calls
+                # below return copies, so one clip (and the float alpha mask
+                # it splits off) serves every slide; freeze both arrays
+                base_clip = ImageClip(np.asarray(text_img), ismask=False, transparent=True)
+                if base_clip.mask is not None:
+                    base_clip.mask.img.flags.writeable = False
+                if self._text_clip_cache_size > 0:
+                    self._text_clip_cache[cache_key] = base_clip
+                    if len(self._text_clip_cache) > self._text_clip_cache_size:
+                        self._text_clip_cache.popitem(last=False)
             
-            # Create MoviePy text clip from the PIL image
-            text_array = np.array(text_img)
-            text_clip = ImageClip(text_array, ismask=False, transparent=True).set_duration(duration)
+            text_clip = base_clip.set_duration(duration)
             
             logger.info(f"Text clip size: {text_clip.size}, Video size: {video_size}")
             
@@ -378,8 +826,11 @@ class VideoGenerator:
     
     def _create_pil_text_image(self, text: str, size: Tuple[int, int], font_size: int = 50,
                               color: str = 'white', stroke_color: str = 'black', 
-                              stroke_width: int = 2) -> Optional[Image.Image]:
-        """Create text image using PIL with improved rendering."""
+                              stroke_width: int = 2, auto_scale: Optional[bool] = None) -> Optional[Image.Image]:
+        """Create text image using PIL with improved rendering.
+        
+        auto_scale overrides text.scaling.auto_scale; None uses the config.
+        """
         try:
             img_width, img_height = size
             # Create a smaller canvas that fits just the text, not the full video size
@@ -404,8 +855,9 @@ class VideoGenerator:
             lines = text.split('\n') if '\n' in text else [text]
             
             # Adjust font size if auto-scaling is enabled
-            scaling_config = self.text_config.get('scaling', {})
-            auto_scale = scaling_config.get('auto_scale', True)
+            if auto_scale is None:
+                scaling_config = self.text_config.get('scaling', {})
+                auto_scale = scaling_config.get('auto_scale', True)
             
             if auto_scale:
                 font_size, font = self._adjust_font_size(lines, temp_draw, font, font_size, size)
@@ -414,43 +866,48 @@ class VideoGenerator:
                 logger.info(f"Auto-scaling disabled, using exact font size: {font_size}")
                 font = self._load_font(font_size) or font
             
-            # Calculate actual text dimensions
+            # PIL draws the outline itself in one pass; a same-colour outline
+            # would only thicken the text, so it is skipped as before
+            if stroke_width <= 0 or stroke_color == color:
+                stroke_width = 0
+            
+            # Calculate actual text dimensions, outline included
             line_heights = []
             line_widths = []
+            line_offsets = []
             max_width = 0
             
             for line in lines:
                 try:
                     if hasattr(temp_draw, 'textbbox'):
-                        bbox = temp_draw.textbbox((0, 0), line, font=font)
+                        bbox = temp_draw.textbbox((0, 0), line, font=font, stroke_width=stroke_width)
                         width = bbox[2] - bbox[0]
                         height = bbox[3] - bbox[1]
+                        offset = (bbox[0], bbox[1])
                     else:
-                        width, height = temp_draw.textsize(line, font=font)
+                        width, height = temp_draw.textsize(line, font=font, stroke_width=stroke_width)
+                        offset = (0, 0)
                 except Exception as e:
                     logger.warning(f"Could not measure text, using estimates: {e}")
                     width = len(line) * (font_size * 0.6)
                     height = font_size * 1.2
+                    offset = (0, 0)
                 
                 line_widths.append(width)
                 line_heights.append(height)
+                line_offsets.append(offset)
                 max_width = max(max_width, width)
             
             total_height = sum(line_heights) + (len(lines) - 1) * 15
             
-            # Add padding around text
-            padding = max(stroke_width * 2, 10)
-            canvas_width = int(max_width + padding * 2)
-            canvas_height = int(total_height + padding * 2)
+            # The measured boxes include the outline, so the canvas needs no padding
+            canvas_width = max(1, int(max_width))
+            canvas_height = max(1, int(total_height))
             
             # Create the actual text image with tight bounds
             img = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
             draw = ImageDraw.Draw(img)
-            
-            # Position text in the center of this smaller canvas
-            start_x = padding
-            start_y = padding
-            current_y = start_y
+            current_y = 0
             
             # Draw text with stroke
             for i, line in enumerate(lines):
@@ -458,23 +915,14 @@ class VideoGenerator:
                     current_y += line_heights[i] if i < len(line_heights) else font_size + 15
                     continue
                 
-                # Center each line horizontally within the text block
-                line_x = start_x + (max_width - line_widths[i]) // 2
-                
-                # Draw stroke/outline
-                if stroke_width > 0 and stroke_color != color:
-                    for adj_x in range(-stroke_width, stroke_width + 1):
-                        for adj_y in range(-stroke_width, stroke_width + 1):
-                            if adj_x != 0 or adj_y != 0:
-                                try:
-                                    draw.text((line_x + adj_x, current_y + adj_y), 
-                                            line, font=font, fill=stroke_color)
-                                except Exception as e:
-                                    logger.warning(f"Error drawing text stroke: {e}")
-                
-                # Draw main text
+                # Center each line horizontally within the text block; the
+                # bbox offset puts the inked pixels at the top-left of the box
+                line_x = (max_width - line_widths[i]) // 2 - line_offsets[i][0]
+                line_y = current_y - line_offsets[i][1]
+                
                 try:
-                    draw.text((line_x, current_y), line, font=font, fill=color)
+                    draw.text((line_x, line_y), line, font=font, fill=color,
+                              stroke_width=stroke_width, stroke_fill=stroke_color)
                 except Exception as e:
                     logger.error(f"Error drawing main text: {e}")
                 
@@ -488,21 +936,36 @@ class VideoGenerator:
             return None
     
     def _load_font(self, font_size: int) -> Optional[ImageFont.FreeTypeFont]:
-        """Load font from system font paths."""
-        font_paths = self.text_config.get('fonts', [
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf"
-        ])
-        
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                try:
-                    return ImageFont.truetype(font_path, font_size)
-                except Exception:
-                    continue
+        """Load font from system font paths (cached per size)."""
+        if font_size in self._font_cache:
+            return self._font_cache[font_size]
         
-        return None
+        font = None
+        if self._font_path is None:
+            # First load: search for the first configured font that opens.
+            # An empty path records that none did, so the search isn't repeated.
+            font_paths = self.text_config.get('fonts', [
+                "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+                "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf"
+            ])
+            self._font_path = ''
+            for font_path in font_paths:
+                if os.path.exists(font_path):
+                    try:
+                        font = ImageFont.truetype(font_path, font_size)
+                    except Exception:
+                        continue
+                    self._font_path = font_path
+                    break
+        elif self._font_path:
+            try:
+                font = ImageFont.truetype(self._font_path, font_size)
+            except Exception:
+                font = None
+        
+        self._font_cache[font_size] = font
+        return font
     
     def _adjust_font_size(self, lines: List[str], draw: ImageDraw.Draw, font: ImageFont.ImageFont,
                          font_size: int, size: Tuple[int, int]) -> Tuple[int, ImageFont.ImageFont]:
@@ -512,7 +975,6 @@ class VideoGenerator:
         auto_scale = scaling_config.get('auto_scale', True)
         min_font_size = scaling_config.get('min_font_size', 20)
         max_font_size = scaling_config.get('max_font_size', 200)
-        scale_factor = scaling_config.get('scale_factor', 0.8)
         
         # Clamp initial font size to configured range
         current_font_size = max(min_font_size, min(font_size, max_font_size))
@@ -523,57 +985,35 @@ class VideoGenerator:
             final_font = self._load_font(font_size)
             return font_size, final_font or ImageFont.load_default()
         
-        # Rest of auto-scaling logic only runs if auto_scale is True
-        max_attempts = 8
+        # Rest of auto-scaling logic only runs if auto_scale is True.
+        # Text extents grow almost linearly with font size, so one
+        # measurement gives the fitting size directly; hinting can leave it a
+        # pixel or two over, which the refinement passes correct.
+        max_refinements = 2
         padding = 80
+        available_width = size[0] - padding
+        available_height = size[1] - padding
         
-        for attempt in range(max_attempts):
+        for attempt in range(1 + max_refinements):
             try:
                 test_font = self._load_font(current_font_size)
                 if test_font is None:
                     test_font = ImageFont.load_default()
                     current_font_size = min(current_font_size, 30)
                 
-                max_width = 0
-                total_height = 0
-                
-                for line in lines:
-                    if not line.strip():
-                        total_height += current_font_size * 0.8
-                        continue
-                        
-                    try:
-                        if hasattr(draw, 'textbbox'):
-                            bbox = draw.textbbox((0, 0), line, font=test_font)
-                            width = bbox[2] - bbox[0]
-                            height = bbox[3] - bbox[1]
-                        else:
-                            width, height = draw.textsize(line, font=test_font)
-                    except Exception:
-                        width = len(line) * (current_font_size * 0.6)
-                        height = current_font_size * 1.2
-                    
-                    max_width = max(max_width, width)
-                    total_height += height + 15
-                
-                total_height = max(0, total_height - 15)
+                max_width, total_height = self._measure_text_block(lines, draw, test_font, current_font_size)
                 
-                fits_width = max_width <= (size[0] - padding)
-                fits_height = total_height <= (size[1] - padding)
-                
-                if fits_width and fits_height:
+                if max_width <= available_width and total_height <= available_height:
                     logger.info(f"Auto-scaled font size {current_font_size} fits well")
                     return current_font_size, test_font
                 
-                if not fits_width or not fits_height:
-                    width_ratio = (size[0] - padding) / max_width if max_width > 0 else 1.0
-                    height_ratio = (size[1] - padding) / total_height if total_height > 0 else 1.0
-                    needed_scale = min(width_ratio, height_ratio)
-                    
-                    if needed_scale < scale_factor:
-                        current_font_size = max(int(current_font_size * needed_scale), min_font_size)
-                    else:
-                        current_font_size = max(int(current_font_size * scale_factor), min_font_size)
+                width_ratio = available_width / max_width if max_width > 0 else 1.0
+                height_ratio = available_height / total_height if total_height > 0 else 1.0
+                needed_scale = min(width_ratio, height_ratio, 1.0)
+                
+                # Always shrink by at least one point so a refinement pass makes progress
+                scaled_size = min(int(current_font_size * needed_scale), current_font_size - 1)
+                current_font_size = max(scaled_size, min_font_size)
                 
                 if current_font_size <= min_font_size:
                     current_font_size = min_font_size
@@ -593,6 +1033,78 @@ class VideoGenerator:
         logger.info(f"Final auto-scaled font size: {current_font_size}")
         return current_font_size, final_font
     
+    def _compute_shared_font_size(self, texts: List[str], size: Tuple[int, int], font_size: int) -> int:
+        """
+        Find one auto-scaled font size at which every text fits the frame.
+        
+        Each text is measured once at the requested size; text extents grow
+        almost linearly with font size, so the text needing the most
+        shrinking sets the size for all, and only it is put through
+        _adjust_font_size's refinement.
+        """
+        scaling_config = self.text_config.get('scaling', {})
+        min_font_size = scaling_config.get('min_font_size', 20)
+        max_font_size = scaling_config.get('max_font_size', 200)
+        base_size = max(min_font_size, min(font_size, max_font_size))
+        
+        font = self._load_font(base_size)
+        if font is None:
+            return base_size
+        draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+        
+        # Same margins as _adjust_font_size
+        available_width = size[0] - 80
+        available_height = size[1] - 80
+        
+        tightest_lines = None
+        tightest_scale = float('inf')
+        for text in texts:
+            if not text or not text.strip():
+                continue
+            lines = text.split('\n')
+            max_width, total_height = self._measure_text_block(lines, draw, font, base_size)
+            scale = min(
+                available_width / max_width if max_width > 0 else 1.0,
+                available_height / total_height if total_height > 0 else 1.0
+            )
+            if scale < tightest_scale:
+                tightest_scale = scale
+                tightest_lines = lines
+        
+        if tightest_lines is None:
+            return base_size
+        
+        shared_size, _ = self._adjust_font_size(tightest_lines, draw, font, base_size, size)
+        logger.info(f"Shared font size for {len(texts)} per-image texts: {shared_size}")
+        return shared_size
+    
+    def _measure_text_block(self, lines: List[str], draw: ImageDraw.Draw,
+                            font: ImageFont.ImageFont, font_size: int) -> Tuple[float, float]:
+        """Measure the widest line and total height of a block of text lines."""
+        max_width = 0
+        total_height = 0
+        
+        for line in lines:
+            if not line.strip():
+                total_height += font_size * 0.8
+                continue
+                
+            try:
+                if hasattr(draw, 'textbbox'):
+                    bbox = draw.textbbox((0, 0), line, font=font)
+                    width = bbox[2] - bbox[0]
+                    height = bbox[3] - bbox[1]
+                else:
+                    width, height = draw.textsize(line, font=font)
+            except Exception:
+                width = len(line) * (font_size * 0.6)
+                height = font_size * 1.2
+            
+            max_width = max(max_width, width)
+            total_height += height + 15
+        
+        return max_width, max(0, total_height - 15)
+    
     def _apply_text_animation(self, text_clip: ImageClip, animation_type: str, 
                              animation_duration: float, video_size: Tuple[int, int], 
                              final_position: Tuple[int, int]) -> ImageClip:
@@ -733,11 +1245,7 @@ class VideoGenerator:
     
     def _get_video_size(self, resolution: str) -> Tuple[int, int]:
         """Get video dimensions for given resolution."""
-        sizes = {
-            "1080p": (1920, 1080),
-            "720p": (1280, 720)
-        }
-        return sizes.get(resolution, (1280, 720))
+        return VIDEO_SIZES.get(resolution, DEFAULT_VIDEO_SIZE)
     
     def _calculate_crossfade_duration(self, base_duration: float) -> float:
         """Calculate crossfade duration based on image duration."""
@@ -3,8 +3,10 @@ Test suite for AudioGenerator class
 """
 import os
 import tempfile
+import wave
 import pytest
 import sys
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 
 # Add src to path for testing
@@ -115,6 +117,7 @@ class TestAudioGenerator:
         """Test TTS audio generation."""
         # Setup
         mock_tts_instance = Mock()
+        mock_tts_instance.save.side_effect = lambda path: open(path, 'w').close()
         mock_gtts.return_value = mock_tts_instance
         
         mock_audio = Mock()
@@ -132,6 +135,150 @@ class TestAudioGenerator:
         mock_tts_instance.save.assert_called_once()
         assert result == mock_audio
     
+    @patch('audio_generator.TTS_AVAILABLE', True)
+    @patch('audio_generator.gTTS')
+    @patch('audio_generator.AudioFileClip')
+    def test_generate_tts_audio_cached(self, mock_audio_clip, mock_gtts):
+        """Test that unchanged text reuses the previously generated audio."""
+        mock_gtts.return_value.save.side_effect = lambda path: open(path, 'w').close()
+        mock_audio_clip.return_value = Mock(duration=30.0)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.config['paths']['output_dir'] = temp_dir
+            generator = AudioGenerator(self.config)
+            
+            generator._generate_tts_audio("Hello world")
+            generator._generate_tts_audio("Hello world")
+            generator._generate_tts_audio("Different text")
+        
+        # Only the two distinct texts should hit the TTS service
+        assert mock_gtts.call_count == 2
+        assert mock_audio_clip.call_count == 3
+    
+    @patch('audio_generator.TTS_AVAILABLE', True)
+    @patch('audio_generator.gTTS')
+    @patch('audio_generator.AudioFileClip')
+    def test_generate_tts_audio_interrupted_not_cached(self, mock_audio_clip, mock_gtts):
+        """Test that a failed download leaves no file to be reused as a cache hit."""
+        def partial_save(path):
+            with open(path, 'wb') as f:
+                f.write(b'partial')
+            raise IOError("connection reset")
+        
+        mock_gtts.return_value.save.side_effect = partial_save
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.config['paths']['output_dir'] = temp_dir
+            generator = AudioGenerator(self.config)
+            
+            result = generator._generate_tts_audio("Hello world")
+            
+            assert result is None
+            assert os.listdir(os.path.join(temp_dir, '.tts_cache')) == []
+    
+    @patch('audio_generator.TTS_AVAILABLE', True)
+    @patch('audio_generator.gTTS')
+    @patch('audio_generator.AudioFileClip')
+    def test_generate_tts_audio_cache_bounded(self, mock_audio_clip, mock_gtts):
+        """Test that only the most recently used texts are kept on disk."""
+        mock_gtts.return_value.save.side_effect = lambda path: open(path, 'w').close()
+        mock_audio_clip.return_value = Mock(duration=30.0)
+        self.config['audio']['tts']['cache_entries'] = 2
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.config['paths']['output_dir'] = temp_dir
+            cache_dir = os.path.join(temp_dir, '.tts_cache')
+            generator = AudioGenerator(self.config)
+            
+            # Files that only look like cache entries are never pruned
+            os.makedirs(cache_dir)
+            for name in ('tts_notes.mp3', 'tts_' + 'a' * 40 + '.mp3.bak'):
+                open(os.path.join(cache_dir, name), 'w').close()
+                os.utime(os.path.join(cache_dir, name), (0, 0))
+            open(os.path.join(temp_dir, 'tts_' + 'b' * 40 + '.mp3'), 'w').close()
+            
+            with patch.object(generator, '_convert_to_wav', return_value=False):
+                stamped = set(os.listdir(cache_dir))
+                for i, text in enumerate(["First text", "Second text", "Third text"], 1):
+                    generator._generate_tts_audio(text)
+                    # Give each new file a distinct, increasing modification time
+                    for name in set(os.listdir(cache_dir)) - stamped:
+                        os.utime(os.path.join(cache_dir, name), (i, i))
+                        stamped.add(name)
+                
+                remaining = [name for name in os.listdir(cache_dir) if name.endswith('.mp3')]
+                generator._generate_tts_audio("First text")
+            
+            unrelated_kept = all(os.path.exists(path) for path in (
+                os.path.join(cache_dir, 'tts_notes.mp3'),
+                os.path.join(cache_dir, 'tts_' + 'a' * 40 + '.mp3.bak'),
+                os.path.join(temp_dir, 'tts_' + 'b' * 40 + '.mp3'),
+            ))
+        
+        assert len(remaining) == 3  # two cache entries and tts_notes.mp3
+        assert unrelated_kept
+        assert mock_gtts.call_count == 4
+    
+    @patch('audio_generator.TTS_AVAILABLE', True)
+    @patch('audio_generator.gTTS')
+    @patch('audio_generator.AudioFileClip')
+    def test_generate_tts_audio_ramdisk_private_and_cleaned(self, mock_audio_clip, mock_gtts):
+        """Test that RAM disk audio goes to a private directory removed by cleanup."""
+        saved = []
+        def save(path):
+            saved.append(path)
+            open(path, 'w').close()
+        
+        mock_gtts.return_value.save.side_effect = save
+        mock_audio_clip.return_value = Mock(duration=30.0)
+        self.config['audio']['tts']['use_ramdisk'] = True
+        
+        with tempfile.TemporaryDirectory() as ramdisk, tempfile.TemporaryDirectory() as temp_dir:
+            self.config['paths']['output_dir'] = temp_dir
+            generator = AudioGenerator(self.config)
+            
+            with patch('audio_generator.RAMDISK_DIR', ramdisk), \
+                 patch.object(generator, '_convert_to_wav', return_value=False):
+                generator._generate_tts_audio("Hello world")
+            
+            tts_dir = os.path.dirname(saved[0])
+            assert os.path.dirname(tts_dir) == ramdisk
+            assert os.stat(tts_dir).st_mode & 0o077 == 0
+            assert os.listdir(temp_dir) == []
+            
+            generator.cleanup_temp_files()
+            
+            assert os.listdir(ramdisk) == []
+    
+    @patch('audio_generator.TTS_AVAILABLE', True)
+    @patch('audio_generator.gTTS')
+    @patch('audio_generator.AudioFileClip')
+    def test_generate_tts_audio_parallel_chunks(self, mock_audio_clip, mock_gtts):
+        """Test that long text is synthesized in chunks and joined in order."""
+        def fake_tts(text, lang, slow):
+            tts = Mock()
+            tts.write_to_fp.side_effect = lambda fp: fp.write(text.encode())
+            return tts
+        
+        mock_gtts.side_effect = fake_tts
+        mock_audio_clip.return_value = Mock(duration=30.0)
+        self.config['audio']['tts']['chunk_chars'] = 20
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.config['paths']['output_dir'] = temp_dir
+            generator = AudioGenerator(self.config)
+            
+            with patch.object(generator, '_convert_to_wav', return_value=False):
+                generator._generate_tts_audio("First sentence here. Second one follows! Third?")
+            
+            cache_dir = os.path.join(temp_dir, '.tts_cache')
+            mp3_files = [f for f in os.listdir(cache_dir) if f.endswith('.mp3')]
+            with open(os.path.join(cache_dir, mp3_files[0]), 'rb') as f:
+                content = f.read()
+        
+        assert mock_gtts.call_count == 3
+        assert content == b"First sentence here.Second one follows!Third?"
+    
     @patch('audio_generator.TTS_AVAILABLE', False)
     def test_generate_tts_audio_not_available(self):
         """Test TTS generation when libraries not available."""
@@ -169,20 +316,57 @@ class TestAudioGenerator:
         mock_audio.subclip.assert_called_once_with(0, 90.0)
         assert result == mock_trimmed
     
-    @patch('audio_generator.concatenate_audioclips')
-    def test_adjust_audio_duration_extend(self, mock_concatenate):
+    def test_adjust_audio_duration_trim_shares_reader(self):
+        """Test that trimming a file-backed clip reuses its ffmpeg reader."""
+        from moviepy.editor import AudioFileClip
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            wav_path = os.path.join(temp_dir, 'tone.wav')
+            with wave.open(wav_path, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(8000)
+                wav.writeframes(b'\x00\x00' * 8000 * 2)  # 2 seconds
+            
+            audio = AudioFileClip(wav_path)
+            try:
+                result = self.generator.adjust_audio_duration(audio, 1.0)
+                
+                assert result.duration == 1.0
+                assert result.reader is audio.reader
+            finally:
+                audio.close()
+    
+    def test_adjust_audio_duration_extend(self):
         """Test extending audio to longer duration."""
+        from moviepy.audio.AudioClip import AudioArrayClip
+        
+        fps = 8000
+        samples = np.arange(fps, dtype=np.float32).reshape(-1, 2) / fps
+        audio = AudioArrayClip(samples, fps=fps)  # 0.5 seconds
+        
+        result = self.generator.adjust_audio_duration(audio, 1.25)
+        
+        # Should tile the decoded samples up to the exact duration
+        assert result.duration == pytest.approx(1.25)
+        result_samples = result.to_soundarray(fps=fps)
+        assert len(result_samples) == int(1.25 * fps)
+        np.testing.assert_allclose(result_samples[:len(samples)], samples, atol=1e-3)
+        np.testing.assert_allclose(result_samples[len(samples):2 * len(samples)], samples, atol=1e-3)
+    
+    @patch('audio_generator.audio_loop')
+    def test_adjust_audio_duration_extend_long(self, mock_audio_loop):
+        """Test that very long extensions loop lazily instead of tiling."""
         mock_audio = Mock()
         mock_audio.duration = 60.0
         mock_extended = Mock()
-        mock_extended.subclip.return_value = Mock()
-        mock_concatenate.return_value = mock_extended
+        mock_audio_loop.return_value = mock_extended
         
-        result = self.generator.adjust_audio_duration(mock_audio, 150.0)
+        result = self.generator.adjust_audio_duration(mock_audio, 3600.0)
         
-        # Should create looped audio and trim to exact duration
-        mock_concatenate.assert_called_once()
-        mock_extended.subclip.assert_called_once_with(0, 150.0)
+        mock_audio_loop.assert_called_once_with(mock_audio, duration=3600.0)
+        mock_audio.to_soundarray.assert_not_called()
+        assert result == mock_extended
     
     def test_adjust_audio_duration_close_enough(self):
         """Test when audio duration is close enough to target."""
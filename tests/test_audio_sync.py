@@ -0,0 +1,153 @@
+"""
+Test suite for AudioSyncManager class
+"""
+import os
+import tempfile
+import wave
+import pytest
+import sys
+import numpy as np
+from unittest.mock import patch
+
+# audio_sync uses package-relative imports, so it is imported through src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moviepy.editor import AudioFileClip
+from src.audio_sync import AudioSyncManager
+
+
+def _write_tone_with_pauses(path, sample_rate=8000):
+    """Write 1 s tone / 0.5 s silence blocks (4 tones) as 16-bit mono WAV."""
+    t = np.arange(sample_rate) / sample_rate
+    tone = (np.sin(2 * np.pi * 440 * t) * 16000).astype(np.int16)
+    pause = np.zeros(sample_rate // 2, dtype=np.int16)
+    signal = np.concatenate([tone, pause] * 3 + [tone])
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(signal.tobytes())
+
+
+class TestAudioSyncManager:
+    
+    def setup_method(self):
+        """Setup test configuration."""
+        self.config = {
+            'audio': {
+                'sync': {
+                    'enabled': True,
+                    'mode': 'auto',
+                    'analysis_sample_rate': 8000,
+                    'cache_analysis': True,
+                    'auto': {
+                        'detector': 'rms',
+                        'silence_threshold': -40
+                    }
+                }
+            },
+            'paths': {}
+        }
+        self.manager = AudioSyncManager(self.config)
+    
+    def test_even_distribution(self):
+        """Test evenly spaced timings."""
+        assert self.manager._even_distribution(20.0, 4) == [0.0, 5.0, 10.0, 15.0]
+        assert self.manager._even_distribution(20.0, 1) == [0.0]
+    
+    def test_silent_frame_indices_match_reference(self):
+        """Test both window paths against a plain per-window level check."""
+        rng = np.random.default_rng(0)
+        samples = (rng.standard_normal(8000 * 3) * 0.1).astype(np.float32)
+        samples[4000:12000] *= 0.001
+        
+        for window_size, hop_size in [(800, 400), (800, 300)]:
+            num_frames = len(range(0, len(samples) - window_size, hop_size))
+            expected = [i for i in range(num_frames)
+                        if 20 * np.log10(np.sqrt(np.mean(
+                            samples[i * hop_size:i * hop_size + window_size].astype(np.float64) ** 2)) + 1e-12) < -40]
+            
+            result = self.manager._silent_frame_indices(samples, window_size, hop_size, num_frames, -40)
+            
+            assert result.tolist() == expected
+    
+    def test_silence_points_same_across_chunk_sizes(self):
+        """Test that chunked scanning finds the same points as one pass."""
+        rng = np.random.default_rng(1)
+        samples = (rng.standard_normal(8000 * 20) * 0.1).astype(np.float32)
+        for start in (2, 5.3, 9.97, 14.5):
+            samples[int(start * 8000):int((start + 0.8) * 8000)] = 0.0
+        
+        whole = list(self.manager._iter_silence_points(samples, 8000, chunk_seconds=60.0))
+        chunked = list(self.manager._iter_silence_points(samples, 8000, chunk_seconds=1.0))
+        
+        assert len(whole) == 4
+        assert chunked == whole
+    
+    def test_analysis_cache_written_and_reused(self):
+        """Test that the analysis signal is cached in the user cache directory."""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch.dict(os.environ, {'XDG_CACHE_HOME': temp_dir}):
+            wav_path = os.path.join(temp_dir, 'speech.wav')
+            _write_tone_with_pauses(wav_path)
+            audio = AudioFileClip(wav_path)
+            try:
+                first, _ = self.manager._prepare_analysis_signal(audio)
+                cache_path = self.manager._analysis_cache_path(audio, 8000)
+                
+                assert cache_path.startswith(temp_dir)
+                assert os.path.exists(cache_path)
+                
+                second, _ = AudioSyncManager(self.config)._prepare_analysis_signal(audio)
+            finally:
+                audio.close()
+        
+        assert np.array_equal(first, second)
+    
+    def test_corrupt_analysis_cache_is_replaced(self):
+        """Test that a truncated cache file is decoded again and rewritten."""
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch.dict(os.environ, {'XDG_CACHE_HOME': temp_dir}):
+            wav_path = os.path.join(temp_dir, 'speech.wav')
+            _write_tone_with_pauses(wav_path)
+            audio = AudioFileClip(wav_path)
+            try:
+                cache_path = self.manager._analysis_cache_path(audio, 8000)
+                os.makedirs(os.path.dirname(cache_path))
+                with open(cache_path, 'wb') as f:
+                    f.write(b'PK\x03\x04truncated')
+                
+                mono, sample_rate = self.manager._prepare_analysis_signal(audio)
+                
+                with np.load(cache_path, allow_pickle=False) as data:
+                    cached = data['mono']
+            finally:
+                audio.close()
+        
+        assert sample_rate == 8000
+        assert len(mono) == int(8000 * 5.5)
+        assert np.array_equal(cached, mono)
+    
+    def test_analysis_cache_pruned(self):
+        """Test that only the most recently used signals are kept."""
+        self.config['audio']['sync']['cache_entries'] = 2
+        manager = AudioSyncManager(self.config)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = os.path.join(temp_dir, 'audio_sync')
+            os.makedirs(cache_dir)
+            for i, name in enumerate(['old.npz', 'newer.npz']):
+                path = os.path.join(cache_dir, name)
+                np.savez(path, mono=np.zeros(4, dtype=np.float32))
+                os.utime(path, (i + 1, i + 1))
+            
+            manager._save_analysis_cache(os.path.join(cache_dir, 'new.npz'),
+                                         np.zeros(4, dtype=np.float32))
+            
+            remaining = sorted(os.listdir(cache_dir))
+        
+        assert remaining == ['new.npz', 'newer.npz']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
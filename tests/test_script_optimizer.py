@@ -0,0 +1,172 @@
+"""
+Test suite for ScriptOptimizer class
+"""
+import os
+import pytest
+import sys
+
+# Add src to path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from script_optimizer import ScriptOptimizer
+
+
+class TestScriptOptimizer:
+    
+    def setup_method(self):
+        """Setup test configuration."""
+        self.config = {
+            'text': {
+                'enabled': True,
+                'font_size': 60
+            },
+            'paths': {}
+        }
+        self.optimizer = ScriptOptimizer(self.config)
+    
+    def test_intelligent_grouping_breaks_on_new_topic(self):
+        """Test that a sentence followed by a topic opener starts a new slide."""
+        lines = ['Welcome to the old town.', 'Now we walk to the harbour.',
+                 'Next is the market square.', 'Finally we rest.']
+        
+        result = self.optimizer._intelligent_grouping(lines, 3)
+        
+        assert result == ['Welcome to the old town.', 'Now we walk to the harbour.',
+                          'Next is the market square. Finally we rest.']
+    
+    def test_intelligent_grouping_without_breaks_keeps_text(self):
+        """Test that lines are kept when no break is ever triggered."""
+        lines = [('lorem ipsum dolor sit amet ' * 5).strip(),
+                 ('consectetur adipiscing elit sed do ' * 4).strip()]
+        
+        result = self.optimizer._intelligent_grouping(lines, 2)
+        
+        assert len(result) == 2
+        assert all(result)
+        assert ' '.join(result).split() == ' '.join(lines).split()
+    
+    def test_intelligent_grouping_single_line(self):
+        """Test that a single line is split across the slides."""
+        lines = ['One single long line about a topic that keeps going on and on for a while.']
+        
+        result = self.optimizer._intelligent_grouping(lines, 3)
+        
+        assert result == ['One single long line', 'keeps going on and on for a while.',
+                          'about a topic that']
+    
+    def test_intelligent_grouping_more_images_than_lines(self):
+        """Test that missing slides are padded with empty text."""
+        lines = ['First sentence.', 'Now second one.', 'Then the third.']
+        
+        result = self.optimizer._intelligent_grouping(lines, 5)
+        
+        assert result == ['First sentence.', 'Now second one.', 'Then the third.', '', '']
+    
+    def test_semantic_grouping_orders_by_topic(self):
+        """Test that topic lines come first, grouped in topic order."""
+        lines = ['Plain line one', 'The system process', 'Welcome everyone', 'Plain line two']
+        
+        result = self.optimizer._semantic_grouping(lines, 2)
+        
+        assert result == ['Welcome everyone The system process', 'Plain line one Plain line two']
+    
+    def test_semantic_grouping_more_images_than_lines(self):
+        """Test semantic grouping with fewer lines than images."""
+        result = self.optimizer._semantic_grouping(['hello there', 'the end', 'system check'], 5)
+        
+        assert result == ['hello there', 'hello there', 'hello there', '', '']
+    
+    def test_balanced_length_distribution(self):
+        """Test that slides are filled up to the target length."""
+        lines = [f'Sentence number {i} ' + 'x' * (i * 7 % 40) for i in range(20)]
+        
+        result = self.optimizer._balanced_length_distribution(lines, 4)
+        
+        assert len(result) == 4
+        assert ' '.join(result) == ' '.join(lines)
+        assert result[0] == ' '.join(lines[:5])
+        assert result[1] == ' '.join(lines[5:10])
+        assert result[2] == ' '.join(lines[10:14])
+        assert result[3] == ' '.join(lines[14:])
+    
+    def test_balanced_length_distribution_single_line(self):
+        """Test balanced distribution of a single line."""
+        result = self.optimizer._balanced_length_distribution(['Only one line here.'], 3)
+        
+        assert result == ['Only one', 'line here.', '']
+    
+    def test_balanced_length_distribution_more_images_than_lines(self):
+        """Test balanced distribution with fewer lines than images."""
+        result = self.optimizer._balanced_length_distribution(['a line', 'another line'], 5)
+        
+        assert result == ['a line', 'another line', '', '', '']
+    
+    def test_even_distribution(self):
+        """Test that the first slides take the extra lines."""
+        lines = [f'Line {i}' for i in range(7)]
+        
+        result = self.optimizer._even_distribution(lines, 3)
+        
+        assert result == ['Line 0 Line 1 Line 2', 'Line 3 Line 4', 'Line 5 Line 6']
+    
+    def test_even_distribution_more_images_than_lines(self):
+        """Test that slides past the end of the script are empty."""
+        assert self.optimizer._even_distribution(['Just one.'], 2) == ['Just one.', '']
+        assert self.optimizer._even_distribution(['aa1', 'bb2'], 4) == ['aa1', 'bb2', '', '']
+    
+    def test_ensure_exact_count_splits_longest(self):
+        """Test that the longest group is split at its middle sentence break."""
+        groups = ['First part. Second part. Third part. Fourth part.', 'short']
+        
+        result = self.optimizer._ensure_exact_count(groups, 4)
+        
+        assert result == ['First part. Second part', 'short', 'Third part', 'Fourth part.']
+    
+    def test_ensure_exact_count_merges_shortest(self):
+        """Test that the shortest adjacent pairs are merged first."""
+        result = self.optimizer._ensure_exact_count(['a', 'bb', 'ccc', 'd', 'eeeee', 'ff'], 3)
+        
+        assert result == ['a bb', 'ccc d', 'eeeee ff']
+    
+    def test_clean_script_lines(self):
+        """Test cleaning, and that cached results are not shared with callers."""
+        raw = ['  Hello   world  ', '', '12.3', '--', 'A real\nline here', '-1 is a number?', 'ok']
+        
+        first = self.optimizer._clean_script_lines(raw)
+        first.append('changed')
+        second = self.optimizer._clean_script_lines(raw)
+        
+        assert second == ['Hello world', 'A real line here', '-1 is a number?']
+    
+    def test_choose_distribution_method(self):
+        """Test the method chosen for each kind of script."""
+        assert self.optimizer._choose_distribution_method(['x' * 150] * 2, 2) == 'intelligent_grouping'
+        assert self.optimizer._choose_distribution_method(['short line'] * 30, 2) == 'semantic_grouping'
+        assert self.optimizer._choose_distribution_method(['medium line text'] * 10, 3) == 'balanced_length'
+        assert self.optimizer._choose_distribution_method(['abc def'] * 3, 3) == 'even_distribution'
+    
+    def test_optimize_script_distribution_dispatch(self):
+        """Test that the distribution uses the chosen method's output."""
+        lines = [f'Line {i}' for i in range(7)]
+        
+        result = self.optimizer.optimize_script_distribution(lines, 3)
+        
+        assert result['mode'] == 'per_image'
+        assert result['texts'] == ['Line 0 Line 1 Line 2', 'Line 3 Line 4', 'Line 5 Line 6']
+    
+    def test_analyze_and_optimize_matches_separate_calls(self):
+        """Test that the one-pass analysis distributes like the separate calls."""
+        scripts = [(['x' * 150] * 2, 2), (['short line'] * 30, 2),
+                   (['medium line text'] * 10, 3), (['abc def'] * 3, 3)]
+        
+        for lines, num_images in scripts:
+            analysis, settings = self.optimizer.analyze_and_optimize(lines, num_images)
+            fresh = ScriptOptimizer(self.config)
+        
+            assert analysis == fresh.analyze_script_distribution(lines, num_images)
+            assert settings == fresh.optimize_script_distribution(lines, num_images)
+    
+    def test_optimize_script_distribution_empty(self):
+        """Test that an empty script yields no settings."""
+        assert self.optimizer.optimize_script_distribution([], 3) is None
+        assert self.optimizer.optimize_script_distribution(['', '--'], 3) is None
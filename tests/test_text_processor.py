@@ -121,6 +121,23 @@ class TestTextProcessor:
         assert result['font_size'] == 80  # Should be overridden by json_settings
         assert result['color'] == 'red'   # Should be overridden by json_settings
         assert result['stroke_color'] == 'black'  # Should remain from config
+    
+    def test_save_and_load_text_settings(self):
+        """Test text settings round-trip through JSON and pickle files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.config['paths']['output_dir'] = temp_dir
+            processor = TextProcessor(self.config)
+            text_settings = processor._create_text_settings('per_image', texts=['A', 'B', 'C'])
+            
+            for output_name in ('settings', 'settings.pkl'):
+                assert processor.save_text_settings(text_settings, output_name)
+            assert sorted(os.listdir(temp_dir)) == ['settings.json', 'settings.pkl']
+            
+            for file_name in ('settings.json', 'settings.pkl'):
+                result = processor.load_text_settings(os.path.join(temp_dir, file_name))
+                assert result['mode'] == 'per_image'
+                assert result['texts'] == ['A', 'B', 'C']
+                assert result['font_size'] == 60
 
 
 if __name__ == '__main__':
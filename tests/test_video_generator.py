@@ -5,8 +5,10 @@ import os
 import tempfile
 import pytest
 import sys
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from PIL import Image
+from moviepy.editor import concatenate_videoclips
 
 # Add src to path for testing
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -201,6 +203,23 @@ class TestVideoGenerator:
         assert font_size < 60
         assert font_size >= 10  # Minimum font size
     
+    def test_compute_shared_font_size_fits_tightest_text(self):
+        """Test that the shared font size is fitted to the text needing most shrinking."""
+        texts = ['Short', 'A much longer caption', '']
+        extents = {'Short': (300, 60), 'A much longer caption': (2400, 60)}
+        
+        def measure(lines, draw, font, font_size):
+            return extents[lines[0]]
+        
+        with patch.object(self.generator, '_load_font', return_value=Mock()), \
+             patch.object(self.generator, '_measure_text_block', side_effect=measure), \
+             patch.object(self.generator, '_adjust_font_size', return_value=(30, Mock())) as mock_adjust:
+            font_size = self.generator._compute_shared_font_size(texts, (1280, 720), 60)
+        
+        assert font_size == 30
+        mock_adjust.assert_called_once()
+        assert mock_adjust.call_args[0][0] == ['A much longer caption']
+    
     @patch('video_generator.np.array')
     @patch('video_generator.ImageClip')
     def test_create_text_overlay_success(self, mock_image_clip, mock_array):
@@ -230,6 +249,25 @@ class TestVideoGenerator:
         
         assert result == mock_clip
     
+    @patch('video_generator.ImageClip')
+    def test_create_text_overlay_reuses_rendered_text(self, mock_image_clip):
+        """Test that repeated overlay text is rendered and wrapped in a clip only once."""
+        text_settings = {'mode': 'single', 'text': 'Same text', 'animation': 'none'}
+        
+        mock_clip = Mock()
+        mock_clip.size = (200, 50)
+        mock_clip.set_duration.return_value = mock_clip
+        mock_clip.set_position.return_value = mock_clip
+        mock_image_clip.return_value = mock_clip
+        
+        text_img = Image.new('RGBA', (200, 50), (0, 0, 0, 0))
+        with patch.object(self.generator, '_create_pil_text_image', return_value=text_img) as mock_render:
+            for index in range(3):
+                self.generator._create_text_overlay(text_settings, index, (1280, 720), 5.0)
+        
+        mock_render.assert_called_once()
+        mock_image_clip.assert_called_once()
+    
     def test_create_text_overlay_no_text(self):
         """Test text overlay creation when no text content."""
         text_settings = {}
@@ -337,6 +375,77 @@ class TestVideoGenerator:
         
         assert result is None
 
+    
+    def _still_frames(self, count, size=(32, 18)):
+        """Distinct solid-noise frames of the given (width, height)."""
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8) for _ in range(count)]
+    
+    def test_slideshow_frame_function_matches_concatenated_clips(self):
+        """Test that the still-frame path gives MoviePy's frames, crossfades included."""
+        frames = self._still_frames(3)
+        slide_durations = [1.0, 1.5, 1.25]
+        crossfade = 0.3
+        fps = 24
+        
+        make_frame = self.generator._slideshow_frame_function(frames, slide_durations, crossfade)
+        clips = self.generator._build_slideshow_clips_with_sync(
+            frames, (32, 18), slide_durations, crossfade, 'fit', None
+        )
+        video = concatenate_videoclips(clips, method="compose")
+        
+        for k in range(int(sum(slide_durations) * fps)):
+            assert np.array_equal(make_frame(k / fps), video.get_frame(k / fps)), f"frame {k}"
+    
+    @patch('video_generator.CV2_AVAILABLE', False)
+    @patch('video_generator.subprocess.Popen')
+    def test_write_slideshow_ffmpeg_frame_count(self, mock_popen):
+        """Test that duration * fps frames are piped to ffmpeg."""
+        frames = self._still_frames(2)
+        plan = ([1.25, 1.25], 0.3, None, frames)
+        mock_popen.return_value.wait.return_value = 0
+        mock_popen.return_value.stderr.read.return_value = b''
+        
+        with tempfile.NamedTemporaryFile(suffix='.wav') as audio_file:
+            mock_audio = Mock(filename=audio_file.name, duration=2.5)
+            
+            result = self.generator.write_slideshow_ffmpeg(
+                ['img1.jpg', 'img2.jpg'], mock_audio, 'out.mp4', plan=plan
+            )
+        
+        assert result is True
+        assert mock_popen.return_value.stdin.write.call_count == int(2.5 * 24)
+        written = [call.args[0] for call in mock_popen.return_value.stdin.write.call_args_list]
+        assert written[0] is frames[0]
+        assert written[-1] is frames[1]
+    
+    @patch('video_generator.subprocess.Popen')
+    def test_write_slideshow_ffmpeg_animated_text(self, mock_popen):
+        """Test that animated text is left to MoviePy without planning the slideshow."""
+        text_settings = {'mode': 'single', 'text': 'Hello', 'animation': 'fade_in'}
+        
+        with tempfile.NamedTemporaryFile(suffix='.wav') as audio_file:
+            mock_audio = Mock(filename=audio_file.name, duration=2.5)
+            
+            with patch.object(self.generator, 'plan_slideshow') as mock_plan:
+                result = self.generator.write_slideshow_ffmpeg(
+                    ['img1.jpg'], mock_audio, 'out.mp4', text_settings=text_settings
+                )
+        
+        assert result is False
+        mock_plan.assert_not_called()
+        mock_popen.assert_not_called()
+    
+    @patch('video_generator.subprocess.Popen')
+    def test_write_slideshow_ffmpeg_audio_without_file(self, mock_popen):
+        """Test that audio with no file to mux is left to MoviePy."""
+        mock_audio = Mock(spec=['duration'])
+        mock_audio.duration = 2.5
+        
+        result = self.generator.write_slideshow_ffmpeg(['img1.jpg'], mock_audio, 'out.mp4')
+        
+        assert result is False
+        mock_popen.assert_not_called()
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file